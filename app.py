@@ -1,16 +1,37 @@
 import os
 import json
 import asyncio
+import concurrent.futures
+import threading
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import streamlit as st
-from helper import AIAssistant, get_current_year, text_to_speech, fetch_news_data
+# Only lightweight helper modules are imported here; search and model code load on first use
+from helper import AIAssistant, SpeechStream, get_current_year, get_speech_synthesizer
+from logger.metrics import RequestTrace, start_metrics_server, trace_request
 
 # ============================ UI CONFIGURATION ============================
 
 st.set_page_config(layout="wide")  # Configure page layout for better visibility
 st.title("IntelliSearch AI 🤖")  # Application header
 
+
+def _warm_up_credibility_model() -> None:
+    """Load and warm up the shared credibility model, unless a model server hosts it."""
+    from helper import credibility_registry
+    from model_server.client import get_model_client
+
+    if get_model_client() is None:
+        credibility_registry.warm_up()
+
+
+@st.cache_resource(show_spinner=False)
+def warm_up_models() -> threading.Thread:
+    """Start warming up the credibility model in the background once per server process."""
+    warm_up_thread = threading.Thread(target=_warm_up_credibility_model, name="model-warm-up", daemon=True)
+    warm_up_thread.start()
+    return warm_up_thread
+
 # ============================ CONFIGURATION PANEL ============================
 
 with st.sidebar:
@@ -75,6 +96,14 @@ with st.sidebar:
     temporal_filter = time_period_map[temporal_filter]
 
     ai_only_mode: bool = st.checkbox("💬 AI Mode (Skip Search)")
+    show_timings: bool = st.checkbox("⏱️ Show Timings")
+
+    # Search needs the credibility model; AI-only sessions never load it
+    if not ai_only_mode:
+        warm_up_models()
+
+    # Serves /metrics when METRICS_PORT is set; a no-op otherwise
+    start_metrics_server()
 
     # Session reset option
     if st.button("🧹 Reset Session"):
@@ -99,6 +128,182 @@ for msg in st.session_state.messages:
     with st.chat_message(msg["role"]):
         st.markdown(msg["content"])
 
+# ============================ RESULT FORMATTING ============================
+
+# Number of results to wait for before the LLM summary starts
+SUMMARY_START_RESULTS: int = 3
+
+
+def sanitize_title(raw_title: str) -> str:
+    """
+    Formats title for proper display by replacing delimiter characters.
+
+    Args:
+        raw_title (str): Original title text.
+
+    Returns:
+        str: Formatted title suitable for display.
+    """
+    return raw_title.replace("|", " - ").strip()
+
+
+def format_rating(raw_rating: str) -> str:
+    """
+    Creates visual star rating representation.
+
+    Args:
+        raw_rating (str): Numerical rating value.
+
+    Returns:
+        str: Star-based rating display (⭐ and ⭐½).
+    """
+    try:
+        rating_val: float = float(raw_rating)
+        full_count: int = int(rating_val)
+        has_half: str = "⭐½" if (rating_val - full_count) >= 0.5 else ""
+        return "⭐" * full_count + has_half
+    except ValueError:
+        return "⭐"
+
+
+def build_results_table(markdown_results: List[Dict[str, Any]]) -> str:
+    """
+    Construct the markdown results table for the processed articles received so far.
+
+    Args:
+        markdown_results (List[Dict[str, Any]]): Processed search results.
+
+    Returns:
+        str: Markdown table, or a placeholder message if there are no results.
+    """
+    if not markdown_results:
+        return "**No matching results found.**"
+
+    results_table = "| # | Title | Rating | Summary |\n|---|------|--------|---------|\n"
+
+    for item in sorted(markdown_results, key=lambda result: result["num"]):
+        clean_title = sanitize_title(item['title'])
+        raw_rating = str(item.get('rating', '⭐')).strip()
+
+        if raw_rating.replace('.', '', 1).isdigit():
+            rating_display = format_rating(raw_rating)
+        else:
+            rating_display = "⭐"
+
+        if item.get('link', '').startswith("http"):
+            title_display = f"[{clean_title}]({item['link']})"
+        else:
+            title_display = clean_title
+
+        summary_text = item.get('summary', '').strip()
+        truncated_summary = summary_text[:100] + "..." if len(summary_text) > 100 else summary_text
+
+        results_table += f"| {item['num']} | {title_display} | {rating_display} | {truncated_summary} |\n"
+
+    return results_table
+
+
+def render_speech(audio_placeholder: Any, audio_futures: List[concurrent.futures.Future], mime_type: str) -> None:
+    """
+    Show the spoken answer chunk by chunk as synthesis finishes.
+
+    The first chunk starts playing as soon as it is ready; later chunks are added below it.
+
+    Args:
+        audio_placeholder (Any): Streamlit placeholder for the audio players.
+        audio_futures (List[concurrent.futures.Future]): Synthesis futures in reading order.
+        mime_type (str): MIME type of the synthesized audio.
+    """
+    with audio_placeholder.container():
+        for index, audio_future in enumerate(audio_futures):
+            try:
+                st.audio(audio_future.result(), format=mime_type, autoplay=index == 0)
+            except Exception:
+                st.caption("🔇 Audio unavailable.")
+                break
+
+
+async def answer_query(user_query: str, answer_placeholder: Any, table_placeholder: Any,
+                       speech: SpeechStream) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Render search results progressively and stream the AI summary once the first results arrive.
+
+    Args:
+        user_query (str): The user's question.
+        answer_placeholder (Any): Streamlit placeholder for the AI answer.
+        table_placeholder (Any): Streamlit placeholder for the results table.
+        speech (SpeechStream): Receives the answer tokens and synthesizes finished sentences in the background.
+
+    Returns:
+        Tuple[str, List[Dict[str, Any]]]: The AI response and every processed search result.
+    """
+    markdown_results: List[Dict[str, Any]] = []
+    summary_ready = asyncio.Event()
+
+    async def collect_results() -> None:
+        """Consume the result stream, re-rendering the table after every article."""
+        try:
+            if not ai_only_mode:
+                from helper import stream_news_data
+
+                async for item in stream_news_data(query=user_query, region=region_code, count=result_count, time_filter=temporal_filter):
+                    markdown_results.append(item)
+                    table_placeholder.markdown(build_results_table(markdown_results), unsafe_allow_html=True)
+                    if len(markdown_results) >= min(SUMMARY_START_RESULTS, result_count):
+                        summary_ready.set()
+            else:
+                # No scraping in AI Mode, but articles kept from earlier searches can still ground the answer
+                from helper import ground_query
+
+                markdown_results.extend(await asyncio.to_thread(ground_query, user_query, result_count))
+                if markdown_results:
+                    table_placeholder.markdown(build_results_table(markdown_results), unsafe_allow_html=True)
+        except Exception as e:
+            st.warning(f"Search error occurred: {e}")
+        finally:
+            summary_ready.set()
+
+    async def stream_answer() -> str:
+        """Wait for the first results, then stream the LLM answer token by token."""
+        await summary_ready.wait()
+
+        # Earlier turns (without the query just asked) give the assistant its conversation history;
+        # the prompt builder keeps only the most relevant passages of each result within the token budget
+        assistant = AIAssistant()
+        assistant.conversation_log.extend(st.session_state.messages[:-1])
+        response_tokens = assistant.stream_response(
+            user_query, results=list(markdown_results), time_filter=None if ai_only_mode else temporal_filter
+        )
+
+        # Pull tokens in a worker thread so remaining articles keep rendering meanwhile
+        response_text: str = ""
+        while (token := await asyncio.to_thread(next, response_tokens, None)) is not None:
+            response_text += token
+            speech.feed(token)
+            answer_placeholder.markdown(response_text + "▌", unsafe_allow_html=True)
+        answer_placeholder.markdown(response_text, unsafe_allow_html=True)
+        return response_text
+
+    _, response = await asyncio.gather(collect_results(), stream_answer())
+    return response, markdown_results
+
+
+def render_timings(timings_placeholder: Any, trace: RequestTrace) -> None:
+    """
+    Show where the time of a request went, stage by stage.
+
+    Args:
+        timings_placeholder (Any): Streamlit placeholder for the timings expander.
+        trace (RequestTrace): The finished request trace.
+    """
+    with timings_placeholder.container():
+        with st.expander(f"⏱️ Timings ({trace.total or 0.0:.2f}s)"):
+            st.table([
+                {"Stage": stage, "Calls": int(entry["count"]), "Total (s)": f"{entry['total_s']:.3f}",
+                 "Max (s)": f"{entry['max_s']:.3f}"}
+                for stage, entry in sorted(trace.stage_totals().items(), key=lambda item: -item[1]["total_s"])
+            ])
+
 # ============================ QUERY PROCESSING ============================
 
 # Handle user input
@@ -108,99 +313,37 @@ if query := st.chat_input("What would you like to know?"):
 
     # Initialize results table
     results_table: str = "**No matching results found.**"
+    response: str = "Service temporarily unavailable. Please try again."
 
-    try:
-        with st.spinner("Processing request..."):
-            if ai_only_mode:
-                search_response: str = "<empty>"
-            else:
-                # Execute search query
-                search_output: Dict[str, Any] = asyncio.run(
-                    fetch_news_data(query=query, region=region_code, count=result_count, time_filter=temporal_filter)
-                )
-
-                if search_output["status"] == "success":
-                    markdown_results: List[Dict[str, Any]] = search_output["results"]
-                    search_response = f"Search results:\n{markdown_results}"
-
-                    def sanitize_title(raw_title: str) -> str:
-                        """
-                        Formats title for proper display by replacing delimiter characters.
-
-                        Args:
-                            raw_title (str): Original title text.
-
-                        Returns:
-                            str: Formatted title suitable for display.
-                        """
-                        return raw_title.replace("|", " - ").strip()
-
-                    def format_rating(raw_rating: str) -> str:
-                        """
-                        Creates visual star rating representation.
-
-                        Args:
-                            raw_rating (str): Numerical rating value.
-
-                        Returns:
-                            str: Star-based rating display (⭐ and ⭐½).
-                        """
-                        try:
-                            rating_val: float = float(raw_rating)
-                            full_count: int = int(rating_val)
-                            has_half: str = "⭐½" if (rating_val - full_count) >= 0.5 else ""
-                            return "⭐" * full_count + has_half
-                        except ValueError:
-                            return "⭐"
-
-                    # Construct results table
-                    results_table = "| # | Title | Rating | Summary |\n|---|------|--------|---------|\n"
-
-                    for item in markdown_results:
-                        clean_title = sanitize_title(item['title'])
-                        raw_rating = str(item.get('rating', '⭐')).strip()
-
-                        if raw_rating.replace('.', '', 1).isdigit():
-                            rating_display = format_rating(raw_rating)
-                        else:
-                            rating_display = "⭐"
-
-                        if item.get('link', '').startswith("http"):
-                            title_display = f"[{clean_title}]({item['link']})"
-                        else:
-                            title_display = clean_title
-
-                        summary_text = item.get('summary', '').strip()
-                        truncated_summary = summary_text[:100] + "..." if len(summary_text) > 100 else summary_text
-
-                        results_table += f"| {item['num']} | {title_display} | {rating_display} | {truncated_summary} |\n"
-            
-            # Generate AI response
-            assistant = AIAssistant()
-            assistant.history = st.session_state.messages.copy()
-            response = assistant.generate_response(
-                f"""
-                Query: {query}
-                Results: {search_response}
-                Context: {[item['summary'] for item in search_output.get("results", [])]}
-                Use search results if available, otherwise base response on conversation history.
-                """
-            )
-
-    except Exception as e:
-        st.warning(f"Search error occurred: {e}")
-        response = "Service temporarily unavailable. Please try again."
-
-    # Generate audio response
-    text_to_speech(response)
-
-    # Display response
     with st.chat_message("assistant"):
-        st.markdown(response, unsafe_allow_html=True)
-        st.audio("output.mp3", format="audio/mpeg", loop=True)
+        answer_placeholder = st.empty()
+        audio_placeholder = st.empty()
+        timings_placeholder = st.empty()
         with st.expander("Source References:", expanded=True):
-            st.markdown(results_table, unsafe_allow_html=True)
+            table_placeholder = st.empty()
+            table_placeholder.markdown("*Searching...*" if not ai_only_mode else results_table)
+
+        speech_synthesizer = get_speech_synthesizer()
+        speech = SpeechStream(speech_synthesizer)
+        try:
+            # Every record logged while answering, including from article tasks, carries the request id and query
+            with trace_request(query) as trace:
+                response, search_results = asyncio.run(answer_query(query, answer_placeholder, table_placeholder, speech))
+            results_table = build_results_table(search_results)
+        except Exception as e:
+            st.warning(f"Search error occurred: {e}")
+            answer_placeholder.markdown(response, unsafe_allow_html=True)
+            speech = SpeechStream(speech_synthesizer)
+            speech.feed(response)
+
+        table_placeholder.markdown(results_table, unsafe_allow_html=True)
 
     # Update conversation log
     complete_response: str = f"{response}\n\n{results_table}"
-    st.session_state.messages.append({"role": "assistant", "content": complete_response})
\ No newline at end of file
+    st.session_state.messages.append({"role": "assistant", "content": complete_response})
+
+    # Speech was synthesized in the background while the answer streamed; show it last
+    render_speech(audio_placeholder, speech.close(), speech_synthesizer.mime_type)
+
+    if show_timings:
+        render_timings(timings_placeholder, trace)
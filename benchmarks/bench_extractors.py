@@ -0,0 +1,86 @@
+"""
+bench_extractors.py
+
+Compares the HTML extraction backends on the saved pages in benchmarks/fixtures.
+
+Usage:
+    python benchmarks/bench_extractors.py [--repeat 50]
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scraping.extractors import EXTRACTORS, HTMLExtractor, get_extractor
+
+FIXTURE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def time_call(function: Callable[[], object], repeat: int) -> float:
+    """
+    Time a callable.
+
+    Args:
+        function (Callable[[], object]): Function to time.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Mean milliseconds per run.
+    """
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start_time) * 1000 / repeat
+
+
+def run_benchmark(repeat: int) -> List[Dict[str, object]]:
+    """
+    Benchmark every backend on every fixture and check that their outputs agree.
+
+    Args:
+        repeat (int): Runs per backend and fixture.
+
+    Returns:
+        List[Dict[str, object]]: One row per (fixture, backend).
+    """
+    extractors: List[HTMLExtractor] = [get_extractor(name) for name in EXTRACTORS]
+    rows: List[Dict[str, object]] = []
+
+    for filename in sorted(os.listdir(FIXTURE_DIRECTORY)):
+        if not filename.endswith(".html"):
+            continue
+        with open(os.path.join(FIXTURE_DIRECTORY, filename), encoding="utf-8") as f:
+            page_html = f.read()
+
+        is_search_page = "result__body" in page_html
+        outputs = {}
+        for extractor in extractors:
+            extract = extractor.extract_search_results if is_search_page else extractor.extract_paragraphs
+            outputs[extractor.name] = extract(page_html)
+            rows.append({
+                "fixture": filename,
+                "backend": extractor.name,
+                "items": len(outputs[extractor.name]),
+                "ms": time_call(lambda: extract(page_html), repeat),
+            })
+
+        if len({repr(output) for output in outputs.values()}) > 1:
+            print(f"WARNING: backends disagree on {filename}")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark HTML extraction backends")
+    parser.add_argument("--repeat", type=int, default=50, help="runs per backend and fixture")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.repeat)
+    print(f"{'fixture':<28} {'backend':<8} {'items':>6} {'ms/run':>9}")
+    for row in rows:
+        print(f"{row['fixture']:<28} {row['backend']:<8} {row['items']:>6} {row['ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+bench_import_time.py
+
+Measures cold import time of the app's entry points in fresh interpreters and fails
+if startup regresses: either a scenario exceeds its time budget or it imports a heavy
+dependency it should only load on first use.
+
+Usage:
+    python benchmarks/bench_import_time.py [--repeat 5] [--budget-scale 1.0]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Heavy packages that must never be imported just to start the app
+HEAVY_MODULES = ("keras", "tensorflow", "torch", "transformers", "sentence_transformers", "huggingface_hub",
+                 "selenium", "webdriver_manager", "gtts", "onnxruntime")
+
+# name -> (import statement, wall-clock budget in seconds, modules that must stay unloaded)
+SCENARIOS: Dict[str, tuple] = {
+    "ai_only": ("from helper import AIAssistant, get_current_year, text_to_speech", 1.0,
+                HEAVY_MODULES + ("numpy", "bs4", "lxml", "requests", "scraping")),
+    "search": ("from helper import stream_news_data, fetch_news_data", 2.0, HEAVY_MODULES),
+}
+
+_PROBE = """
+import json, sys, time
+start_time = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start_time
+print(json.dumps({{"seconds": elapsed, "modules": sorted({{name.split(".")[0] for name in sys.modules}})}}))
+"""
+
+
+def measure(statement: str) -> Dict[str, object]:
+    """
+    Import a statement in a fresh interpreter.
+
+    Args:
+        statement (str): Import statement to time.
+
+    Returns:
+        Dict[str, object]: Seconds spent importing and the top-level modules loaded.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(statement=statement)],
+        cwd=REPOSITORY_ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(repeat: int, budget_scale: float) -> List[str]:
+    """
+    Time every scenario and collect regressions.
+
+    Args:
+        repeat (int): Fresh interpreters per scenario; the fastest run is reported.
+        budget_scale (float): Multiplier applied to every budget (for slow CI machines).
+
+    Returns:
+        List[str]: Failure messages; empty if startup is within budget.
+    """
+    failures: List[str] = []
+    for name, (statement, budget, forbidden) in SCENARIOS.items():
+        runs = [measure(statement) for _ in range(repeat)]
+        best = min(run["seconds"] for run in runs)
+        loaded_heavy = sorted(set(forbidden) & set(runs[0]["modules"]))
+        print(f"{name:<10} {best * 1000:8.1f} ms (budget {budget * budget_scale * 1000:.0f} ms)"
+              f"{'  heavy imports: ' + ', '.join(loaded_heavy) if loaded_heavy else ''}")
+
+        if best > budget * budget_scale:
+            failures.append(f"{name}: import took {best:.2f}s, budget is {budget * budget_scale:.2f}s")
+        if loaded_heavy:
+            failures.append(f"{name}: imported {', '.join(loaded_heavy)} at startup")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time regression check")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per scenario")
+    parser.add_argument("--budget-scale", type=float, default=float(os.getenv("IMPORT_BUDGET_SCALE", "1.0")),
+                        help="multiply every time budget by this factor")
+    args = parser.parse_args()
+
+    failures = run_benchmark(args.repeat, args.budget_scale)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,418 @@
+"""
+bench_pipeline.py
+
+Offline benchmark of the query pipeline. Recorded DuckDuckGo and article pages are
+replayed by a local HTTP server (benchmarks/replay_server.py), the LLM and speech use
+their fake backends, and the models are stubbed unless --models real is given.
+
+Measures latency percentiles and throughput of fetch_news_data, extract_article_content,
+credibility rating and URLValidator.rate_url_validity at several result counts and
+concurrency levels, and writes machine-readable results for regression comparison.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--iterations 20] [--latency-ms 20] [--output results.json]
+    python benchmarks/bench_pipeline.py --compare baseline.json [--max-regression 0.2]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_ROOT)
+sys.path.insert(0, os.path.join(REPOSITORY_ROOT, "deliverable2"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from replay_server import ReplayServer
+
+# name -> parameter grid; every combination is one benchmark case
+DEFAULT_GRID: Dict[str, List[Dict[str, int]]] = {
+    "fetch_news_data": [{"count": count, "concurrency": concurrency} for count in (1, 5, 10) for concurrency in (1, 4)],
+    "extract_article_content": [{"concurrency": concurrency} for concurrency in (1, 10, 50)],
+    "credibility": [{"concurrency": concurrency} for concurrency in (1, 16, 64)],
+    "rate_url_validity": [{"urls": urls, "concurrency": concurrency} for urls in (1, 8) for concurrency in (1, 4)],
+}
+
+# ============================ STUB MODELS ============================
+
+
+class StubSentenceEncoder:
+    """Deterministic hashed bag-of-words encoder with the SentenceTransformer interface used by URLValidator."""
+
+    def __init__(self, dimension: int = 384) -> None:
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_numpy: bool = True) -> Any:
+        import numpy as np
+
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, int(hashlib.md5(word.encode("utf-8")).hexdigest()[:8], 16) % self.dimension] += 1.0
+        return vectors
+
+
+class StubTextClassifier:
+    """Deterministic classifier with the transformers pipeline call interface."""
+
+    def __init__(self, labels: Tuple[str, ...]) -> None:
+        self.labels = labels
+
+    def __call__(self, texts: Any, batch_size: int = 1, **kwargs: Any) -> List[Dict[str, Any]]:
+        texts = [texts] if isinstance(texts, str) else texts
+        return [{"label": self.labels[len(text) % len(self.labels)], "score": 0.9} for text in texts]
+
+
+def stub_predict_credibility(article_titles: List[str], delay_ms: float = 0.0) -> List[str]:
+    """Stand-in for predict_credibility: a fixed per-batch cost and a rating derived from the title."""
+    if delay_ms:
+        time.sleep(delay_ms / 1000)
+    return [str(1 + len(title) % 5) for title in article_titles]
+
+# ============================ MEASUREMENT ============================
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def summarize(name: str, params: Dict[str, int], latencies: List[float], errors: int, wall_seconds: float,
+              items_per_call: int = 1) -> Dict[str, Any]:
+    """
+    Build one result row.
+
+    Args:
+        name (str): Benchmark name.
+        params (Dict[str, int]): Case parameters.
+        latencies (List[float]): Seconds per call.
+        errors (int): Calls that raised or returned an error.
+        wall_seconds (float): Wall-clock time of the whole case.
+        items_per_call (int): Items (articles, URLs) handled per call, for item throughput.
+
+    Returns:
+        Dict[str, Any]: Result row with throughput and latency percentiles in milliseconds.
+    """
+    ordered = sorted(latencies)
+    calls = len(ordered)
+    return {
+        "benchmark": name,
+        "params": params,
+        "calls": calls,
+        "errors": errors,
+        "wall_s": round(wall_seconds, 4),
+        "calls_per_s": round(calls / wall_seconds, 3) if wall_seconds else 0.0,
+        "items_per_s": round(calls * items_per_call / wall_seconds, 3) if wall_seconds else 0.0,
+        "mean_ms": round(sum(ordered) / calls * 1000, 3) if calls else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3) if calls else 0.0,
+    }
+
+
+async def run_async_case(call: Callable[[int], Awaitable[bool]], iterations: int,
+                         concurrency: int) -> Tuple[List[float], int, float]:
+    """
+    Run ``iterations`` calls with at most ``concurrency`` in flight.
+
+    Args:
+        call (Callable[[int], Awaitable[bool]]): Receives the iteration number and returns False on error.
+        iterations (int): Total calls.
+        concurrency (int): Calls in flight at once.
+
+    Returns:
+        Tuple[List[float], int, float]: Per-call seconds, error count and wall-clock seconds.
+    """
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed_call(iteration: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start_time = time.perf_counter()
+            try:
+                ok = await call(iteration)
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - start_time)
+            errors += 0 if ok else 1
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(timed_call(iteration) for iteration in range(iterations)))
+    return latencies, errors, time.perf_counter() - start_time
+
+
+def run_threaded_case(call: Callable[[int], bool], iterations: int, concurrency: int) -> Tuple[List[float], int, float]:
+    """Thread-pool counterpart of run_async_case for blocking APIs."""
+    lock = threading.Lock()
+    latencies: List[float] = []
+    errors = 0
+
+    def timed_call(iteration: int) -> None:
+        nonlocal errors
+        start_time = time.perf_counter()
+        try:
+            ok = call(iteration)
+        except Exception:
+            ok = False
+        with lock:
+            latencies.append(time.perf_counter() - start_time)
+            errors += 0 if ok else 1
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(timed_call, range(iterations)))
+    return latencies, errors, time.perf_counter() - start_time
+
+# ============================ BENCHMARKS ============================
+
+
+class PipelineBenchmark:
+    """Runs every benchmark case against a replay server; one instance per run."""
+
+    def __init__(self, server: ReplayServer, iterations: int, models: str, stub_model_ms: float) -> None:
+        """
+        Import the pipeline (after the environment points it at the replay server) and install stubs.
+
+        Args:
+            server (ReplayServer): Running replay server.
+            iterations (int): Calls per case.
+            models (str): "stub" or "real".
+            stub_model_ms (float): Per-batch cost of the stub credibility model.
+        """
+        from helper import credibility_batcher
+
+        self.server = server
+        self.iterations = iterations
+        self.models = models
+        self.run_id = f"{time.time():.0f}"
+        self._validator: Optional[Any] = None
+        if models == "stub":
+            credibility_batcher.predict_fn = lambda titles: stub_predict_credibility(titles, stub_model_ms)
+
+    def unique(self, label: str, iteration: int) -> str:
+        """A query never used before, so search, page and embedding caches are cold."""
+        return f"{label} {self.run_id}-{iteration}"
+
+    def fetch_news_data(self, count: int, concurrency: int) -> Dict[str, Any]:
+        from helper import fetch_news_data
+
+        async def call(iteration: int) -> bool:
+            result = await fetch_news_data(self.unique(f"news {count}x{concurrency}", iteration), count=count)
+            return result["status"] == "success" and len(result["results"]) == count
+
+        latencies, errors, wall_seconds = asyncio.run(run_async_case(call, self.iterations, concurrency))
+        return summarize("fetch_news_data", {"count": count, "concurrency": concurrency}, latencies, errors,
+                         wall_seconds, items_per_call=count)
+
+    def extract_article_content(self, concurrency: int) -> Dict[str, Any]:
+        from helper import FetchLimiter, create_http_client, extract_article_content
+
+        async def run() -> Tuple[List[float], int, float]:
+            limiter = FetchLimiter()
+            async with create_http_client() as client:
+                async def call(iteration: int) -> bool:
+                    url = f"{self.server.base_url}/site/host-{iteration % 8}.example/article-{self.unique('x', iteration)}"
+                    text = await extract_article_content(url, client, limiter)
+                    return bool(text) and not text.startswith(("Failed", "Access forbidden", "Unsupported"))
+
+                return await run_async_case(call, self.iterations * concurrency, concurrency)
+
+        latencies, errors, wall_seconds = asyncio.run(run())
+        return summarize("extract_article_content", {"concurrency": concurrency}, latencies, errors, wall_seconds)
+
+    def credibility(self, concurrency: int) -> Dict[str, Any]:
+        from helper import AIAssistant
+
+        assistant = AIAssistant()
+
+        async def call(iteration: int) -> bool:
+            rating = await assistant.rate_article_credibility(self.unique("Title", iteration), "body")
+            return rating != "Error"
+
+        latencies, errors, wall_seconds = asyncio.run(run_async_case(call, self.iterations * concurrency, concurrency))
+        return summarize("credibility", {"concurrency": concurrency}, latencies, errors, wall_seconds)
+
+    def rate_url_validity(self, urls: int, concurrency: int) -> Dict[str, Any]:
+        validator = self.url_validator()
+
+        def call(iteration: int) -> bool:
+            pairs = [(f"query {iteration}", f"{self.server.base_url}/site/validator.example/{self.unique('page', iteration)}-{index}")
+                     for index in range(urls)]
+            results = validator.rate_urls_validity(pairs) if urls > 1 else [validator.rate_url_validity(*pairs[0])]
+            return len(results) == urls
+
+        latencies, errors, wall_seconds = run_threaded_case(call, self.iterations, concurrency)
+        return summarize("rate_url_validity", {"urls": urls, "concurrency": concurrency}, latencies, errors,
+                         wall_seconds, items_per_call=urls)
+
+    def url_validator(self) -> Any:
+        """URLValidator with stub models, or with the real ones when --models real."""
+        from deliverable2 import URLValidator
+
+        if self._validator is None:
+            if self.models == "stub":
+                self._validator = URLValidator(
+                    similarity_model=StubSentenceEncoder(),
+                    fake_news_classifier=StubTextClassifier(("REAL", "FAKE")),
+                    sentiment_analyzer=StubTextClassifier(("POSITIVE", "NEGATIVE", "NEUTRAL")),
+                )
+            else:
+                self._validator = URLValidator()
+        return self._validator
+
+    def run(self, grid: Dict[str, List[Dict[str, int]]]) -> List[Dict[str, Any]]:
+        """
+        Run every case of the grid, recording benchmarks that cannot run here as skipped.
+
+        Args:
+            grid (Dict[str, List[Dict[str, int]]]): Benchmark name -> parameter sets.
+
+        Returns:
+            List[Dict[str, Any]]: One result row per case.
+        """
+        rows: List[Dict[str, Any]] = []
+        for name, cases in grid.items():
+            for params in cases:
+                try:
+                    row = getattr(self, name)(**params)
+                except ImportError as e:
+                    row = {"benchmark": name, "params": params, "skipped": f"missing dependency: {e.name or e}"}
+                rows.append(row)
+                print_row(row)
+        return rows
+
+# ============================ REPORTING ============================
+
+
+def case_key(row: Dict[str, Any]) -> str:
+    """Identifier matching the same case across result files."""
+    return f"{row['benchmark']}[{','.join(f'{name}={value}' for name, value in sorted(row['params'].items()))}]"
+
+
+def print_row(row: Dict[str, Any]) -> None:
+    if "skipped" in row:
+        print(f"{case_key(row):<52} skipped ({row['skipped']})")
+        return
+    print(f"{case_key(row):<52} {row['calls_per_s']:>9.2f}/s  p50 {row['p50_ms']:>9.1f}  p95 {row['p95_ms']:>9.1f}"
+          f"  p99 {row['p99_ms']:>9.1f} ms  errors {row['errors']}")
+
+
+def compare(rows: List[Dict[str, Any]], baseline_path: str, max_regression: float) -> List[str]:
+    """
+    Compare p95 latency and throughput against a previous results file.
+
+    Args:
+        rows (List[Dict[str, Any]]): Current results.
+        baseline_path (str): Results JSON written by an earlier run.
+        max_regression (float): Allowed relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        List[str]: Regression messages; empty if every case is within bounds.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {case_key(row): row for row in json.load(f)["results"] if "skipped" not in row}
+    failures: List[str] = []
+    for row in rows:
+        previous: Optional[Dict[str, Any]] = baseline.get(case_key(row))
+        if previous is None or "skipped" in row:
+            continue
+        p95_change = row["p95_ms"] / previous["p95_ms"] - 1 if previous["p95_ms"] else 0.0
+        throughput_change = 1 - row["calls_per_s"] / previous["calls_per_s"] if previous["calls_per_s"] else 0.0
+        print(f"{case_key(row):<52} p95 {p95_change:+7.1%}  throughput {-throughput_change:+7.1%}")
+        if p95_change > max_regression:
+            failures.append(f"{case_key(row)}: p95 {previous['p95_ms']:.1f} -> {row['p95_ms']:.1f} ms")
+        if throughput_change > max_regression:
+            failures.append(f"{case_key(row)}: throughput {previous['calls_per_s']:.2f} -> {row['calls_per_s']:.2f}/s")
+    return failures
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPOSITORY_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def configure_environment(server: ReplayServer, cache_directory: str) -> None:
+    """Point every external dependency of the pipeline at the replay server and offline stand-ins."""
+    os.environ.update({
+        "DUCKDUCKGO_HTML_URL": f"{server.base_url}/html/",
+        "SEARCH_BACKEND": "http",
+        "FACT_CHECK_API_URL": f"{server.base_url}/factcheck",
+        "SERPAPI_URL": f"{server.base_url}/serpapi",
+        "LLM_BACKEND": "fake",
+        "TTS_ENGINE": "fake",
+        "INTELLISEARCH_CACHE_DIR": cache_directory,
+        "MODEL_SERVER_ADDRESS": os.getenv("MODEL_SERVER_ADDRESS", ""),
+        "LOG_CONSOLE_LEVEL": os.getenv("LOG_CONSOLE_LEVEL", "ERROR"),
+        "METRICS_FILE": "",
+        "HOST_RATE_PER_SECOND": "0",  # Every replayed page shares one host
+        "DEDUP_RESULTS": os.getenv("DEDUP_RESULTS", "0"),  # Replayed pages repeat two recorded articles
+        "CORPUS_SEARCH_FIRST": "0",  # Every iteration must run the live pipeline
+    })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmark of the search pipeline")
+    parser.add_argument("--iterations", type=int, default=20, help="calls per case (per concurrency slot for fetches)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="simulated network latency per response")
+    parser.add_argument("--models", choices=("stub", "real"), default="stub", help="stub models or the real ones")
+    parser.add_argument("--stub-model-ms", type=float, default=5.0, help="per-batch cost of the stub credibility model")
+    parser.add_argument("--only", nargs="*", choices=sorted(DEFAULT_GRID), help="run only these benchmarks")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="results JSON of a previous run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed relative slowdown with --compare")
+    args = parser.parse_args()
+
+    server = ReplayServer(latency_ms=args.latency_ms).start()
+    with tempfile.TemporaryDirectory(prefix="intellisearch-bench-") as cache_directory:
+        configure_environment(server, cache_directory)
+        grid = {name: cases for name, cases in DEFAULT_GRID.items() if not args.only or name in args.only}
+        rows = PipelineBenchmark(server, args.iterations, args.models, args.stub_model_ms).run(grid)
+    server.stop()
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "iterations": args.iterations,
+            "latency_ms": args.latency_ms,
+            "models": args.models,
+            "stub_model_ms": args.stub_model_ms,
+        },
+        "results": rows,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    failures = compare(rows, args.compare, args.max_regression) if args.compare else []
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
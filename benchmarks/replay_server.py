@@ -0,0 +1,213 @@
+"""
+replay_server.py
+
+Local HTTP stand-in for DuckDuckGo, news sites and the fact-check / SerpAPI endpoints,
+serving the recorded pages in benchmarks/fixtures so the pipeline can be benchmarked
+without network access.
+
+    /html/?q=...            DuckDuckGo HTML results, with every result rewritten to
+                            point back at this server (the query is kept in the
+                            article URLs, so a new query means cold caches)
+    /site/<host>/<path>     a recorded article page (article_*.html fixtures)
+    /status/<code>/<path>   an empty response with that status code
+    /factcheck, /serpapi    empty JSON API responses
+
+Usage:
+    python benchmarks/replay_server.py [--port 8765] [--latency-ms 20] [--results 20]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+FIXTURE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SEARCH_FIXTURE = "duckduckgo_results.html"
+ARTICLE_FIXTURE_PREFIX = "article_"
+
+_RESULT_BLOCK = re.compile(r'<div class="result results_links.*?\n</div>\n', re.DOTALL)
+_RESULT_TARGET = re.compile(r"uddg=(https?%3A%2F%2F[^&\"]+)")
+
+
+def load_search_template(directory: str = FIXTURE_DIRECTORY) -> Tuple[str, List[str], str]:
+    """
+    Split the recorded results page into header, result blocks and footer.
+
+    Args:
+        directory (str): Fixture directory.
+
+    Returns:
+        Tuple[str, List[str], str]: Markup before the first result, each result block, markup after the last.
+    """
+    with open(os.path.join(directory, SEARCH_FIXTURE), encoding="utf-8") as f:
+        page_html = f.read()
+    blocks = list(_RESULT_BLOCK.finditer(page_html))
+    if not blocks:
+        raise ValueError(f"No result blocks found in {SEARCH_FIXTURE}")
+    return page_html[:blocks[0].start()], [block.group(0) for block in blocks], page_html[blocks[-1].end():]
+
+
+def load_articles(directory: str = FIXTURE_DIRECTORY) -> List[bytes]:
+    """Read every recorded article page, sorted by file name."""
+    articles: List[bytes] = []
+    for filename in sorted(os.listdir(directory)):
+        if filename.startswith(ARTICLE_FIXTURE_PREFIX) and filename.endswith(".html"):
+            with open(os.path.join(directory, filename), "rb") as f:
+                articles.append(f.read())
+    if not articles:
+        raise ValueError(f"No {ARTICLE_FIXTURE_PREFIX}*.html fixtures in {directory}")
+    return articles
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    """Threaded server that ignores clients hanging up mid-response (cancelled fetches, early exits)."""
+
+    daemon_threads = True
+
+    def handle_error(self, request: object, client_address: object) -> None:
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class ReplayServer:
+    """
+    Threaded HTTP server replaying the recorded fixtures.
+
+    Every response is delayed by ``latency_ms`` to model network round trips; the
+    delay runs on the request thread, so concurrent requests overlap as they would
+    against real sites.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0, results: int = 20,
+                 directory: str = FIXTURE_DIRECTORY) -> None:
+        """
+        Load the fixtures and bind the server (port 0 picks a free port).
+
+        Args:
+            host (str): Interface to bind.
+            port (int): Port to listen on.
+            latency_ms (float): Delay added to every response.
+            results (int): Results on every search page; recorded results are repeated to reach it.
+            directory (str): Fixture directory.
+        """
+        self.latency_ms = latency_ms
+        self.results = results
+        self.header, self.blocks, self.footer = load_search_template(directory)
+        self.articles = load_articles(directory)
+        self.requests_served = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.httpd = _QuietHTTPServer((host, port), self._handler_class())
+
+    @property
+    def base_url(self) -> str:
+        """Root URL of the running server."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def search_page(self, query: str) -> bytes:
+        """
+        Build a results page whose links all point back at this server.
+
+        Args:
+            query (str): Search query; kept in the article URLs so every query has its own URLs.
+
+        Returns:
+            bytes: HTML of the results page.
+        """
+        blocks: List[str] = []
+        for index in range(self.results):
+            copy = index // len(self.blocks)
+
+            def rewrite(match: "re.Match") -> str:
+                original = urllib.parse.urlsplit(urllib.parse.unquote(match.group(1)))
+                path = original.path + (f"-{copy}" if copy else "")
+                local_url = f"{self.base_url}/site/{original.hostname}{path}?{urllib.parse.urlencode({'q': query})}"
+                return f"uddg={urllib.parse.quote(local_url, safe='')}"
+
+            blocks.append(_RESULT_TARGET.sub(rewrite, self.blocks[index % len(self.blocks)]))
+        return (self.header + "".join(blocks) + self.footer).encode("utf-8")
+
+    def article_page(self, path: str) -> bytes:
+        """Pick a recorded article deterministically from the URL path."""
+        digest = int(hashlib.sha1(path.encode("utf-8")).hexdigest(), 16)
+        return self.articles[digest % len(self.articles)]
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real sites
+
+            def do_GET(self) -> None:
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                with server._lock:
+                    server.requests_served += 1
+                parts = urllib.parse.urlsplit(self.path)
+                if parts.path.startswith("/html"):
+                    query = urllib.parse.parse_qs(parts.query).get("q", [""])[0]
+                    self._reply(200, server.search_page(query), "text/html; charset=utf-8")
+                elif parts.path.startswith("/site/"):
+                    self._reply(200, server.article_page(parts.path), "text/html; charset=utf-8")
+                elif parts.path.startswith("/status/"):
+                    code = parts.path.split("/")[2]
+                    self._reply(int(code) if code.isdigit() else 500, b"", "text/html; charset=utf-8")
+                elif parts.path.startswith("/factcheck"):
+                    self._reply(200, json.dumps({"claims": []}).encode("utf-8"), "application/json")
+                elif parts.path.startswith("/serpapi"):
+                    self._reply(200, json.dumps({"organic_results": []}).encode("utf-8"), "application/json")
+                else:
+                    self._reply(404, b"", "text/html; charset=utf-8")
+
+            def _reply(self, status: int, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass  # One line per request would drown the benchmark output
+
+        return ReplayHandler
+
+    def start(self) -> "ReplayServer":
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay recorded search and article pages over HTTP")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every response")
+    parser.add_argument("--results", type=int, default=20, help="results on every search page")
+    args = parser.parse_args()
+
+    server = ReplayServer(port=args.port, latency_ms=args.latency_ms, results=args.results)
+    print(f"Replaying fixtures at {server.base_url}")
+    print(f"  DUCKDUCKGO_HTML_URL={server.base_url}/html/ SEARCH_BACKEND=http")
+    print(f"  FACT_CHECK_API_URL={server.base_url}/factcheck SERPAPI_URL={server.base_url}/serpapi")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
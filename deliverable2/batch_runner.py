@@ -0,0 +1,156 @@
+"""
+batch_runner.py
+
+Resumable, parallel batch evaluation of (prompt, url) pairs with URLValidator.
+
+Usage:
+    python batch_runner.py pairs.csv --output results.csv --workers 4 --shard-size 16
+
+Input may be CSV (columns user_prompt, url_to_check) or JSONL (same keys). Rows already
+present in the output file are skipped, so an interrupted run can simply be restarted.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+import traceback
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+OUTPUT_FIELDS = [
+    "user_prompt", "url_to_check", "func_rating", "custom_rating",
+    "domain_trust", "content_relevance", "fact_check_score", "bias_score", "citation_score", "final_score",
+    "explanation", "fetch_s", "models_s", "network_wait_s", "shard_s",
+]
+
+# Loaded once per worker process by init_worker
+_validator = None
+
+
+def row_key(user_prompt: str, url: str) -> str:
+    """Stable identifier of a (prompt, url) pair used for checkpointing."""
+    return hashlib.sha256(f"{user_prompt}\0{url}".encode("utf-8")).hexdigest()
+
+
+def read_pairs(input_path: str) -> Iterator[Tuple[str, str]]:
+    """Reads (prompt, url) pairs from a CSV or JSONL file."""
+    with open(input_path, newline="", encoding="utf-8") as file:
+        if input_path.endswith((".jsonl", ".ndjson")):
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record["user_prompt"], record["url_to_check"]
+        else:
+            for record in csv.DictReader(file):
+                yield record["user_prompt"], record["url_to_check"]
+
+
+def read_completed(output_path: str) -> Set[str]:
+    """Returns the keys of pairs already written to the output file."""
+    if not os.path.exists(output_path):
+        return set()
+    with open(output_path, newline="", encoding="utf-8") as file:
+        return {row_key(row["user_prompt"], row["url_to_check"]) for row in csv.DictReader(file)}
+
+
+def init_worker(serpapi_key: Optional[str]) -> None:
+    """Loads the URLValidator models once in each worker process."""
+    global _validator
+    from deliverable2 import URLValidator
+
+    _validator = URLValidator(serpapi_key)
+
+
+def score_shard(shard: List[Tuple[str, str]]) -> List[Dict[str, object]]:
+    """Scores one shard of pairs in a worker and returns output rows with timing columns."""
+    shard_start = time.perf_counter()
+    stage_timings: Dict[str, float] = {}
+    results = _validator.rate_urls_validity(shard, stage_timings=stage_timings)
+    shard_seconds = time.perf_counter() - shard_start
+
+    rows = []
+    for (user_prompt, url), result in zip(shard, results):
+        raw_scores = result["raw_scores"]
+        rows.append({
+            "user_prompt": user_prompt,
+            "url_to_check": url,
+            "func_rating": result["stars"]["score"],
+            "custom_rating": result["stars"]["score"] + 1,
+            "domain_trust": raw_scores["Domain Trust"],
+            "content_relevance": raw_scores["Content Relevance"],
+            "fact_check_score": raw_scores["Fact-Check Score"],
+            "bias_score": raw_scores["Bias Score"],
+            "citation_score": raw_scores["Citation Score"],
+            "final_score": round(raw_scores["Final Validity Score"], 2),
+            "explanation": result["explanation"],
+            "fetch_s": round(stage_timings.get("fetch", 0.0), 3),
+            "models_s": round(stage_timings.get("models", 0.0), 3),
+            "network_wait_s": round(stage_timings.get("network_wait", 0.0), 3),
+            "shard_s": round(shard_seconds, 3),
+        })
+    return rows
+
+
+def safe_score_shard(shard: List[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], List[Dict[str, object]], Optional[str]]:
+    """Wraps score_shard so one failing shard does not abort the whole run."""
+    try:
+        return shard, score_shard(shard), None
+    except Exception:
+        return shard, [], traceback.format_exc()
+
+
+def make_shards(pairs: List[Tuple[str, str]], shard_size: int) -> List[List[Tuple[str, str]]]:
+    """Splits pairs into shards of at most shard_size."""
+    return [pairs[start:start + shard_size] for start in range(0, len(pairs), shard_size)]
+
+
+def run(input_path: str, output_path: str, workers: int, shard_size: int, serpapi_key: Optional[str]) -> None:
+    """Scores every pending pair, appending results to the output file as shards finish."""
+    completed = read_completed(output_path)
+    pending = list(dict.fromkeys(
+        pair for pair in read_pairs(input_path) if row_key(*pair) not in completed
+    ))
+    print(f"{len(completed)} rows already done, {len(pending)} pending")
+    if not pending:
+        return
+
+    write_header = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+    run_start = time.perf_counter()
+    done = 0
+
+    with open(output_path, "a", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=OUTPUT_FIELDS)
+        if write_header:
+            writer.writeheader()
+
+        with multiprocessing.Pool(processes=workers, initializer=init_worker, initargs=(serpapi_key,)) as pool:
+            for shard, rows, error in pool.imap_unordered(safe_score_shard, make_shards(pending, shard_size)):
+                if error:
+                    print(f"Shard of {len(shard)} failed and will be retried on the next run:\n{error}")
+                    continue
+                writer.writerows(rows)
+                # Checkpoint: make finished rows durable before reporting progress
+                file.flush()
+                os.fsync(file.fileno())
+                done += len(rows)
+                print(f"{done}/{len(pending)} rows scored ({time.perf_counter() - run_start:.1f}s)")
+
+    print(f"Results saved to {output_path}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Resumable parallel URL validity scoring")
+    parser.add_argument("input", help="CSV or JSONL file with user_prompt and url_to_check")
+    parser.add_argument("--output", default="batch_results.csv", help="CSV file to append results to")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="worker processes")
+    parser.add_argument("--shard-size", type=int, default=16, help="pairs scored per worker task")
+    parser.add_argument("--serpapi-key", default=os.getenv("SERPAPI_KEY"), help="SerpAPI key (default: $SERPAPI_KEY)")
+    args = parser.parse_args()
+
+    run(args.input, args.output, args.workers, args.shard_size, args.serpapi_key)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,97 @@
 """
 deliverable2.py
 """
+import os
+import sys
 import requests
 import string
-from bs4 import BeautifulSoup
-from sentence_transformers import SentenceTransformer, util
-from transformers import pipeline
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from typing import List, Optional, Tuple
+try:
+    from .embedding_store import EmbeddingStore, chunk_text, max_pooled_similarity
+except ImportError:  # Run as a script (or imported) from this directory, not as deliverable2.deliverable2
+    from embedding_store import EmbeddingStore, chunk_text, max_pooled_similarity
+
+# Make the shared scraping package importable when running from this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model_server.client import RemoteSentenceEncoder, RemoteTextClassifier, get_model_client
+from model_server.models import (CLASSIFIER_MODEL_NAME, SENTIMENT_MODEL_NAME, SIMILARITY_MODEL_NAME,
+                                 load_similarity_model, load_text_classifier)
+from scraping.host_health import host_health, parse_retry_after
+from scraping.page_cache import page_cache
+from scraping.streaming import UnsupportedContentError, fetch_page_streaming_sync
+
+# Paragraph text read per page; reading stops once this much has been collected
+PAGE_TEXT_LIMIT = 10000
+# Threads used for page fetches, and separately for the fact-check / citation API calls
+NETWORK_WORKERS = int(os.getenv("VALIDATOR_NETWORK_WORKERS", "16"))
+API_WORKERS = int(os.getenv("VALIDATOR_API_WORKERS", "8"))
+# A stuck API call must not hold a worker (and rate_urls_validity) forever
+API_TIMEOUT_SECONDS = float(os.getenv("VALIDATOR_API_TIMEOUT", "10"))
+MODEL_BATCH_SIZE = 16
+# External APIs; overridable so benchmarks and tests can point them at a local stand-in
+FACT_CHECK_API_URL = os.getenv("FACT_CHECK_API_URL", "https://toolbox.google.com/factcheck/api/v1/claimsearch")
+SERPAPI_URL = os.getenv("SERPAPI_URL", "https://serpapi.com/search")
+
 
 class URLValidator:
     """
     A robust URL validation class that evaluates the credibility of a webpage
     using multiple factors: domain trust, content relevance, fact-checking, bias detection, and citations.
     """
-    def __init__(self, serpapi_key=None):
+    def __init__(self, serpapi_key=None, similarity_model=None, fake_news_classifier=None, sentiment_analyzer=None):
         self.serpapi_key = serpapi_key
-        # Load models once to avoid redundant API calls
-        self.similarity_model = SentenceTransformer('sentence-transformers/paraphrase-MiniLM-L6-v2')
-        self.fake_news_classifier = pipeline("text-classification", model="distilbert/distilbert-base-uncased-finetuned-sst-2-english")
-        self.sentiment_analyzer = pipeline("text-classification", model="nlptown/bert-base-multilingual-uncased-sentiment")
+        # Use the shared model server when MODEL_SERVER_ADDRESS is set, otherwise load models once in-process
+        model_client = get_model_client()
+        if similarity_model is not None and fake_news_classifier is not None and sentiment_analyzer is not None:
+            # Injected models (e.g. stubs in benchmarks) skip loading entirely
+            self.similarity_model = similarity_model
+            self.fake_news_classifier = fake_news_classifier
+            self.sentiment_analyzer = sentiment_analyzer
+        elif model_client is not None:
+            self.similarity_model = RemoteSentenceEncoder(model_client)
+            self.fake_news_classifier = RemoteTextClassifier(model_client, "classifier")
+            self.sentiment_analyzer = RemoteTextClassifier(model_client, "sentiment")
+        else:
+            self.similarity_model = load_similarity_model()
+            self.fake_news_classifier = load_text_classifier(CLASSIFIER_MODEL_NAME)
+            self.sentiment_analyzer = load_text_classifier(SENTIMENT_MODEL_NAME)
+        self.embedding_store = EmbeddingStore(SIMILARITY_MODEL_NAME,
+                                              self.similarity_model.get_sentence_embedding_dimension())
 
     def fetch_page_content(self, url: str) -> str:
-        """Fetches and extracts text content from the given URL."""
+        """Fetches and extracts text content from the given URL, using the shared page cache."""
+        cached_page = page_cache.get(url)
+        if cached_page is not None and not cached_page.covers(PAGE_TEXT_LIMIT):
+            cached_page = None
+        if cached_page is not None and cached_page.is_fresh(page_cache.ttl):
+            return cached_page.text.replace("\n", " ")
+        # Skip URLs that failed recently and hosts whose circuit is open, and respect per-host rate limits
+        if host_health.check(url) is not None:
+            return ""
+        delay = host_health.reserve(url)
+        if delay:
+            time.sleep(delay)
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            content = " ".join([p.text for p in soup.find_all("p")])
-            return content if content else ""
-        except requests.RequestException:
+            headers = cached_page.conditional_headers() if cached_page else {}
+            page = fetch_page_streaming_sync(url, max_chars=PAGE_TEXT_LIMIT, headers=headers)
+            if page.status_code == 304 and cached_page is not None:
+                host_health.record_success(url)
+                page_cache.mark_revalidated(url)
+                return cached_page.text.replace("\n", " ")
+            if page.status_code != 200:
+                host_health.record_failure(url, page.status_code, parse_retry_after(page.headers.get("Retry-After")))
+                return ""
+            host_health.record_success(url)
+            page_cache.put(url, page.html, page.text, page.headers.get("ETag"), page.headers.get("Last-Modified"),
+                           page.complete)
+            return page.text.replace("\n", " ")
+        except (requests.Timeout, requests.ConnectionError):
+            host_health.record_failure(url)
+            return ""
+        except (requests.RequestException, UnsupportedContentError):
             return ""
 
     def get_domain_trust(self, content: str) -> int:
@@ -35,22 +99,30 @@ class URLValidator:
         if not content:
             return 50  # Default neutral score
         result = self.fake_news_classifier(content[:512])[0]  # Limit text length
-        return 100 if result["label"] == "REAL" else 30 if result["label"] == "FAKE" else 50
+        return self.trust_from_label(result["label"])
+
+    @staticmethod
+    def trust_from_label(label: str) -> int:
+        """Maps a fake news classifier label to a domain trust score."""
+        return 100 if label == "REAL" else 30 if label == "FAKE" else 50
+
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Encodes texts through the persistent embedding store, running the model only on unseen texts."""
+        return self.embedding_store.encode(
+            texts, lambda missing: self.similarity_model.encode(missing, batch_size=32, convert_to_numpy=True)
+        )
 
     def compute_similarity_score(self, user_query: str, content: str) -> int:
         """Computes semantic similarity between user query and page content."""
-        if not content:
-            return 0
-        similarity = util.pytorch_cos_sim(self.similarity_model.encode(user_query), self.similarity_model.encode(content)).item()
-        return int(similarity * 100)
+        return self.compute_similarity_scores([user_query], [content])[0]
 
     def check_facts(self, content: str) -> int:
         """Cross-checks extracted content using Google's Fact Check API."""
         if not content:
             return 50
-        api_url = f"https://toolbox.google.com/factcheck/api/v1/claimsearch?query={content[:200]}"
+        api_url = f"{FACT_CHECK_API_URL}?query={content[:200]}"
         try:
-            response = requests.get(api_url)
+            response = requests.get(api_url, timeout=API_TIMEOUT_SECONDS)
             data = response.json()
             return 80 if "claims" in data and data["claims"] else 40
         except:
@@ -60,7 +132,7 @@ class URLValidator:
         """Checks Google Scholar citations using SerpAPI."""
         params = {"q": url, "engine": "google_scholar", "api_key": self.serpapi_key}
         try:
-            response = requests.get("https://serpapi.com/search", params=params)
+            response = requests.get(SERPAPI_URL, params=params, timeout=API_TIMEOUT_SECONDS)
             data = response.json()
             return min(len(data.get("organic_results", [])) * 10, 100)
         except:
@@ -71,7 +143,12 @@ class URLValidator:
         if not content:
             return 50
         sentiment_result = self.sentiment_analyzer(content[:512])[0]
-        return 100 if sentiment_result["label"] == "POSITIVE" else 50 if sentiment_result["label"] == "NEUTRAL" else 30
+        return self.bias_from_label(sentiment_result["label"])
+
+    @staticmethod
+    def bias_from_label(label: str) -> int:
+        """Maps a sentiment label to a bias score."""
+        return 100 if label == "POSITIVE" else 50 if label == "NEUTRAL" else 30
 
     def get_star_rating(self, score: float) -> tuple:
         """Converts a score (0-100) into a 1-5 star rating."""
@@ -93,16 +170,48 @@ class URLValidator:
             reasons.append("Few or no citations found for this content.")
         return " ".join(reasons) if reasons else "This source is highly credible and relevant."
 
-    def rate_url_validity(self, user_query: str, url: str) -> dict:
-        """Evaluates the validity of a webpage."""
-        content = self.fetch_page_content(url)
-        
-        domain_trust = self.get_domain_trust(content)
-        similarity_score = self.compute_similarity_score(user_query, content)
-        fact_check_score = self.check_facts(content)
-        bias_score = self.detect_bias(content)
-        citation_score = self.check_google_scholar(url)
+    def get_domain_trust_batch(self, contents: List[str]) -> List[int]:
+        """Determines domain trust scores for many pages with one batched classifier call."""
+        scores = [50] * len(contents)  # Default neutral score
+        indices = [i for i, content in enumerate(contents) if content]
+        if indices:
+            results = self.fake_news_classifier([contents[i][:512] for i in indices], batch_size=MODEL_BATCH_SIZE)
+            for i, result in zip(indices, results):
+                scores[i] = self.trust_from_label(result["label"])
+        return scores
 
+    def compute_similarity_scores(self, user_queries: List[str], contents: List[str]) -> List[int]:
+        """
+        Computes query/content similarity for many pairs.
+
+        Long content is split into overlapping chunks and scored by its best-matching
+        chunk; every query and chunk is encoded at most once across runs.
+        """
+        chunked_contents = [chunk_text(content) if content else [] for content in contents]
+        texts = list(dict.fromkeys(user_queries + [chunk for chunks in chunked_contents for chunk in chunks]))
+        vectors = dict(zip(texts, self.encode_texts(texts)))
+
+        scores = []
+        for user_query, chunks in zip(user_queries, chunked_contents):
+            if not chunks:
+                scores.append(0)
+                continue
+            chunk_vectors = [vectors[chunk] for chunk in chunks]
+            scores.append(int(max_pooled_similarity(vectors[user_query], np.stack(chunk_vectors)) * 100))
+        return scores
+
+    def detect_bias_batch(self, contents: List[str]) -> List[int]:
+        """Detects potential bias for many pages with one batched sentiment call."""
+        scores = [50] * len(contents)
+        indices = [i for i, content in enumerate(contents) if content]
+        if indices:
+            results = self.sentiment_analyzer([contents[i][:512] for i in indices], batch_size=MODEL_BATCH_SIZE)
+            for i, result in zip(indices, results):
+                scores[i] = self.bias_from_label(result["label"])
+        return scores
+
+    def build_result(self, domain_trust, similarity_score, fact_check_score, bias_score, citation_score) -> dict:
+        """Combines the individual scores into the final validity result."""
         final_score = (
             (0.3 * domain_trust) +
             (0.3 * similarity_score) +
@@ -128,4 +237,49 @@ class URLValidator:
                 "icon": icon
             },
             "explanation": explanation
-        }
\ No newline at end of file
+        }
+
+    def rate_urls_validity(self, pairs: List[Tuple[str, str]], stage_timings: Optional[dict] = None) -> List[dict]:
+        """
+        Evaluates the validity of many webpages at once.
+
+        Pages are fetched concurrently, the classifier, sentiment and similarity models
+        run on whole batches, and the fact-check and citation API calls run in the
+        background on a separate pool while pages are fetched and the models are busy. If stage_timings is given, it is filled
+        with the seconds spent in the "fetch", "models" and "network_wait" stages.
+        """
+        if not pairs:
+            return []
+        user_queries = [user_query for user_query, _ in pairs]
+        urls = [url for _, url in pairs]
+        stage_timings = stage_timings if stage_timings is not None else {}
+
+        # API calls get their own pool so page fetches never queue behind them
+        with ThreadPoolExecutor(max_workers=NETWORK_WORKERS) as executor, \
+                ThreadPoolExecutor(max_workers=API_WORKERS) as api_executor:
+            stage_start = time.perf_counter()
+            citation_futures = [api_executor.submit(self.check_google_scholar, url) for url in urls]
+            contents = list(executor.map(self.fetch_page_content, urls))
+            fact_check_futures = [api_executor.submit(self.check_facts, content) for content in contents]
+            stage_timings["fetch"] = time.perf_counter() - stage_start
+
+            # Model-bound work overlaps with the API calls still in flight
+            stage_start = time.perf_counter()
+            domain_trusts = self.get_domain_trust_batch(contents)
+            similarity_scores = self.compute_similarity_scores(user_queries, contents)
+            bias_scores = self.detect_bias_batch(contents)
+            stage_timings["models"] = time.perf_counter() - stage_start
+
+            stage_start = time.perf_counter()
+            fact_check_scores = [future.result() for future in fact_check_futures]
+            citation_scores = [future.result() for future in citation_futures]
+            stage_timings["network_wait"] = time.perf_counter() - stage_start
+
+        return [
+            self.build_result(*scores)
+            for scores in zip(domain_trusts, similarity_scores, fact_check_scores, bias_scores, citation_scores)
+        ]
+
+    def rate_url_validity(self, user_query: str, url: str) -> dict:
+        """Evaluates the validity of a webpage."""
+        return self.rate_urls_validity([(user_query, url)])[0]
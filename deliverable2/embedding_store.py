@@ -0,0 +1,135 @@
+"""
+embedding_store.py
+"""
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+EMBEDDING_DIRECTORY = os.path.join(
+    os.getenv("INTELLISEARCH_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")),
+    "embeddings",
+)
+# Sliding window used to split long pages; MiniLM only sees ~128 tokens per input
+CHUNK_WORDS = 96
+CHUNK_STRIDE = 80
+MAX_CHUNKS = 32
+
+
+def chunk_text(content: str, chunk_words: int = CHUNK_WORDS, stride: int = CHUNK_STRIDE,
+               max_chunks: int = MAX_CHUNKS) -> List[str]:
+    """Splits text into overlapping word windows so long pages are not silently truncated."""
+    words = content.split()
+    if len(words) <= chunk_words:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[start:start + chunk_words]) for start in range(0, len(words), stride)][:max_chunks]
+
+
+class EmbeddingStore:
+    """
+    Persistent embedding cache for one encoder model.
+
+    Vectors are L2-normalized and appended as float16 rows to a memory-mapped file;
+    a text index maps the SHA-256 of each input to its row. Appends take a file lock,
+    so several processes can share the same store.
+    """
+
+    def __init__(self, model_name: str, dimension: int, directory: str = EMBEDDING_DIRECTORY):
+        self.model_name = model_name
+        self.dimension = dimension
+        safe_name = model_name.replace("/", "__")
+        os.makedirs(directory, exist_ok=True)
+        self.data_path = os.path.join(directory, f"{safe_name}.f16")
+        self.index_path = os.path.join(directory, f"{safe_name}.index")
+        self.lock_path = os.path.join(directory, f"{safe_name}.lock")
+
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._vectors = np.zeros((0, dimension), dtype=np.float16)
+        for path in (self.data_path, self.index_path):
+            open(path, "ab").close()
+
+    def key(self, text: str) -> str:
+        """Content hash of an input text, scoped to this model."""
+        return hashlib.sha256(f"{self.model_name}\0{text}".encode("utf-8")).hexdigest()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared with other processes using the same store."""
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _refresh(self) -> None:
+        """Picks up rows appended since the last read, including ones written by other processes."""
+        with open(self.index_path, "r", encoding="utf-8") as index_file:
+            index_file.seek(self._index_offset)
+            for line in index_file:
+                if not line.endswith("\n"):
+                    break  # Partially written line; read it next time
+                key, row = line.split()
+                self._index[key] = int(row)
+                self._index_offset += len(line.encode("utf-8"))
+
+        rows = os.path.getsize(self.data_path) // (self.dimension * 2)
+        if rows != len(self._vectors):
+            self._vectors = np.memmap(self.data_path, dtype=np.float16, mode="r", shape=(rows, self.dimension)) \
+                if rows else np.zeros((0, self.dimension), dtype=np.float16)
+
+    def _append(self, keys: List[str], vectors: np.ndarray) -> None:
+        """Appends new rows and their index entries."""
+        with self._file_lock():
+            first_row = os.path.getsize(self.data_path) // (self.dimension * 2)
+            with open(self.data_path, "ab") as data_file:
+                data_file.write(vectors.astype(np.float16).tobytes())
+            with open(self.index_path, "a", encoding="utf-8") as index_file:
+                index_file.writelines(f"{key} {first_row + offset}\n" for offset, key in enumerate(keys))
+
+    def encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Returns normalized embeddings for texts, encoding only the ones not stored yet.
+
+        encode_fn receives the missing texts and must return one vector per text.
+        """
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        keys = [self.key(text) for text in texts]
+
+        with self._lock:
+            self._refresh()
+            missing = list(dict.fromkeys(key_text for key_text in zip(keys, texts) if key_text[0] not in self._index))
+
+        if missing:
+            # The model runs without the lock, so concurrent callers encode in parallel
+            new_vectors = np.asarray(encode_fn([text for _, text in missing]), dtype=np.float32)
+            new_vectors /= np.maximum(np.linalg.norm(new_vectors, axis=1, keepdims=True), 1e-12)
+            with self._lock:
+                self._refresh()
+                # Another thread may have stored some of the same texts meanwhile
+                fresh = [position for position, (key, _) in enumerate(missing) if key not in self._index]
+                if fresh:
+                    self._append([missing[position][0] for position in fresh], new_vectors[fresh])
+                    self._refresh()
+
+        with self._lock:
+            return np.asarray(self._vectors[[self._index[key] for key in keys]], dtype=np.float32)
+
+
+def max_pooled_similarity(query_vector: np.ndarray, chunk_vectors: np.ndarray) -> float:
+    """Highest cosine similarity between a normalized query vector and any normalized chunk vector."""
+    if len(chunk_vectors) == 0:
+        return 0.0
+    return float(np.max(chunk_vectors @ query_vector))
@@ -117,11 +117,10 @@ def test_url_validators():
         writer = csv.DictWriter(file, fieldnames=fieldnames)
         writer.writeheader()
         
-        # Loop through 100 samples
-        for prompt, url in sample_data:
-            
-            # Get the validation result by calling the rate_url_validity function
-            result = validator.rate_url_validity(prompt, url)
+        # Score all 100 samples in one batch
+        results = validator.rate_urls_validity(sample_data)
+
+        for (prompt, url), result in zip(sample_data, results):
             
             # Include the func_rating and custom_rating in the result
             result["user_prompt"] = prompt
@@ -0,0 +1,112 @@
+"""
+IntelliSearch helpers, split by feature:
+
+- helper.credibility: credibility model registry and micro-batcher
+- helper.llm: LLM backends and AIAssistant
+- helper.prompt: token-budgeted prompt assembly
+- helper.response_cache: exact and near-match cache of LLM answers
+- helper.corpus: local store and vector index of processed articles
+- helper.extraction: article fetching and text extraction
+- helper.search: browser pool, search result cache and news search
+- helper.tts: text to speech
+- helper.utils: small utilities
+
+Names are re-exported lazily, so ``from helper import AIAssistant`` only imports the
+LLM module and never pays for Keras, Selenium or gTTS.
+"""
+import importlib
+from typing import Any, Dict, List
+
+_EXPORTS: Dict[str, str] = {
+    # Credibility
+    "CREDIBILITY_REPO_ID": "credibility",
+    "LOCAL_MODEL_DIRECTORY": "credibility",
+    "CredibilityModelRegistry": "credibility",
+    "credibility_registry": "credibility",
+    "predict_credibility": "credibility",
+    "CredibilityBatcher": "credibility",
+    "credibility_batcher": "credibility",
+    # LLM
+    "OLLAMA_BASE_URL": "llm",
+    "OLLAMA_MODEL": "llm",
+    "LLMBackend": "llm",
+    "OllamaBackend": "llm",
+    "FakeLLMBackend": "llm",
+    "get_llm_backend": "llm",
+    "set_llm_backend": "llm",
+    "AIAssistant": "llm",
+    # Prompt assembly
+    "PROMPT_TOKEN_BUDGET": "prompt",
+    "PromptBuilder": "prompt",
+    "estimate_tokens": "prompt",
+    "split_passages": "prompt",
+    "rank_passages": "prompt",
+    # Response cache
+    "RESPONSE_CACHE_TTLS": "response_cache",
+    "ResponseCache": "response_cache",
+    "HashingEncoder": "response_cache",
+    # Content extraction
+    "ARTICLE_HEADERS": "extraction",
+    "MAX_CONCURRENT_FETCHES": "extraction",
+    "MAX_FETCHES_PER_HOST": "extraction",
+    "ARTICLE_TEXT_LIMIT": "extraction",
+    "parse_executor": "extraction",
+    "FetchLimiter": "extraction",
+    "create_http_client": "extraction",
+    "extract_article_content": "extraction",
+    # Local corpus
+    "CORPUS_DIRECTORY": "corpus",
+    "CorpusStore": "corpus",
+    "IVFIndex": "corpus",
+    "corpus_store": "corpus",
+    "find_relevant": "corpus",
+    "search_local_news": "corpus",
+    "ground_query": "corpus",
+    # Search
+    "SEARCH_USER_AGENT": "search",
+    "build_chrome_options": "search",
+    "BrowserPool": "search",
+    "browser_pool": "search",
+    "SEARCH_CACHE_TTLS": "search",
+    "SEARCH_CACHE_STALE_FACTOR": "search",
+    "SearchResultCache": "search",
+    "search_cache": "search",
+    "DUCKDUCKGO_HTML_URL": "search",
+    "SEARCH_BACKEND": "search",
+    "fetch_search_page_http": "search",
+    "fetch_search_page_browser": "search",
+    "fetch_search_page": "search",
+    "parse_search_results": "search",
+    "process_article": "search",
+    "stream_news_data": "search",
+    "fetch_news_data": "search",
+    # Text to speech
+    "SpeechEngine": "tts",
+    "GTTSEngine": "tts",
+    "FakeSpeechEngine": "tts",
+    "AudioCache": "tts",
+    "SpeechSynthesizer": "tts",
+    "SpeechStream": "tts",
+    "split_into_chunks": "tts",
+    "get_speech_engine": "tts",
+    "get_speech_synthesizer": "tts",
+    "text_to_speech": "tts",
+    # Utilities
+    "get_current_year": "utils",
+}
+
+__all__: List[str] = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the feature module that defines ``name`` on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + __all__)
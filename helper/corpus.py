@@ -0,0 +1,493 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from helper.response_cache import EMBEDDING_DIMENSION, HashingEncoder, normalize_query
+from logger.app_logger import application_logger
+from logger.metrics import metrics
+from scraping.dedup import FAILED_BODY_PREFIXES
+from scraping.url_utils import canonical_url
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+# ============================ LOCAL CORPUS ============================
+
+CORPUS_DIRECTORY: str = os.path.join(
+    os.getenv("INTELLISEARCH_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")),
+    "corpus",
+)
+# Keep every processed article; AI Mode grounds its answers in them
+CORPUS_ENABLED: bool = os.getenv("CORPUS_ENABLED", "1") == "1"
+# Answer news searches from the corpus when it holds enough fresh, relevant articles
+CORPUS_SEARCH_FIRST: bool = os.getenv("CORPUS_SEARCH_FIRST", "1") == "1"
+CORPUS_MIN_SIMILARITY: float = float(os.getenv("CORPUS_MIN_SIMILARITY", "0.3"))
+# Articles found by a search this similar to the query also count, however they are worded
+CORPUS_QUERY_SIMILARITY: float = float(os.getenv("CORPUS_QUERY_SIMILARITY", "0.75"))
+# Oldest stored article that may stand in for a live search, by time range
+CORPUS_FRESHNESS_SECONDS: Dict[str, float] = {
+    "d": 2 * 60 * 60, "w": 12 * 60 * 60, "m": 3 * 24 * 60 * 60, "y": 14 * 24 * 60 * 60,
+}
+# Articles older than this are dropped at the next compaction
+CORPUS_RETENTION_SECONDS: float = float(os.getenv("CORPUS_RETENTION_DAYS", "90")) * 24 * 60 * 60
+# Characters of the body embedded with the title and summary; short queries match short texts best
+EMBED_BODY_CHARS: int = 200
+# Below this many rows an exact scan beats probing an inverted file
+IVF_MIN_ROWS: int = 4096
+IVF_PROBES: int = int(os.getenv("CORPUS_IVF_PROBES", "8"))
+KMEANS_ITERATIONS: int = 8
+# Rows appended since the last compaction (scanned exactly) that trigger the next one
+COMPACT_TAIL_ROWS: int = 2048
+ASSIGN_BATCH_ROWS: int = 8192
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Nearest centroid (by cosine similarity) of every row, computed in batches to bound memory."""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BATCH_ROWS):
+        batch = np.asarray(vectors[start:start + ASSIGN_BATCH_ROWS], dtype=np.float32)
+        labels[start:start + len(batch)] = np.argmax(batch @ centroids.T, axis=1)
+    return labels
+
+
+def train_ivf(vectors: np.ndarray, lists: int, iterations: int = KMEANS_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """
+    Train inverted-file centroids with spherical k-means.
+
+    Args:
+        vectors (np.ndarray): Unit-length rows.
+        lists (int): Number of inverted lists.
+        iterations (int): k-means iterations.
+        seed (int): Seed for picking the initial centroids.
+
+    Returns:
+        np.ndarray: float32 centroids of shape (lists, dimension) with unit-length rows.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = np.asarray(vectors[np.sort(rng.choice(len(vectors), size=lists, replace=False))], dtype=np.float32)
+    for _ in range(iterations):
+        labels = _assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        for start in range(0, len(vectors), ASSIGN_BATCH_ROWS):
+            np.add.at(sums, labels[start:start + ASSIGN_BATCH_ROWS],
+                      np.asarray(vectors[start:start + ASSIGN_BATCH_ROWS], dtype=np.float32))
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # Empty lists keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+    return centroids
+
+
+class IVFIndex:
+    """
+    Memory-mapped inverted-file index over the first ``rows`` vectors of a corpus generation.
+
+    ``centroids`` holds one unit vector per list, ``members`` the row numbers grouped by
+    list and ``offsets`` where each list starts in ``members``.
+    """
+
+    def __init__(self, centroids: np.ndarray, members: np.ndarray, offsets: np.ndarray) -> None:
+        self.centroids = centroids
+        self.members = members
+        self.offsets = offsets
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, prefix: str) -> "IVFIndex":
+        """
+        Train an index over vectors and write it next to them.
+
+        Args:
+            vectors (np.ndarray): Unit-length rows to index.
+            prefix (str): Path prefix of the index files.
+
+        Returns:
+            IVFIndex: The index, memory-mapped from the written files.
+        """
+        centroids = train_ivf(vectors, max(1, int(np.sqrt(len(vectors)))))
+        labels = _assign(vectors, centroids)
+        members = np.argsort(labels, kind="stable").astype(np.int32)
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(labels, minlength=len(centroids))))).astype(np.int64)
+        for name, array in (("centroids", centroids), ("members", members), ("offsets", offsets)):
+            np.save(f"{prefix}.{name}.npy", array)
+        return cls.load(prefix)
+
+    @classmethod
+    def load(cls, prefix: str) -> "IVFIndex":
+        """Memory-map an index written by build."""
+        return cls(*(np.load(f"{prefix}.{name}.npy", mmap_mode="r") for name in ("centroids", "members", "offsets")))
+
+    def candidates(self, query_vector: np.ndarray, probes: int = IVF_PROBES) -> np.ndarray:
+        """
+        Rows in the lists whose centroids are closest to the query.
+
+        Args:
+            query_vector (np.ndarray): Unit-length query embedding.
+            probes (int): Lists to scan.
+
+        Returns:
+            np.ndarray: Candidate row numbers.
+        """
+        scores = np.asarray(self.centroids) @ query_vector
+        nearest = np.argsort(-scores)[:probes]
+        return np.concatenate([self.members[self.offsets[index]:self.offsets[index + 1]] for index in nearest])
+
+
+class CorpusStore:
+    """
+    Append-only local store of processed articles with an approximate nearest neighbor index.
+
+    Each generation of the corpus is a JSON-lines file of articles and a row-aligned,
+    memory-mapped float16 file of their embeddings; both only grow. Re-added articles
+    append a new row and supersede the old one. Rows up to ``indexed_rows`` are covered
+    by a memory-mapped inverted-file index, newer rows are scanned exactly. Compaction
+    writes a new generation without superseded or expired rows, retrains the index and
+    switches ``corpus.json`` to it, so readers in other processes never see a half-written
+    generation. Appends and compactions take a file lock.
+    """
+
+    def __init__(self, directory: str = CORPUS_DIRECTORY, encoder: Optional[Any] = None,
+                 dimension: int = EMBEDDING_DIMENSION, encoder_name: str = "hashing") -> None:
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            directory (str): Root directory; every encoder gets its own subdirectory.
+            encoder (Optional[Any]): Object with ``encode(texts)`` returning unit-length rows; HashingEncoder if omitted.
+            dimension (int): Embedding dimension of the encoder.
+            encoder_name (str): Name of the encoder, used for its subdirectory.
+        """
+        self.encoder: Any = encoder or HashingEncoder(dimension)
+        self.dimension: int = dimension
+        self.directory: str = os.path.join(directory, encoder_name.replace("/", "__"))
+        os.makedirs(self.directory, exist_ok=True)
+        self.meta_path: str = os.path.join(self.directory, "corpus.json")
+        self.lock_path: str = os.path.join(self.directory, "corpus.lock")
+
+        self._lock: threading.RLock = threading.RLock()
+        self._generation: int = -1
+        with self._lock:
+            self._refresh()
+
+    def _prefix(self, generation: int) -> str:
+        return os.path.join(self.directory, f"gen-{generation}")
+
+    def _read_meta(self) -> Dict[str, int]:
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as meta_file:
+                return json.load(meta_file)
+        except FileNotFoundError:
+            return {"generation": 0, "indexed_rows": 0}
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Exclusive lock shared with other processes using the same store."""
+        with open(self.lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _reset(self, generation: int, indexed_rows: int) -> None:
+        """Forget everything read so far and switch to ``generation``. Caller holds the lock."""
+        self._generation = generation
+        self._indexed_rows = indexed_rows
+        self._offsets: List[int] = []
+        self._keys: List[str] = []
+        self._added_at: List[float] = []
+        self._latest: Dict[str, int] = {}
+        self._digests: Dict[str, str] = {}
+        self._records_size: int = 0
+        self._vectors: np.ndarray = np.zeros((0, self.dimension), dtype=np.float16)
+        self._index: Optional[IVFIndex] = IVFIndex.load(self._prefix(generation)) if indexed_rows else None
+
+    def _refresh(self) -> None:
+        """Pick up rows appended since the last read, and new generations written by compaction. Caller holds the lock."""
+        try:
+            self._read_new_rows()
+        except FileNotFoundError:
+            # Another process compacted between reading corpus.json and opening the files
+            self._generation = -1
+            self._read_new_rows()
+
+    def _read_new_rows(self) -> None:
+        """Read rows appended to the current generation, switching generations first if needed. Caller holds the lock."""
+        meta = self._read_meta()
+        if meta["generation"] != self._generation:
+            self._reset(meta["generation"], meta["indexed_rows"])
+
+        prefix = self._prefix(self._generation)
+        if not os.path.exists(prefix + ".jsonl"):
+            return  # Nothing written to this generation yet
+        with open(prefix + ".jsonl", "rb") as records_file:
+            records_file.seek(self._records_size)
+            for line in records_file:
+                if not line.endswith(b"\n"):
+                    break  # Partially written line; read it next time
+                record = json.loads(line)
+                row = len(self._offsets)
+                self._offsets.append(self._records_size)
+                self._keys.append(record["key"])
+                self._added_at.append(record["added_at"])
+                self._latest[record["key"]] = row
+                self._digests[record["key"]] = record["digest"]
+                self._records_size += len(line)
+
+        # Vectors are written before their records, so every record has its row
+        rows = len(self._offsets)
+        if rows != len(self._vectors):
+            self._vectors = np.memmap(prefix + ".f16", dtype=np.float16, mode="r", shape=(rows, self.dimension)) \
+                if rows else np.zeros((0, self.dimension), dtype=np.float16)
+
+    def _read_records(self, rows: Sequence[int]) -> List[Dict[str, Any]]:
+        """Load full records by row. Caller holds the lock."""
+        records: List[Dict[str, Any]] = []
+        with open(self._prefix(self._generation) + ".jsonl", "rb") as records_file:
+            for row in rows:
+                records_file.seek(self._offsets[row])
+                records.append(json.loads(records_file.readline()))
+        return records
+
+    @staticmethod
+    def _embedding_text(record: Dict[str, Any]) -> str:
+        """Text an article is found by: the search that found it, its title, summary and lead."""
+        return f"{record['query']}. {record['title']}. {record['summary']} {record['body'][:EMBED_BODY_CHARS]}"
+
+    def add(self, articles: Sequence[Dict[str, Any]], query: str = "") -> int:
+        """
+        Store processed articles; unchanged articles already stored are skipped.
+
+        Never raises: the corpus is an optimization, so failures are logged and ignored.
+
+        Args:
+            articles (Sequence[Dict[str, Any]]): Results with "link", "title", "summary", "body" and "rating".
+            query (str): Search the articles were found for.
+
+        Returns:
+            int: Number of articles written.
+        """
+        try:
+            with self._lock:
+                self._refresh()
+                records: List[Dict[str, Any]] = []
+                for article in articles:
+                    body: str = str(article.get("body") or "")
+                    if not str(article.get("link", "")).startswith("http") or not body or body.startswith(FAILED_BODY_PREFIXES):
+                        continue
+                    key: str = hashlib.sha256(canonical_url(article["link"]).encode("utf-8")).hexdigest()
+                    digest: str = hashlib.sha256(
+                        f"{article.get('title')}\0{body}\0{article.get('rating')}".encode("utf-8")
+                    ).hexdigest()
+                    if self._digests.get(key) == digest or any(record["key"] == key for record in records):
+                        continue
+                    records.append({
+                        "key": key, "digest": digest, "link": article["link"], "title": article.get("title", ""),
+                        "summary": article.get("summary", ""), "body": body, "rating": article.get("rating", ""),
+                        "query": query, "added_at": time.time(),
+                    })
+                if not records:
+                    return 0
+
+                vectors = np.asarray(self.encoder.encode([self._embedding_text(record) for record in records]), dtype=np.float32)
+                with self._file_lock():
+                    self._refresh()  # Another process may have appended or compacted meanwhile
+                    prefix = self._prefix(self._generation)
+                    with open(prefix + ".f16", "ab") as vectors_file:
+                        vectors_file.write(vectors.astype(np.float16).tobytes())
+                    with open(prefix + ".jsonl", "ab") as records_file:
+                        records_file.write(b"".join(
+                            json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n" for record in records
+                        ))
+                    self._refresh()
+                    if self._needs_compaction():
+                        self._compact_locked()
+            metrics.increment("corpus_articles_added_total", value=len(records))
+            return len(records)
+        except Exception as e:
+            application_logger.log_error(f"Error adding articles to the corpus: {e}")
+            return 0
+
+    def _needs_compaction(self) -> bool:
+        """Whether the unindexed tail or the superseded rows have grown enough to rewrite. Caller holds the lock."""
+        rows = len(self._offsets)
+        tail = rows - self._indexed_rows
+        dead = rows - len(self._latest)
+        return (tail >= COMPACT_TAIL_ROWS and rows >= IVF_MIN_ROWS) or dead >= max(COMPACT_TAIL_ROWS, len(self._latest))
+
+    def compact(self) -> None:
+        """Rewrite the corpus without superseded or expired articles and retrain the index."""
+        with self._lock, self._file_lock():
+            self._refresh()
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        """Write the next generation and switch to it. Caller holds both locks."""
+        started: float = time.perf_counter()
+        cutoff: float = time.time() - CORPUS_RETENTION_SECONDS
+        live_rows: List[int] = sorted(row for row in self._latest.values() if self._added_at[row] >= cutoff)
+        old_prefix, new_generation = self._prefix(self._generation), self._generation + 1
+        new_prefix = self._prefix(new_generation)
+
+        with open(old_prefix + ".jsonl", "rb") as old_records, open(new_prefix + ".jsonl", "wb") as new_records:
+            for row in live_rows:
+                old_records.seek(self._offsets[row])
+                new_records.write(old_records.readline())
+        vectors = np.asarray(self._vectors[live_rows], dtype=np.float16) if live_rows \
+            else np.zeros((0, self.dimension), dtype=np.float16)
+        with open(new_prefix + ".f16", "wb") as new_vectors:
+            new_vectors.write(vectors.tobytes())
+        indexed_rows: int = len(live_rows) if len(live_rows) >= IVF_MIN_ROWS else 0
+        if indexed_rows:
+            IVFIndex.build(vectors.astype(np.float32), new_prefix)
+
+        # Readers switch generations through the metadata file, so replace it last
+        temporary_meta = self.meta_path + ".tmp"
+        with open(temporary_meta, "w", encoding="utf-8") as meta_file:
+            json.dump({"generation": new_generation, "indexed_rows": indexed_rows}, meta_file)
+        os.replace(temporary_meta, self.meta_path)
+        for suffix in (".jsonl", ".f16", ".centroids.npy", ".members.npy", ".offsets.npy"):
+            if os.path.exists(old_prefix + suffix):
+                os.remove(old_prefix + suffix)
+        self._refresh()
+        application_logger.log_info(
+            f"Corpus compacted to {len(live_rows)} articles ({indexed_rows} indexed) in {time.perf_counter() - started:.2f}s",
+            level="INFO",
+        )
+
+    def search(self, query: str, k: int = 5, max_age: Optional[float] = None,
+               min_similarity: float = CORPUS_MIN_SIMILARITY) -> List[Dict[str, Any]]:
+        """
+        Find the stored articles most similar to a query.
+
+        Args:
+            query (str): Search terms.
+            k (int): Maximum articles to return.
+            max_age (Optional[float]): Ignore articles stored longer ago than this many seconds.
+            min_similarity (float): Ignore articles whose cosine similarity is lower.
+
+        Returns:
+            List[Dict[str, Any]]: Stored records, most similar first, each with its "similarity".
+        """
+        query_vector = np.asarray(self.encoder.encode([query]), dtype=np.float32)[0]
+        with self._lock:
+            self._refresh()
+            rows = len(self._offsets)
+            if not rows:
+                return []
+            if self._index is not None:
+                candidates = np.concatenate((self._index.candidates(query_vector),
+                                             np.arange(self._indexed_rows, rows, dtype=np.int32)))
+            else:
+                candidates = np.arange(rows, dtype=np.int32)
+
+            # Superseded rows and rows older than max_age are never returned
+            cutoff: float = time.time() - max_age if max_age is not None else float("-inf")
+            live = np.fromiter(
+                (self._latest[self._keys[row]] == row and self._added_at[row] >= cutoff for row in candidates),
+                dtype=bool, count=len(candidates),
+            )
+            candidates = candidates[live]
+            if not len(candidates):
+                return []
+            candidates = np.sort(candidates)
+            scores = np.asarray(self._vectors[candidates], dtype=np.float32) @ query_vector
+            best = [index for index in np.argsort(-scores)[:k] if scores[index] >= min_similarity]
+            records = self._read_records([int(candidates[index]) for index in best])
+        for record, index in zip(records, best):
+            record["similarity"] = round(float(scores[index]), 4)
+        return records
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._latest)
+
+
+def local_results(records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Turn stored records into search results, numbered by relevance.
+
+    Args:
+        records (Sequence[Dict[str, Any]]): Records from CorpusStore.search.
+
+    Returns:
+        List[Dict[str, Any]]: Results shaped like those of fetch_news_data.
+    """
+    return [
+        {"num": number, "link": record["link"], "title": record["title"], "summary": record["summary"],
+         "body": record["body"], "rating": record["rating"]}
+        for number, record in enumerate(records, start=1)
+    ]
+
+
+def find_relevant(query: str, count: int, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Find stored articles relevant to a query.
+
+    An article is relevant if it is similar to the query itself, or was found by a
+    search similar to the query; short queries score low against whole articles.
+
+    Args:
+        query (str): Search terms or question.
+        count (int): Maximum articles.
+        max_age (Optional[float]): Ignore articles stored longer ago than this many seconds.
+
+    Returns:
+        List[Dict[str, Any]]: Stored records, most similar first.
+    """
+    records = corpus_store.search(query, k=count * 4, max_age=max_age, min_similarity=0.0)
+    if not records:
+        return []
+    query_vectors = np.asarray(corpus_store.encoder.encode(
+        [normalize_query(query)] + [normalize_query(record.get("query", "")) for record in records]
+    ), dtype=np.float32)
+    query_similarities = query_vectors[1:] @ query_vectors[0]
+    return [record for record, query_similarity in zip(records, query_similarities)
+            if record["similarity"] >= CORPUS_MIN_SIMILARITY or query_similarity >= CORPUS_QUERY_SIMILARITY][:count]
+
+
+def search_local_news(query: str, count: int, time_filter: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Answer a news search from the corpus if it holds enough fresh, relevant articles.
+
+    Args:
+        query (str): Search terms.
+        count (int): Number of articles wanted.
+        time_filter (str): Time range filter ('d', 'w', 'm', 'y'); sets how old stored articles may be.
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: ``count`` results, or None if a live search is needed.
+    """
+    if not (CORPUS_ENABLED and CORPUS_SEARCH_FIRST):
+        return None
+    records = find_relevant(query, count, CORPUS_FRESHNESS_SECONDS.get(time_filter))
+    if len(records) < count:
+        metrics.increment("corpus_search_total", result="miss")
+        return None
+    metrics.increment("corpus_search_total", result="hit")
+    return local_results(records)
+
+
+def ground_query(query: str, count: int) -> List[Dict[str, Any]]:
+    """
+    Find stored articles to ground an AI Mode answer, whatever their age.
+
+    Args:
+        query (str): The user's question.
+        count (int): Maximum articles.
+
+    Returns:
+        List[Dict[str, Any]]: Results shaped like those of fetch_news_data; empty when nothing relevant is stored.
+    """
+    return local_results(find_relevant(query, count)) if CORPUS_ENABLED else []
+
+
+# Shared by every search and session in the process
+corpus_store = CorpusStore()
@@ -0,0 +1,249 @@
+import os
+import pickle
+import queue
+import threading
+import time
+import concurrent.futures
+from typing import Any, Callable, List, Optional, Tuple
+import numpy as np
+from logger.app_logger import application_logger
+from logger.metrics import timed
+from model_server.client import ModelClient, get_model_client
+from model_server.onnx_runtime import CREDIBILITY_EXPORT_NAME, INFERENCE_BACKEND, OnnxCredibilityModel, find_exported_model
+
+# ============================ CREDIBILITY MODEL REGISTRY ============================
+
+CREDIBILITY_REPO_ID: str = "krishnam229/Deliverable3"
+LOCAL_MODEL_DIRECTORY: str = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deliverable2", "models"
+)
+
+
+class CredibilityModelRegistry:
+    """
+    Process-wide, lazily initialized holder for the Keras credibility model and its tokenizer.
+
+    The model and tokenizer are loaded at most once per process and shared by every
+    rating call. Loading is guarded by a lock so concurrent Streamlit sessions never
+    trigger duplicate loads. Set ``INTELLISEARCH_OFFLINE=1`` (or pass ``offline=True``)
+    to load ``model.keras`` and ``tokenizer.pkl`` from ``deliverable2/models`` instead of
+    the Hugging Face Hub. With ``INFERENCE_BACKEND=onnx`` the exported ONNX model (see
+    ``model_server/export_onnx.py``) is run with ONNX Runtime instead of Keras.
+    """
+
+    def __init__(self, repo_id: str = CREDIBILITY_REPO_ID, local_directory: str = LOCAL_MODEL_DIRECTORY,
+                 offline: Optional[bool] = None, backend: Optional[str] = None) -> None:
+        """
+        Initialize the registry without loading anything.
+
+        Args:
+            repo_id (str): Hugging Face Hub repository holding the model files.
+            local_directory (str): Directory used in offline mode.
+            offline (Optional[bool]): Force offline mode; defaults to the INTELLISEARCH_OFFLINE env variable.
+            backend (Optional[str]): "framework" or "onnx"; defaults to the INFERENCE_BACKEND env variable.
+        """
+        self.repo_id: str = repo_id
+        self.backend: str = backend or INFERENCE_BACKEND
+        self.local_directory: str = local_directory
+        self.offline: bool = offline if offline is not None else os.getenv("INTELLISEARCH_OFFLINE", "0") == "1"
+        self._lock: threading.Lock = threading.Lock()
+        self._model: Optional[Any] = None
+        self._tokenizer: Optional[Any] = None
+
+    def _resolve_path(self, filename: str) -> str:
+        """
+        Resolve a model file either from the local directory or the Hugging Face Hub cache.
+
+        Args:
+            filename (str): Name of the file inside the repository.
+
+        Returns:
+            str: Local filesystem path to the file.
+        """
+        local_path: str = os.path.join(self.local_directory, filename)
+        if self.offline:
+            if not os.path.exists(local_path):
+                raise FileNotFoundError(f"Offline mode enabled but {local_path} does not exist")
+            return local_path
+        from huggingface_hub import hf_hub_download
+
+        return hf_hub_download(repo_id=self.repo_id, filename=filename)
+
+    def get(self) -> Any:
+        """
+        Return the shared (model, tokenizer) pair, loading it on first use.
+
+        Returns:
+            Any: A ``(model, tokenizer)`` tuple.
+        """
+        if self._model is not None and self._tokenizer is not None:
+            return self._model, self._tokenizer
+
+        with self._lock:
+            if self._model is None or self._tokenizer is None:
+                start_time: float = time.perf_counter()
+                with timed("model_load", model="credibility"):
+                    model = self._load_model()
+                    with open(self._resolve_path("tokenizer.pkl"), "rb") as f:
+                        tokenizer = pickle.load(f)
+                self._model, self._tokenizer = model, tokenizer
+                application_logger.log_info(
+                    f"Credibility model loaded in {time.perf_counter() - start_time:.2f}s "
+                    f"({'offline' if self.offline else self.repo_id}, {type(model).__name__})", level="INFO"
+                )
+        return self._model, self._tokenizer
+
+    def _load_model(self) -> Any:
+        """Load the ONNX export if enabled and available, otherwise the Keras model."""
+        if self.backend == "onnx":
+            onnx_path: Optional[str] = find_exported_model(CREDIBILITY_EXPORT_NAME)
+            if onnx_path is not None:
+                return OnnxCredibilityModel(onnx_path)
+            application_logger.log_warning("INFERENCE_BACKEND=onnx but no credibility export found; using Keras")
+        import keras
+
+        return keras.models.load_model(self._resolve_path("model.keras"))
+
+    @property
+    def max_length(self) -> int:
+        """Sequence length expected by the model's text input."""
+        model, _ = self.get()
+        return model.input_shape[0][1]
+
+    def warm_up(self) -> bool:
+        """
+        Load the model and run a single dummy prediction so the first real query does not pay graph setup cost.
+
+        Returns:
+            bool: True if the model is ready, False if loading failed.
+        """
+        try:
+            model, _ = self.get()
+            dummy_text: np.ndarray = np.zeros((1, self.max_length), dtype="int32")
+            model.predict({"text_input": dummy_text, "func_rating_input": np.array([[5]])}, verbose=0)
+            application_logger.log_info("Credibility model warmed up", level="INFO")
+            return True
+        except Exception as e:
+            application_logger.log_error(f"Credibility model warm-up failed: {e}")
+            return False
+
+
+# Shared registry used by every rating call in this process
+credibility_registry = CredibilityModelRegistry()
+
+
+def predict_credibility(article_titles: List[str]) -> List[str]:
+    """
+    Run the credibility model on a batch of article titles in a single forward pass.
+
+    Args:
+        article_titles (List[str]): Titles to rate.
+
+    Returns:
+        List[str]: One credibility rating per title, in input order.
+    """
+    if not article_titles:
+        return []
+    from keras.utils import pad_sequences
+
+    new_model, tokenizer = credibility_registry.get()
+    X_text: np.ndarray = pad_sequences(
+        tokenizer.texts_to_sequences(article_titles), maxlen=credibility_registry.max_length, padding='post'
+    )
+    X_func_rating: np.ndarray = np.full((len(article_titles), 1), 5)  # Dummy rating for example
+
+    predictions: np.ndarray = new_model.predict(
+        {"text_input": X_text, "func_rating_input": X_func_rating}, batch_size=len(article_titles), verbose=0
+    )
+    return [str(prediction) for prediction in np.argmax(predictions, axis=1)]
+
+
+class CredibilityBatcher:
+    """
+    Micro-batching queue in front of the credibility model.
+
+    Rating requests from any thread or Streamlit session are queued and a single worker
+    thread drains them into shared forward passes of up to ``max_batch_size`` titles,
+    waiting at most ``max_wait_ms`` for more requests to arrive once the first one is queued.
+    """
+
+    def __init__(self, max_batch_size: int = 64, max_wait_ms: float = 10.0,
+                 predict_fn: Callable[[List[str]], List[str]] = predict_credibility) -> None:
+        """
+        Initialize the batcher; the worker thread starts on first submission.
+
+        Args:
+            max_batch_size (int): Maximum number of titles per forward pass.
+            max_wait_ms (float): Maximum time to wait for a batch to fill up.
+            predict_fn (Callable[[List[str]], List[str]]): Batch predictor, local or served by the model server.
+        """
+        self.predict_fn: Callable[[List[str]], List[str]] = predict_fn
+        self.max_batch_size: int = max_batch_size
+        self.max_wait_ms: float = max_wait_ms
+        self._queue: "queue.Queue[Tuple[str, concurrent.futures.Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock: threading.Lock = threading.Lock()
+
+    def _ensure_worker(self) -> None:
+        """Start the background worker thread if it is not running yet."""
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="credibility-batcher", daemon=True)
+                self._worker.start()
+
+    def submit(self, article_titles: List[str]) -> List[concurrent.futures.Future]:
+        """
+        Queue titles for rating.
+
+        Args:
+            article_titles (List[str]): Titles to rate.
+
+        Returns:
+            List[concurrent.futures.Future]: One future per title resolving to its rating.
+        """
+        self._ensure_worker()
+        futures: List[concurrent.futures.Future] = []
+        for title in article_titles:
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            self._queue.put((title, future))
+            futures.append(future)
+        return futures
+
+    def _collect_batch(self) -> List[Tuple[str, concurrent.futures.Future]]:
+        """Block for the first request, then gather more until the batch is full or the wait expires."""
+        batch: List[Tuple[str, concurrent.futures.Future]] = [self._queue.get()]
+        deadline: float = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining: float = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Worker loop: collect a batch, predict once, resolve every waiting future."""
+        while True:
+            batch = self._collect_batch()
+            try:
+                ratings: List[str] = self.predict_fn([title for title, _ in batch])
+                if len(ratings) != len(batch):
+                    raise ValueError(f"Credibility model returned {len(ratings)} ratings for {len(batch)} titles")
+                for (_, future), rating in zip(batch, ratings):
+                    future.set_result(rating)
+                application_logger.log_debug(f"Credibility batch of {len(batch)} rated")
+            except Exception as e:
+                application_logger.log_error(f"Credibility batch failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+
+# Shared batcher so concurrent sessions share forward passes; with MODEL_SERVER_ADDRESS set,
+# batches are forwarded to the model server and shared with every other worker process
+_model_client: Optional[ModelClient] = get_model_client()
+credibility_batcher = CredibilityBatcher(
+    predict_fn=_model_client.credibility if _model_client is not None else predict_credibility
+)
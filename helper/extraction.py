@@ -0,0 +1,181 @@
+import asyncio
+import os
+import urllib.parse
+import concurrent.futures
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+import httpx
+from logger.app_logger import application_logger
+from logger.metrics import metrics, timed
+from scraping.host_health import backoff_delay, host_health, parse_retry_after
+from scraping.page_cache import page_cache
+from scraping.streaming import UnsupportedContentError, fetch_page_streaming
+
+# ============================ CONTENT EXTRACTION ============================
+
+ARTICLE_HEADERS: Dict[str, str] = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/89.0.4389.114 Safari/537.36",
+    "Referer": "https://www.google.com"  # Simulate referring from a search engine
+}
+MAX_CONCURRENT_FETCHES: int = int(os.getenv("MAX_CONCURRENT_FETCHES", "10"))
+MAX_FETCHES_PER_HOST: int = int(os.getenv("MAX_FETCHES_PER_HOST", "2"))
+# Paragraph text kept per article; reading stops once this much has been collected
+ARTICLE_TEXT_LIMIT: int = int(os.getenv("ARTICLE_TEXT_LIMIT", "4000"))
+# Attempts per article for timeouts, connection errors, 429 and 5xx; other failures are not retried
+FETCH_ATTEMPTS: int = int(os.getenv("FETCH_ATTEMPTS", "2"))
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Bounded pool for CPU-bound work kept off the event loop: streamed HTML parsing and page cache reads/writes
+parse_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="article-parse"
+)
+
+
+class FetchLimiter:
+    """
+    Concurrency limits for article fetches within one event loop.
+
+    Caps the total number of in-flight requests and the number of in-flight
+    requests per host, so a results page full of links to one site does not
+    hammer that site.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_FETCHES, max_per_host: int = MAX_FETCHES_PER_HOST) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            max_concurrent (int): Maximum in-flight requests overall.
+            max_per_host (int): Maximum in-flight requests per host.
+        """
+        self._global: asyncio.Semaphore = asyncio.Semaphore(max_concurrent)
+        self._per_host: Dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(max_per_host))
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        """Hold a per-host and a global slot for the duration of a request."""
+        host: str = urllib.parse.urlsplit(url).hostname or ""
+        # Per-host first: requests queued for one busy host must not sit on global slots other hosts could use
+        async with self._per_host[host], self._global:
+            yield
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled async HTTP client used for article fetches."""
+    return httpx.AsyncClient(
+        headers=ARTICLE_HEADERS,
+        timeout=10,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=MAX_CONCURRENT_FETCHES, max_keepalive_connections=MAX_CONCURRENT_FETCHES),
+    )
+
+
+async def extract_article_content(article_url: str, client: Optional[httpx.AsyncClient] = None,
+                                  limiter: Optional[FetchLimiter] = None, max_chars: int = ARTICLE_TEXT_LIMIT) -> str:
+    """
+    Extract the main content from a news article URL.
+
+    The body is streamed and parsed incrementally; reading stops once ``max_chars``
+    of paragraph text has been collected.
+
+    Args:
+        article_url (str): The URL of the target article.
+        client (Optional[httpx.AsyncClient]): Shared HTTP client; a temporary one is created if omitted.
+        limiter (Optional[FetchLimiter]): Shared concurrency limits; a private one is used if omitted.
+        max_chars (int): Paragraph characters needed by the caller.
+
+    Returns:
+        str: Extracted article text content.
+    """
+    with timed("article_fetch", url=article_url):
+        if client is None:
+            async with create_http_client() as own_client:
+                return await _extract_article_content(article_url, own_client, limiter or FetchLimiter(), max_chars)
+        return await _extract_article_content(article_url, client, limiter or FetchLimiter(), max_chars)
+
+
+async def _extract_article_content(article_url: str, client: httpx.AsyncClient, limiter: FetchLimiter,
+                                   max_chars: int) -> str:
+    """Serve an article from the page cache or fetch it; see extract_article_content."""
+    loop = asyncio.get_running_loop()
+
+    # Serve fresh copies straight from the shared page cache
+    cached_page = await loop.run_in_executor(parse_executor, page_cache.get, article_url)
+    if cached_page is not None and not cached_page.covers(max_chars):
+        cached_page = None  # Only the beginning was cached; this caller needs more text
+    if cached_page is not None and cached_page.is_fresh(page_cache.ttl):
+        metrics.increment("page_cache_total", result="hit")
+        application_logger.log_debug(f"Article content served from cache: {article_url}")
+        return cached_page.text
+    revalidation_headers: Dict[str, str] = cached_page.conditional_headers() if cached_page else {}
+
+    # Known-bad URLs and hosts with an open circuit cost a dictionary lookup, not a request
+    skip_reason: Optional[str] = host_health.check(article_url)
+    if skip_reason is not None:
+        application_logger.log_debug(f"Skipping article {article_url}: {skip_reason}")
+        return "Failed to fetch article."
+
+    for attempt in range(FETCH_ATTEMPTS):
+        last_attempt: bool = attempt == FETCH_ATTEMPTS - 1
+        try:
+            # Wait for the host's rate limit without holding a concurrency slot
+            delay: float = host_health.reserve(article_url)
+            if delay:
+                await asyncio.sleep(delay)
+            async with limiter.limit(article_url):
+                page = await fetch_page_streaming(client, article_url, max_chars=max_chars, headers=revalidation_headers,
+                                                  executor=parse_executor)
+            if page.status_code == 304 and cached_page is not None:
+                host_health.record_success(article_url)
+                await loop.run_in_executor(parse_executor, page_cache.mark_revalidated, article_url)
+                metrics.increment("page_cache_total", result="revalidated")
+                application_logger.log_debug(f"Cached article revalidated: {article_url}")
+                return cached_page.text
+            if page.status_code in RETRYABLE_STATUS_CODES and not last_attempt:
+                host_health.record_failure(article_url, page.status_code,
+                                           parse_retry_after(page.headers.get("Retry-After")), final=False)
+                application_logger.log_warning(f"Article fetch returned {page.status_code}: {article_url}, attempt {attempt + 1}")
+            elif page.status_code == 403:
+                host_health.record_failure(article_url, page.status_code)
+                application_logger.log_error(f"Access forbidden to article: {page.status_code}")
+                return "Access forbidden to article."
+            elif page.status_code != 200:
+                host_health.record_failure(article_url, page.status_code, parse_retry_after(page.headers.get("Retry-After")))
+                application_logger.log_error(f"Failed to fetch article: {page.status_code}")
+                return "Failed to fetch article."
+            else:
+                host_health.record_success(article_url)
+                # Cache off the event loop, then return cleaned text
+                metrics.increment("page_cache_total", result="miss")
+                await loop.run_in_executor(
+                    parse_executor, page_cache.put, article_url, page.html, page.text,
+                    page.headers.get("ETag"), page.headers.get("Last-Modified"), page.complete,
+                )
+                application_logger.log_info(f"Article content extracted from {article_url}", level="INFO")
+                return page.text
+
+        except UnsupportedContentError as e:
+            application_logger.log_warning(f"Skipping article {article_url}: {e}")
+            return "Unsupported article content."
+
+        except httpx.TransportError as e:  # Timeouts and connection errors
+            host_health.record_failure(article_url, final=last_attempt)
+            application_logger.log_warning(f"{type(e).__name__} while fetching article: {article_url}, attempt {attempt + 1}")
+            if last_attempt:
+                if isinstance(e, httpx.TimeoutException):
+                    return "Error: Timeout occurred while fetching article."
+                return "Failed to fetch article."
+
+        except Exception as e:
+            application_logger.log_error(f"Error extracting article content: {e}")
+            return f"Error extracting article content: {e}"
+
+        # Jittered backoff before retrying, unless the host's circuit has opened meanwhile
+        await asyncio.sleep(backoff_delay(attempt))
+        skip_reason = host_health.check(article_url)
+        if skip_reason is not None:
+            application_logger.log_debug(f"Giving up on article {article_url}: {skip_reason}")
+            return "Failed to fetch article."
+
+    return "Failed to fetch article after multiple attempts."
@@ -0,0 +1,329 @@
+import abc
+import asyncio
+import json
+import os
+import threading
+import time
+import concurrent.futures
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import httpx
+from helper.prompt import PromptBuilder
+from helper.response_cache import RESPONSE_CACHE_ENABLED, ResponseCache, response_cache
+from logger.app_logger import application_logger
+from logger.metrics import record_stage, timed
+
+# ============================ LLM BACKENDS ============================
+
+OLLAMA_BASE_URL: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "llama3.2:latest")
+
+
+class LLMBackend(abc.ABC):
+    """
+    Base class for text generation backends used by AIAssistant.
+
+    Subclasses implement ``stream``; ``generate`` collects the streamed tokens by default.
+    """
+
+    @abc.abstractmethod
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream the model's answer token by token.
+
+        Args:
+            prompt (str): Full prompt sent to the model.
+
+        Returns:
+            Iterator[str]: Generated text fragments in order.
+        """
+
+    def generate(self, prompt: str) -> str:
+        """
+        Generate a complete answer.
+
+        Args:
+            prompt (str): Full prompt sent to the model.
+
+        Returns:
+            str: The generated text.
+        """
+        return "".join(self.stream(prompt)).strip()
+
+
+class OllamaBackend(LLMBackend):
+    """
+    Backend talking to a local Ollama server over HTTP.
+
+    A single pooled ``httpx.Client`` is kept for the lifetime of the backend so
+    connections are reused, and ``keep_alive`` asks Ollama to keep the model loaded
+    between requests.
+    """
+
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, model: str = OLLAMA_MODEL,
+                 timeout: float = 120.0, keep_alive: str = "30m") -> None:
+        """
+        Initialize the backend and its connection pool.
+
+        Args:
+            base_url (str): Ollama server URL.
+            model (str): Model tag to query.
+            timeout (float): Read timeout in seconds for a single request.
+            keep_alive (str): How long Ollama keeps the model in memory after a request.
+        """
+        self.model: str = model
+        self.keep_alive: str = keep_alive
+        self._client: httpx.Client = httpx.Client(
+            base_url=base_url,
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=300),
+        )
+
+    def _payload(self, prompt: str, stream: bool) -> Dict[str, Any]:
+        """Build the /api/generate request body."""
+        return {"model": self.model, "prompt": prompt, "stream": stream, "keep_alive": self.keep_alive}
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        with self._client.stream("POST", "/api/generate", json=self._payload(prompt, stream=True)) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk: Dict[str, Any] = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+
+    def generate(self, prompt: str) -> str:
+        response: httpx.Response = self._client.post("/api/generate", json=self._payload(prompt, stream=False))
+        response.raise_for_status()
+        return response.json().get("response", "").strip()
+
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        self._client.close()
+
+
+class FakeLLMBackend(LLMBackend):
+    """
+    Deterministic local backend for tests and offline development.
+
+    Streams a canned response word by word and records every prompt it receives.
+    """
+
+    def __init__(self, response: str = "This is a test response.", token_delay: float = 0.0) -> None:
+        """
+        Initialize the fake backend.
+
+        Args:
+            response (str): Text returned for every prompt.
+            token_delay (float): Seconds to sleep between streamed tokens.
+        """
+        self.response: str = response
+        self.token_delay: float = token_delay
+        self.prompts: List[str] = []
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        self.prompts.append(prompt)
+        for index, word in enumerate(self.response.split(" ")):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            yield word if index == 0 else f" {word}"
+
+
+_llm_backend: Optional[LLMBackend] = None
+_llm_backend_lock: threading.Lock = threading.Lock()
+
+
+def get_llm_backend() -> LLMBackend:
+    """
+    Return the process-wide LLM backend, creating it on first use.
+
+    The backend is selected with the ``LLM_BACKEND`` env variable ("ollama" or "fake").
+
+    Returns:
+        LLMBackend: The shared backend instance.
+    """
+    global _llm_backend
+    with _llm_backend_lock:
+        if _llm_backend is None:
+            backend_name: str = os.getenv("LLM_BACKEND", "ollama").lower()
+            _llm_backend = FakeLLMBackend() if backend_name == "fake" else OllamaBackend()
+            application_logger.log_info(f"LLM backend initialized: {type(_llm_backend).__name__}", level="INFO")
+        return _llm_backend
+
+
+def set_llm_backend(backend: LLMBackend) -> None:
+    """
+    Replace the process-wide LLM backend (e.g. with a FakeLLMBackend in tests).
+
+    Args:
+        backend (LLMBackend): Backend to use for all subsequent AIAssistant instances.
+    """
+    global _llm_backend
+    with _llm_backend_lock:
+        _llm_backend = backend
+
+# ============================ AI ASSISTANT CLASS ============================
+class AIAssistant:
+    """
+    An AI assistant class that interfaces with a local Llama model via Ollama.
+    """
+
+    def __init__(self, backend: Optional[LLMBackend] = None, prompt_builder: Optional[PromptBuilder] = None,
+                 cache: Optional[ResponseCache] = None) -> None:
+        """
+        Initialize the AIAssistant instance with conversation memory.
+
+        Args:
+            backend (Optional[LLMBackend]): Text generation backend; defaults to the shared process-wide backend.
+            prompt_builder (Optional[PromptBuilder]): Prompt assembly within a token budget; a default one if omitted.
+            cache (Optional[ResponseCache]): Answer cache; the shared one unless RESPONSE_CACHE_ENABLED is off.
+        """
+        self.backend: LLMBackend = backend or get_llm_backend()
+        self.prompt_builder: PromptBuilder = prompt_builder or PromptBuilder()
+        self.cache: Optional[ResponseCache] = cache or (response_cache if RESPONSE_CACHE_ENABLED else None)
+        self.conversation_log: List[Dict[str, str]] = [{"role": "system", "content": "You are a helpful assistant."}]
+        application_logger.log_info("AI Assistant initialized", level="INFO")
+
+    def stream_response(self, user_input: str, results: Optional[List[Dict[str, Any]]] = None,
+                        time_filter: Optional[str] = None) -> Iterator[str]:
+        """
+        Stream an AI response to user input token by token.
+
+        The prompt holds the most relevant passages of ``results`` and as much recent,
+        deduplicated history as the token budget allows. The full response is added to
+        the conversation log once streaming finishes. An answer already given for the
+        same (or a near-identical) question over the same results is replayed from the
+        response cache without calling the model; ``time_filter`` sets how long a new
+        answer stays cached.
+        """
+        cache_group: Optional[Tuple[str, str]] = None
+        cached: Optional[str] = None
+        if self.cache is not None:
+            cache_group = self.cache.make_group(results, self.conversation_log)
+            cached = self.cache.get(user_input, cache_group)
+
+        self.conversation_log.append({"role": "user", "content": user_input})
+        application_logger.log_info("User input added to conversation log", level="INFO")
+
+        start_time: float = time.perf_counter()
+        if cached is not None:
+            # Same word-sized pieces as a stream, so speech chunks (and their audio cache keys) match the first answer
+            tokens: List[str] = re.findall(r"\S+\s*", cached)
+            yield from tokens
+            record_stage("llm", start_time, time.perf_counter() - start_time, {"tokens": len(tokens), "cache": "hit"})
+            self.conversation_log.append({"role": "assistant", "content": cached})
+            application_logger.log_info("AI response served from cache", level="INFO")
+            return
+
+        dialogue_history: str = self.prompt_builder.build(
+            user_input, results, self.conversation_log[:-1], system_prompt=self.conversation_log[0]["content"]
+        )
+        response_tokens: List[str] = []
+        failed: bool = False
+        try:
+            for token in self.backend.stream(dialogue_history):
+                if not response_tokens:
+                    record_stage("llm_first_token", start_time, time.perf_counter() - start_time)
+                response_tokens.append(token)
+                yield token
+        except httpx.HTTPStatusError as e:
+            failed = True
+            application_logger.log_error(f"Model execution error: {e.response.status_code} {e.response.text}")
+            if not response_tokens:
+                response_tokens.append("I apologize, but I encountered an issue processing your request.")
+                yield response_tokens[-1]
+        except Exception as e:
+            failed = True
+            application_logger.log_error(f"Model query error: {e}")
+            if not response_tokens:
+                response_tokens.append("I apologize, but an error occurred while processing your request.")
+                yield response_tokens[-1]
+
+        ai_response: str = "".join(response_tokens).strip()
+        record_stage("llm", start_time, time.perf_counter() - start_time, {"tokens": len(response_tokens)})
+        self.conversation_log.append({"role": "assistant", "content": ai_response})
+        if self.cache is not None and cache_group is not None and ai_response and not failed:
+            self.cache.put(user_input, cache_group, ai_response, time_filter)
+        application_logger.log_info("AI response generated", level="INFO")
+
+    def generate_response(self, user_input: str, results: Optional[List[Dict[str, Any]]] = None,
+                          time_filter: Optional[str] = None) -> str:
+        """
+        Generate an AI response based on user input and, optionally, search results.
+        """
+        return "".join(self.stream_response(user_input, results, time_filter)).strip()
+
+    async def evaluate_article_quality(self, article_title: str, article_content: str) -> str:
+            """
+            Evaluate and rate article quality based on title and content.
+            """
+            evaluation_prompt = f"""
+            Analyze and rate this article on a scale of 1-5 based on:
+            - Accuracy, clarity, and relevance.
+            - Provide only a numeric rating (whole or half numbers allowed).
+            
+            **Title**: {article_title}
+            **Content (first 1000 chars)**: {article_content[:1000]}
+            
+            **Example Valid Outputs:** `4`, `2.5`, `3`
+            """
+
+            try:
+                rating: str = (await asyncio.to_thread(self.backend.generate, evaluation_prompt)).strip()
+
+                # Validate rating format (only 1-5 with optional .5)
+                if rating.isdigit() and 1 <= int(rating) <= 5:
+                    self.conversation_log.append({"role": "assistant", "content": rating})
+                    application_logger.log_info(f"Article rated: {rating}", level="INFO")
+                    return rating
+                else:
+                    application_logger.log_warning(f"Invalid rating received: {rating}")
+                    return "Error"
+
+            except Exception as e:
+                application_logger.log_error(f"Model query error: {e}")
+                return "Error"
+
+    async def rate_article_credibility(self, article_title: str, article_content: str) -> str:
+        """
+        Rate the credibility of an article using a locally created model.
+
+        Args:
+            article_title (str): The title of the article.
+            article_content (str): The full content of the article.
+
+        Returns:
+            str: A credibility rating based on the model's prediction.
+        """
+        ratings: List[str] = await self.rate_articles_credibility([(article_title, article_content)])
+        return ratings[0]
+
+    async def rate_articles_credibility(self, articles: List[Tuple[str, str]]) -> List[str]:
+        """
+        Rate the credibility of several articles with batched model inference.
+
+        Args:
+            articles (List[Tuple[str, str]]): (title, content) pairs to rate.
+
+        Returns:
+            List[str]: One credibility rating per article, "Error" where rating failed.
+        """
+        from helper.credibility import credibility_batcher
+
+        ratings: List[str] = []
+        with timed("credibility", articles=len(articles)):
+            futures: List[concurrent.futures.Future] = credibility_batcher.submit([title for title, _ in articles])
+            for future in futures:
+                try:
+                    ratings.append(await asyncio.wrap_future(future))
+                except Exception as e:
+                    application_logger.log_error(f"Error rating article credibility: {e}")
+                    ratings.append("Error")
+
+        application_logger.log_info(f"Article credibility rated: {ratings}", level="INFO")
+        return ratings
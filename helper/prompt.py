@@ -0,0 +1,269 @@
+import os
+import re
+import urllib.parse
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# ============================ PROMPT ASSEMBLY ============================
+
+# Upper bound for the whole prompt; Llama 3.2 prefill time grows with every token sent
+PROMPT_TOKEN_BUDGET: int = int(os.getenv("PROMPT_TOKEN_BUDGET", "1536"))
+# Share of the budget left after the query and source list that history may use
+HISTORY_SHARE: float = float(os.getenv("PROMPT_HISTORY_SHARE", "0.25"))
+# Longest a single history message may be once clipped
+HISTORY_MESSAGE_TOKENS: int = 160
+PASSAGE_WORDS: int = 60
+PASSAGE_STRIDE: int = 45
+# Passages per source before any source gets a third one, so one long article cannot crowd out the rest
+PASSAGES_PER_SOURCE: int = 2
+TITLE_CHARS: int = 90
+
+ANSWER_INSTRUCTION: str = (
+    "Answer the query using the passages when they are relevant and cite sources as [n]. "
+    "If there are no sources, answer from the conversation."
+)
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_TABLE_LINE = re.compile(r"^\s*\|.*\|\s*$", re.MULTILINE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the this to was were what when "
+    "where which who why will with about latest news".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without a tokenizer (about four characters per token).
+
+    Args:
+        text (str): Text to measure.
+
+    Returns:
+        int: Estimated tokens.
+    """
+    return (len(text) + 3) // 4
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Shorten text to roughly ``max_tokens``, cutting at a word boundary.
+
+    Args:
+        text (str): Text to clip.
+        max_tokens (int): Token limit.
+
+    Returns:
+        str: The text, with "…" appended if it was shortened.
+    """
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + "…"
+
+
+def query_terms(text: str) -> List[str]:
+    """Lowercase content words of a text."""
+    return [word for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def split_passages(text: str, words_per_passage: int = PASSAGE_WORDS, stride: int = PASSAGE_STRIDE) -> List[str]:
+    """
+    Split article text into overlapping word windows.
+
+    Args:
+        text (str): Article text.
+        words_per_passage (int): Words per passage.
+        stride (int): Words between passage starts.
+
+    Returns:
+        List[str]: Passages in reading order.
+    """
+    words = text.split()
+    if len(words) <= words_per_passage:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[start:start + words_per_passage])
+            for start in range(0, len(words) - words_per_passage + stride, stride)]
+
+
+def rank_passages(query: str, passages: Sequence[str], k1: float = 1.2, b: float = 0.75) -> List[float]:
+    """
+    Score passages against the query with BM25, vectorized over the query terms.
+
+    Args:
+        query (str): User query.
+        passages (Sequence[str]): Candidate passages.
+        k1 (float): Term frequency saturation.
+        b (float): Length normalization.
+
+    Returns:
+        List[float]: One score per passage; higher is more relevant.
+    """
+    terms = list(dict.fromkeys(query_terms(query)))
+    if not terms or not passages:
+        return [0.0] * len(passages)
+    import numpy as np
+
+    term_index = {term: column for column, term in enumerate(terms)}
+    frequencies = np.zeros((len(passages), len(terms)), dtype=np.float32)
+    lengths = np.zeros(len(passages), dtype=np.float32)
+    for row, passage in enumerate(passages):
+        words = _WORD.findall(passage.lower())
+        lengths[row] = len(words)
+        for word, count in Counter(words).items():
+            column = term_index.get(word)
+            if column is not None:
+                frequencies[row, column] = count
+
+    document_frequency = (frequencies > 0).sum(axis=0)
+    idf = np.log1p((len(passages) - document_frequency + 0.5) / (document_frequency + 0.5))
+    normalized_length = k1 * (1 - b + b * lengths / max(float(lengths.mean()), 1.0))
+    scores = (frequencies * (k1 + 1) / (frequencies + normalized_length[:, None])) @ idf
+    return scores.tolist()
+
+
+@dataclass
+class Passage:
+    """A ranked piece of an article and the source it cites."""
+
+    source: int
+    text: str
+    score: float
+    position: int
+
+
+class PromptBuilder:
+    """
+    Assemble LLM prompts within a token budget.
+
+    Article bodies are split into passages and only the ones most relevant to the
+    query are kept; sources are cited compactly as ``[n]`` instead of repeating
+    every result dict; earlier turns are deduplicated, stripped of rendered results
+    tables and clipped, newest first.
+    """
+
+    def __init__(self, max_tokens: int = PROMPT_TOKEN_BUDGET, history_share: float = HISTORY_SHARE) -> None:
+        """
+        Initialize the builder.
+
+        Args:
+            max_tokens (int): Token budget for the whole prompt.
+            history_share (float): Fraction of the remaining budget available to conversation history.
+        """
+        self.max_tokens: int = max_tokens
+        self.history_share: float = history_share
+
+    @staticmethod
+    def _source_line(number: int, result: Dict[str, Any]) -> str:
+        """One compact citation line: number, title, host and credibility rating."""
+        title: str = clip_to_tokens(str(result.get("title", "Untitled")).replace("|", "-").strip(), TITLE_CHARS // 4)
+        details: List[str] = []
+        host: str = urllib.parse.urlsplit(str(result.get("link", ""))).hostname or ""
+        if host:
+            details.append(host[4:] if host.startswith("www.") else host)
+        rating: str = str(result.get("rating", "")).strip()
+        if rating.replace(".", "", 1).isdigit():
+            details.append(f"credibility {rating}/5")
+        return f"[{number}] {title}" + (f" ({', '.join(details)})" if details else "")
+
+    @staticmethod
+    def _clean_history(history: Sequence[Dict[str, str]]) -> List[Tuple[str, str]]:
+        """Drop system messages, rendered tables and repeated messages (keeping the latest); oldest first."""
+        cleaned: List[Tuple[str, str]] = []
+        seen: set = set()
+        for entry in reversed(history):
+            role: str = entry.get("role", "")
+            if role == "system":
+                continue
+            content: str = _TABLE_LINE.sub("", entry.get("content", ""))
+            content = re.sub(r"\s+", " ", content).strip()
+            key = (role, content.lower())
+            if not content or key in seen:
+                continue
+            seen.add(key)
+            cleaned.append((role, content))
+        return cleaned[::-1]
+
+    def _select_history(self, history: Sequence[Dict[str, str]], budget: int) -> List[str]:
+        """Newest-first history lines that fit in ``budget`` tokens, returned oldest first."""
+        lines: List[str] = []
+        used: int = 0
+        for role, content in reversed(self._clean_history(history)):
+            line: str = f"{role}: {clip_to_tokens(content, HISTORY_MESSAGE_TOKENS)}"
+            cost: int = estimate_tokens(line) + 1
+            if used + cost > budget:
+                break
+            lines.append(line)
+            used += cost
+        return lines[::-1]
+
+    def _select_passages(self, query: str, results: Sequence[Dict[str, Any]], budget: int) -> List[Passage]:
+        """Best passages across all sources that fit in ``budget`` tokens, in citation order."""
+        candidates: List[Passage] = []
+        for number, result in enumerate(results, start=1):
+            body: str = str(result.get("body") or "")
+            if not body or body.startswith(("Failed", "Error", "Access forbidden", "Unsupported")):
+                body = str(result.get("summary") or "")
+            for position, text in enumerate(split_passages(body)):
+                candidates.append(Passage(number, text, 0.0, position))
+
+        for passage, score in zip(candidates, rank_passages(query, [passage.text for passage in candidates])):
+            passage.score = score
+        # Rank within each source, then interleave: every source's best passages come before anyone's third
+        per_source: Dict[int, int] = {}
+        ordered: List[Tuple[int, float, int, Passage]] = []
+        for passage in sorted(candidates, key=lambda item: (-item.score, item.source, item.position)):
+            rank = per_source.get(passage.source, 0)
+            per_source[passage.source] = rank + 1
+            ordered.append((0 if rank < PASSAGES_PER_SOURCE else 1, -passage.score, passage.source, passage))
+
+        selected: List[Passage] = []
+        used: int = 0
+        for _, _, _, passage in sorted(ordered, key=lambda item: item[:3]):
+            cost: int = estimate_tokens(passage.text) + 2
+            if used + cost > budget:
+                continue
+            selected.append(passage)
+            used += cost
+        return sorted(selected, key=lambda passage: (passage.source, passage.position))
+
+    def build(self, query: str, results: Optional[Sequence[Dict[str, Any]]] = None,
+              history: Optional[Sequence[Dict[str, str]]] = None, system_prompt: str = "You are a helpful assistant.") -> str:
+        """
+        Build a prompt for the query.
+
+        Args:
+            query (str): The user's question.
+            results (Optional[Sequence[Dict[str, Any]]]): Processed search results (title, link, rating, summary, body).
+            history (Optional[Sequence[Dict[str, str]]]): Earlier conversation turns, oldest first.
+            system_prompt (str): System message.
+
+        Returns:
+            str: Prompt text within the token budget (the query itself is never dropped).
+        """
+        results = list(results or [])
+        head: str = f"system: {system_prompt}"
+        tail: str = f"user: {query}\n{ANSWER_INSTRUCTION if results else ''}".rstrip()
+        remaining: int = self.max_tokens - estimate_tokens(head) - estimate_tokens(tail) - 4
+
+        source_lines: List[str] = []
+        for number, result in enumerate(results, start=1):
+            line: str = self._source_line(number, result)
+            if estimate_tokens(line) + 1 > remaining:
+                break
+            source_lines.append(line)
+            remaining -= estimate_tokens(line) + 1
+        results = results[:len(source_lines)]
+
+        history_budget: int = int(max(remaining, 0) * (self.history_share if results else 1.0))
+        history_lines: List[str] = self._select_history(history or [], history_budget)
+        remaining -= sum(estimate_tokens(line) + 1 for line in history_lines)
+
+        sections: List[str] = [head, *history_lines]
+        if source_lines:
+            sections.append("Sources:\n" + "\n".join(source_lines))
+            passages: List[Passage] = self._select_passages(query, results, max(remaining, 0))
+            if passages:
+                sections.append("Passages:\n" + "\n".join(f"[{passage.source}] {passage.text}" for passage in passages))
+        sections.append(tail)
+        return "\n".join(sections)
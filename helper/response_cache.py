@@ -0,0 +1,227 @@
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from logger.app_logger import application_logger
+from logger.metrics import metrics
+
+# ============================ RESPONSE CACHE ============================
+
+RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"
+# Cosine similarity above which a differently worded query counts as the same question
+RESPONSE_CACHE_THRESHOLD: float = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.9"))
+RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+# Answer lifetime by search time range; None is AI-only mode (no search results)
+RESPONSE_CACHE_TTLS: Dict[Optional[str], float] = {
+    "d": 15 * 60, "w": 2 * 60 * 60, "m": 12 * 60 * 60, "y": 48 * 60 * 60, None: 24 * 60 * 60,
+}
+EMBEDDING_DIMENSION: int = 512
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+# Words that do not change what is being asked ("latest AI news" == "latest news in AI")
+_FILLER_WORDS = frozenset("a an the in on of about for to me please what whats is are any".split())
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for exact matching: lowercase words without punctuation or filler words.
+
+    Args:
+        query (str): User query.
+
+    Returns:
+        str: Normalized query.
+    """
+    words: List[str] = _WORD.findall(query.lower())
+    return " ".join(word for word in words if word not in _FILLER_WORDS) or " ".join(words)
+
+
+def results_fingerprint(results: Optional[Sequence[Dict[str, Any]]]) -> str:
+    """
+    Fingerprint a search result set by its URLs and ratings, ignoring order.
+
+    Args:
+        results (Optional[Sequence[Dict[str, Any]]]): Processed search results.
+
+    Returns:
+        str: Hex digest; the same for every empty result set.
+    """
+    from scraping.url_utils import normalize_url
+
+    pairs = sorted(f"{normalize_url(str(result.get('link', '')))}\0{result.get('rating', '')}" for result in results or [])
+    return hashlib.sha256("\n".join(pairs).encode("utf-8")).hexdigest()
+
+
+def context_fingerprint(history: Sequence[Dict[str, str]]) -> str:
+    """
+    Fingerprint the conversation before the query; follow-up questions depend on it.
+
+    Args:
+        history (Sequence[Dict[str, str]]): Earlier turns, including system messages.
+
+    Returns:
+        str: Hex digest; the same for every fresh conversation.
+    """
+    turns = [f"{entry.get('role')}\0{entry.get('content')}" for entry in history if entry.get("role") != "system"]
+    return hashlib.sha256("\n".join(turns).encode("utf-8")).hexdigest()
+
+
+class HashingEncoder:
+    """
+    Dependency-free query embedding: hashed word and character-trigram counts, L2-normalized.
+
+    Good enough to match reworded short queries; pass a SentenceTransformer-style encoder
+    to ResponseCache for semantic matching.
+    """
+
+    def __init__(self, dimension: int = EMBEDDING_DIMENSION) -> None:
+        self.dimension: int = dimension
+
+    def _bucket(self, feature: str) -> int:
+        return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest(), "little") % self.dimension
+
+    def encode(self, texts: List[str]) -> Any:
+        """
+        Embed texts.
+
+        Args:
+            texts (List[str]): Normalized queries.
+
+        Returns:
+            Any: float32 array of shape (len(texts), dimension) with unit-length rows.
+        """
+        import numpy as np
+
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                vectors[row, self._bucket(f"w:{word}")] += 1.0
+                padded = f" {word} "
+                for start in range(len(padded) - 2):
+                    vectors[row, self._bucket(f"c:{padded[start:start + 3]}")] += 0.5
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+@dataclass
+class CachedResponse:
+    """A cached answer and what it was computed from."""
+
+    query: str
+    response: str
+    embedding: Any
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of LLM answers.
+
+    Entries are grouped by (results fingerprint, conversation fingerprint), so an answer
+    is only reused for the same sources and the same prior conversation. Within a group
+    the normalized query is matched exactly first, then by embedding similarity above
+    ``threshold``. Entries expire after a TTL that follows the search time range.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, threshold: float = RESPONSE_CACHE_THRESHOLD,
+                 encoder: Optional[Any] = None) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum cached answers; least recently used are dropped.
+            threshold (float): Minimum cosine similarity for a near match.
+            encoder (Optional[Any]): Object with ``encode(texts)`` returning unit-length rows; HashingEncoder if omitted.
+        """
+        self.max_entries: int = max_entries
+        self.threshold: float = threshold
+        self.encoder: Any = encoder or HashingEncoder()
+        self._entries: "OrderedDict[Tuple[str, str, str], CachedResponse]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def make_group(results: Optional[Sequence[Dict[str, Any]]], history: Sequence[Dict[str, str]]) -> Tuple[str, str]:
+        """
+        Build the group an answer belongs to.
+
+        Args:
+            results (Optional[Sequence[Dict[str, Any]]]): Search results given to the LLM.
+            history (Sequence[Dict[str, str]]): Conversation before the query.
+
+        Returns:
+            Tuple[str, str]: Results and conversation fingerprints.
+        """
+        return results_fingerprint(results), context_fingerprint(history)
+
+    def _embed(self, normalized_query: str) -> Any:
+        return self.encoder.encode([normalized_query])[0]
+
+    def get(self, query: str, group: Tuple[str, str]) -> Optional[str]:
+        """
+        Look up an answer for the query.
+
+        Args:
+            query (str): User query.
+            group (Tuple[str, str]): Group from make_group.
+
+        Returns:
+            Optional[str]: The cached answer, or None on a miss.
+        """
+        normalized: str = normalize_query(query)
+        now: float = time.time()
+        with self._lock:
+            exact: Optional[CachedResponse] = self._entries.get((*group, normalized))
+            if exact is not None and exact.expires_at > now:
+                self._entries.move_to_end((*group, normalized))
+                metrics.increment("response_cache_total", result="exact")
+                return exact.response
+            candidates = [(key, entry) for key, entry in self._entries.items()
+                          if key[:2] == group and entry.expires_at > now]
+        if not candidates:
+            metrics.increment("response_cache_total", result="miss")
+            return None
+
+        embedding = self._embed(normalized)
+        best_key, best_entry = max(candidates, key=lambda item: float(item[1].embedding @ embedding))
+        similarity: float = float(best_entry.embedding @ embedding)
+        if similarity < self.threshold:
+            metrics.increment("response_cache_total", result="miss")
+            return None
+        with self._lock:
+            if best_key in self._entries:
+                self._entries.move_to_end(best_key)
+        metrics.increment("response_cache_total", result="similar")
+        application_logger.log_debug(f"Response cache near match ({similarity:.2f}): {query!r} ~ {best_entry.query!r}")
+        return best_entry.response
+
+    def put(self, query: str, group: Tuple[str, str], response: str, time_filter: Optional[str] = None) -> None:
+        """
+        Store an answer.
+
+        Args:
+            query (str): User query.
+            group (Tuple[str, str]): Group from make_group.
+            response (str): The LLM's answer.
+            time_filter (Optional[str]): Search time range ("d", "w", "m", "y"), None for AI-only answers.
+        """
+        normalized: str = normalize_query(query)
+        ttl: float = RESPONSE_CACHE_TTLS.get(time_filter, RESPONSE_CACHE_TTLS["w"])
+        entry = CachedResponse(query, response, self._embed(normalized), time.time() + ttl)
+        with self._lock:
+            self._entries[(*group, normalized)] = entry
+            self._entries.move_to_end((*group, normalized))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by every assistant (and Streamlit session) in the process
+response_cache = ResponseCache()
@@ -0,0 +1,657 @@
+import asyncio
+import atexit
+import os
+import queue
+import re
+import threading
+import time
+import urllib.parse
+import concurrent.futures
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Set, Tuple
+import httpx
+from helper.extraction import FetchLimiter, create_http_client, extract_article_content, parse_executor
+from helper.llm import AIAssistant
+from logger.app_logger import application_logger
+from logger.metrics import metrics, timed, trace_request
+from scraping.dedup import DEDUP_OVERFETCH_FACTOR, DEDUP_RESULTS, FAILED_BODY_PREFIXES, DuplicateDetector
+from scraping.extractors import html_extractor
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+# ============================ BROWSER POOL ============================
+
+SEARCH_USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/133.0.0.0 Safari/537.36"
+
+
+def build_chrome_options() -> "Options":
+    """Build the headless Chrome options used for DuckDuckGo searches."""
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Run without UI
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-notifications")  # Disable push notifications
+    chrome_options.add_argument("--disable-popup-blocking") # Prevent popups interfering
+    chrome_options.add_argument(f"user-agent={SEARCH_USER_AGENT}")
+    #chrome_options.add_argument("--user-data-dir=C:\\temp\\selenium_profile")
+    return chrome_options
+
+
+class BrowserPool:
+    """
+    Bounded pool of reusable headless Chrome drivers.
+
+    Searches check a driver out with ``checkout()`` and return it automatically.
+    At most ``max_size`` drivers exist at once; idle drivers are health-checked
+    before reuse and recycled after ``max_pages_per_driver`` page loads or after
+    any error raised while they were checked out.
+    """
+
+    def __init__(self, max_size: int = 2, max_pages_per_driver: int = 50, checkout_timeout: float = 30.0) -> None:
+        """
+        Initialize an empty pool; drivers are started on demand.
+
+        Args:
+            max_size (int): Maximum number of concurrently running drivers.
+            max_pages_per_driver (int): Page loads after which a driver is replaced.
+            checkout_timeout (float): Seconds to wait for a free driver before giving up.
+        """
+        self.max_size: int = max_size
+        self.max_pages_per_driver: int = max_pages_per_driver
+        self.checkout_timeout: float = checkout_timeout
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(max_size)
+        self._idle: "queue.LifoQueue[webdriver.Chrome]" = queue.LifoQueue()
+        self._page_counts: Dict[int, int] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._closed: bool = False
+
+    def _create_driver(self) -> "webdriver.Chrome":
+        """Start a new Chrome driver and register it with the pool."""
+        from selenium import webdriver
+
+        with timed("browser_start"):
+            driver: webdriver.Chrome = webdriver.Chrome(options=build_chrome_options())
+        with self._lock:
+            self._page_counts[id(driver)] = 0
+        application_logger.log_info("Browser pool started a new Chrome driver", level="INFO")
+        return driver
+
+    @staticmethod
+    def _is_healthy(driver: "webdriver.Chrome") -> bool:
+        """Check that the driver session still responds."""
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _discard(self, driver: "webdriver.Chrome") -> None:
+        """Quit a driver and forget about it."""
+        with self._lock:
+            self._page_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            application_logger.log_warning(f"Error shutting down Chrome driver: {e}")
+
+    def _acquire_driver(self) -> "webdriver.Chrome":
+        """Take a healthy idle driver, or start a new one if none is available."""
+        while True:
+            try:
+                driver: webdriver.Chrome = self._idle.get_nowait()
+            except queue.Empty:
+                return self._create_driver()
+            if self._is_healthy(driver):
+                return driver
+            application_logger.log_warning("Discarding unhealthy Chrome driver")
+            self._discard(driver)
+
+    def _release(self, driver: "webdriver.Chrome", healthy: bool) -> None:
+        """Return a driver to the pool, recycling it if it is worn out or broken."""
+        with self._lock:
+            self._page_counts[id(driver)] = self._page_counts.get(id(driver), 0) + 1
+            worn_out: bool = self._page_counts[id(driver)] >= self.max_pages_per_driver
+        if self._closed or not healthy or worn_out:
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def checkout(self) -> Iterator["webdriver.Chrome"]:
+        """
+        Check a driver out of the pool for the duration of a ``with`` block.
+
+        Returns:
+            Iterator[webdriver.Chrome]: The checked-out driver.
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool has been shut down")
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise TimeoutError("Timed out waiting for a free browser")
+
+        driver: Optional[webdriver.Chrome] = None
+        healthy: bool = True
+        try:
+            driver = self._acquire_driver()
+            yield driver
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            if driver is not None:
+                self._release(driver, healthy)
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        """Quit every idle driver and refuse further checkouts."""
+        self._closed = True
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        application_logger.log_info("Browser pool shut down", level="INFO")
+
+
+# Shared pool; drivers are quit when the process exits
+browser_pool = BrowserPool(
+    max_size=int(os.getenv("BROWSER_POOL_SIZE", "2")),
+    max_pages_per_driver=int(os.getenv("BROWSER_MAX_PAGES", "50")),
+)
+atexit.register(browser_pool.shutdown)
+
+# ============================ SEARCH RESULT CACHE ============================
+
+# Freshness lifetime per time filter: daily news goes stale quickly, yearly results barely change
+SEARCH_CACHE_TTLS: Dict[str, float] = {"d": 5 * 60, "w": 30 * 60, "m": 2 * 60 * 60, "y": 12 * 60 * 60}
+SEARCH_CACHE_STALE_FACTOR: float = 4.0
+# Longest a search waits on an identical in-flight search; older in-flight searches count as abandoned
+SEARCH_TIMEOUT: float = float(os.getenv("SEARCH_TIMEOUT", "60"))
+
+
+class SearchResultCache:
+    """
+    In-memory cache of processed search results keyed on (query, region, time_filter).
+
+    Entries are served directly while fresh. Once past their TTL they are still
+    served for up to ``stale_factor`` times the TTL while a background refresh
+    replaces them (stale-while-revalidate). ``claim`` coalesces concurrent
+    identical searches so only one of them actually scrapes.
+    """
+
+    def __init__(self, max_entries: int = 256, stale_factor: float = SEARCH_CACHE_STALE_FACTOR) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Maximum number of cached searches (least recently used are dropped).
+            stale_factor (float): How many TTLs a stale entry may still be served for.
+        """
+        self.max_entries: int = max_entries
+        self.stale_factor: float = stale_factor
+        self._entries: "OrderedDict[Tuple[str, str, str], Tuple[float, int, List[Dict[str, Any]]]]" = OrderedDict()
+        # Future, requested result count and start time of every search in flight
+        self._in_flight: Dict[Tuple[str, str, str], Tuple[concurrent.futures.Future, int, float]] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def make_key(query: str, region: str, time_filter: str) -> Tuple[str, str, str]:
+        """
+        Build the cache key for a search.
+
+        Args:
+            query (str): Search terms.
+            region (str): Geographic region code.
+            time_filter (str): Time range filter.
+
+        Returns:
+            Tuple[str, str, str]: Case- and whitespace-normalized key.
+        """
+        return " ".join(query.lower().split()), region.strip().lower(), time_filter
+
+    @staticmethod
+    def _ttl(key: Tuple[str, str, str]) -> float:
+        """Freshness lifetime for a key based on its time filter."""
+        return SEARCH_CACHE_TTLS.get(key[2], SEARCH_CACHE_TTLS["w"])
+
+    def lookup(self, key: Tuple[str, str, str], count: int,
+               refresh: Callable[[int], Awaitable[List[Dict[str, Any]]]]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return cached results if they are fresh or still servable while stale.
+
+        Args:
+            key (Tuple[str, str, str]): Cache key from make_key.
+            count (int): Number of results requested.
+            refresh (Callable[[int], Awaitable[List[Dict[str, Any]]]]): Coroutine factory used to revalidate stale
+                entries; called with the number of results the entry was stored for.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: Copies of the cached results, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, stored_count, results = entry
+            age: float = time.time() - stored_at
+            if stored_count < count or age >= self._ttl(key) * self.stale_factor:
+                return None
+            self._entries.move_to_end(key)
+            needs_refresh: bool = age >= self._ttl(key) and key not in self._in_flight
+
+        if needs_refresh:
+            self._refresh_in_background(key, stored_count, refresh)
+        return [dict(result) for result in results[:count]]
+
+    def claim(self, key: Tuple[str, str, str], count: int) -> Tuple[Optional[concurrent.futures.Future], bool]:
+        """
+        Join or start the in-flight search for a key.
+
+        A search is only joined if it asked for at least ``count`` results. One that has
+        run longer than SEARCH_TIMEOUT is treated as abandoned and taken over.
+
+        Args:
+            key (Tuple[str, str, str]): Cache key from make_key.
+            count (int): Number of results requested.
+
+        Returns:
+            Tuple[Optional[concurrent.futures.Future], bool]: The shared future and whether the caller owns
+            the search; (None, False) if a smaller identical search is in flight and the caller should search alone.
+        """
+        now: float = time.monotonic()
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            if in_flight is not None and now - in_flight[2] < SEARCH_TIMEOUT:
+                future, in_flight_count, _ = in_flight
+                return (future, False) if in_flight_count >= count else (None, False)
+            future = concurrent.futures.Future()
+            self._in_flight[key] = (future, count, now)
+            return future, True
+
+    def complete(self, key: Tuple[str, str, str], count: int, future: concurrent.futures.Future,
+                 results: List[Dict[str, Any]]) -> None:
+        """
+        Store the results of an owned search and wake up every waiter.
+
+        Args:
+            key (Tuple[str, str, str]): Cache key from make_key.
+            count (int): Number of results that were requested.
+            future (concurrent.futures.Future): Future returned by claim.
+            results (List[Dict[str, Any]]): Processed results.
+        """
+        with self._lock:
+            if results:
+                self._entries[key] = (time.time(), count, results)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            self._release(key, future)
+        if not future.done():
+            future.set_result(results)
+
+    def fail(self, key: Tuple[str, str, str], future: concurrent.futures.Future, error: BaseException) -> None:
+        """
+        Release an owned search that did not finish.
+
+        Args:
+            key (Tuple[str, str, str]): Cache key from make_key.
+            future (concurrent.futures.Future): Future returned by claim.
+            error (BaseException): Reason the search did not complete.
+        """
+        with self._lock:
+            self._release(key, future)
+        if not future.done():
+            future.set_exception(error if isinstance(error, Exception) else RuntimeError("Search was abandoned"))
+
+    def _release(self, key: Tuple[str, str, str], future: concurrent.futures.Future) -> None:
+        """Forget the in-flight search for a key unless another search took it over. Caller holds the lock."""
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None and in_flight[0] is future:
+            del self._in_flight[key]
+
+    def _refresh_in_background(self, key: Tuple[str, str, str], count: int,
+                               refresh: Callable[[int], Awaitable[List[Dict[str, Any]]]]) -> None:
+        """Revalidate a stale entry for its stored result count on a daemon thread with its own event loop."""
+        future, is_owner = self.claim(key, count)
+        if not is_owner:
+            return
+
+        def run_refresh() -> None:
+            try:
+                self.complete(key, count, future, asyncio.run(refresh(count)))
+                application_logger.log_info(f"Search cache refreshed for: {key[0]}", level="INFO")
+            except Exception as e:
+                application_logger.log_warning(f"Background search refresh failed: {e}")
+                self.fail(key, future, e)
+
+        threading.Thread(target=run_refresh, name="search-cache-refresh", daemon=True).start()
+
+
+# Shared across every Streamlit session in this process
+search_cache = SearchResultCache()
+
+# ============================ NEWS SEARCH ============================
+
+DUCKDUCKGO_HTML_URL: str = os.getenv("DUCKDUCKGO_HTML_URL", "https://html.duckduckgo.com/html/")
+SEARCH_BACKEND: str = os.getenv("SEARCH_BACKEND", "auto")  # "auto" (HTTP, then Selenium), "http" or "selenium"
+
+
+def _search_params(query: str, region: str, time_filter: str) -> Dict[str, str]:
+    """Build the DuckDuckGo query string parameters."""
+    return {"q": query, "kl": region, "df": time_filter, "ia": "news"}
+
+
+async def fetch_search_page_http(query: str, region: str, time_filter: str) -> str:
+    """
+    Fetch the DuckDuckGo HTML results page with a plain HTTP request (no JavaScript).
+
+    Args:
+        query (str): Search terms.
+        region (str): Geographic region code.
+        time_filter (str): Time range filter.
+
+    Returns:
+        str: Raw HTML of the results page.
+    """
+    async with httpx.AsyncClient(headers={"User-Agent": SEARCH_USER_AGENT}, timeout=10, follow_redirects=True) as client:
+        response: httpx.Response = await client.get(DUCKDUCKGO_HTML_URL, params=_search_params(query, region, time_filter))
+        response.raise_for_status()
+        return response.text
+
+
+def fetch_search_page_browser(query: str, region: str, time_filter: str) -> str:
+    """
+    Fetch the DuckDuckGo results page with a pooled headless browser.
+
+    Args:
+        query (str): Search terms.
+        region (str): Geographic region code.
+        time_filter (str): Time range filter.
+
+    Returns:
+        str: Rendered HTML of the results page.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    duckduckgo_news_url: str = f"https://duckduckgo.com/html/?{urllib.parse.urlencode(_search_params(query, region, time_filter))}"
+    with browser_pool.checkout() as driver:
+        driver.get(duckduckgo_news_url)
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "result__body")))
+        return driver.page_source
+
+
+@timed("search_page")
+async def fetch_search_page(query: str, region: str, time_filter: str) -> str:
+    """
+    Fetch the DuckDuckGo results page, preferring the lightweight HTTP path.
+
+    Falls back to the browser pool when the HTTP response has no results (e.g. a
+    JavaScript challenge page) unless ``SEARCH_BACKEND`` pins a single backend.
+
+    Args:
+        query (str): Search terms.
+        region (str): Geographic region code.
+        time_filter (str): Time range filter.
+
+    Returns:
+        str: HTML of the results page.
+    """
+    if SEARCH_BACKEND != "selenium":
+        try:
+            page_html: str = await fetch_search_page_http(query, region, time_filter)
+            if "result__body" in page_html or SEARCH_BACKEND == "http":
+                return page_html
+            application_logger.log_warning("HTTP search returned no results, falling back to browser")
+        except httpx.HTTPError as e:
+            if SEARCH_BACKEND == "http":
+                raise
+            application_logger.log_warning(f"HTTP search failed ({e}), falling back to browser")
+
+    return await asyncio.to_thread(fetch_search_page_browser, query, region, time_filter)
+
+
+def parse_search_results(page_html: str, count: int) -> List[Dict[str, Any]]:
+    """
+    Parse DuckDuckGo result blocks into title, link and summary entries.
+
+    Args:
+        page_html (str): HTML of the results page.
+        count (int): Maximum number of results to return.
+
+    Returns:
+        List[Dict[str, Any]]: Parsed results with their 1-based position in "num".
+    """
+    parsed_results: List[Dict[str, Any]] = []
+
+    for index, result in enumerate(html_extractor.extract_search_results(page_html)[:count]):
+        if not result["title"]:
+            application_logger.log_warning(f"Title tag not found for result index {index}")
+            continue
+
+        match: Optional[re.Match] = re.search(r"uddg=(https?%3A%2F%2F[^&]+)", result["href"] or "")
+
+        parsed_results.append({
+            "num": index + 1,
+            "link": urllib.parse.unquote(match.group(1)) if match else "Unknown Link",
+            "title": result["title"],
+            "summary": result["snippet"] or "No summary available.",
+        })
+    return parsed_results
+
+
+async def process_article(result: Dict[str, Any], bot: AIAssistant, client: httpx.AsyncClient,
+                          limiter: FetchLimiter, detector: Optional[DuplicateDetector] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fetch, extract and rate a single search result.
+
+    Args:
+        result (Dict[str, Any]): Parsed search result from parse_search_results.
+        bot (AIAssistant): Assistant used for credibility rating.
+        client (httpx.AsyncClient): Shared HTTP client.
+        limiter (FetchLimiter): Shared concurrency limits.
+        detector (Optional[DuplicateDetector]): Skips rating when the body repeats an article already processed.
+
+    Returns:
+        Optional[Dict[str, Any]]: The result with "body" and "rating" added, or None if an error occurs
+        or the article is a duplicate.
+    """
+    try:
+        # Each article runs in its own task, so the context only tags this article's records
+        with application_logger.context(stage="article", url=result["link"]):
+            article_content: str = await extract_article_content(result["link"], client, limiter)
+            if detector is not None and detector.check_body(result["link"], article_content) is not None:
+                return None
+
+            # Concurrent ratings are merged into shared forward passes by the credibility batcher
+            rating: str = await bot.rate_article_credibility(result["title"], article_content)
+
+            application_logger.log_info(f"Processed article: {result['title']}", level="INFO")
+            return {**result, "body": article_content, "rating": rating}
+    except Exception as e:
+        application_logger.log_error(f"Error processing article: {e}")
+        return None
+
+
+async def _stream_live_news_data(query: str, count: int, region: str, time_filter: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run a live DuckDuckGo search and yield each processed result as soon as it is ready.
+
+    Args:
+        query (str): Search terms.
+        count (int): Number of articles to retrieve.
+        region (str): Geographic region code (e.g., 'us-en', 'in-en').
+        time_filter (str): Time range filter ('d'=day, 'w'=week, 'm'=month, 'y'=year).
+
+    Returns:
+        AsyncIterator[Dict[str, Any]]: Processed articles in completion order.
+    """
+    application_logger.log_info(f"Initiating news search for: {query}", level="INFO")
+
+    loop = asyncio.get_running_loop()
+    page_html: str = await fetch_search_page(query, region, time_filter)
+    # Parse extra results so duplicates and failed articles can be replaced by the next unique result
+    candidate_count: int = max(count, int(count * DEDUP_OVERFETCH_FACTOR)) if DEDUP_RESULTS else count
+    with timed("search_parse"):
+        search_results: List[Dict[str, Any]] = await loop.run_in_executor(
+            parse_executor, parse_search_results, page_html, candidate_count
+        )
+
+    # Syndicated copies and tracking variants of one link are dropped before anything is fetched
+    detector: Optional[DuplicateDetector] = DuplicateDetector() if DEDUP_RESULTS else None
+    if detector is not None:
+        unique_results: List[Dict[str, Any]] = [result for result in search_results if detector.check_result(result) is None]
+        if len(unique_results) < len(search_results):
+            application_logger.log_info(f"Dropped {len(search_results) - len(unique_results)} duplicate search results", level="INFO")
+        search_results = unique_results
+    spare_results: Iterator[Dict[str, Any]] = iter(search_results[count:])
+
+    # A single assistant is shared by every result; the credibility model itself lives in the registry
+    bot: AIAssistant = AIAssistant()
+    limiter: FetchLimiter = FetchLimiter()
+    from helper.corpus import CORPUS_ENABLED, CorpusStore, corpus_store
+    store: Optional[CorpusStore] = corpus_store if CORPUS_ENABLED else None
+
+    async with create_http_client() as client:
+        tasks: Set[asyncio.Future] = {
+            asyncio.ensure_future(process_article(result, bot, client, limiter, detector)) for result in search_results[:count]
+        }
+        try:
+            # Yield in completion order; total latency is the slowest article, not the sum
+            unfetched: List[Dict[str, Any]] = []
+            yielded: int = 0
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    processed: Optional[Dict[str, Any]] = task.result()
+                    failed: bool = processed is not None and str(processed.get("body", "")).startswith(FAILED_BODY_PREFIXES)
+                    if processed is not None and not failed:
+                        if store is not None:
+                            # Kept for later searches and AI Mode; written off the event loop without waiting
+                            loop.run_in_executor(parse_executor, store.add, [processed], query)
+                        yielded += 1
+                        yield processed
+                        continue
+                    # Duplicate body or article that could not be fetched: process the next spare result in its place
+                    spare: Optional[Dict[str, Any]] = next(spare_results, None)
+                    if spare is not None:
+                        tasks.add(asyncio.ensure_future(process_article(spare, bot, client, limiter, detector)))
+                    if failed:
+                        unfetched.append(processed)
+            # Out of spares: fill the remaining slots with the articles that failed, as before deduplication
+            for processed in unfetched[:max(count - yielded, 0)]:
+                yield processed
+        finally:
+            # The consumer may stop early; don't leave fetches running against a closed client
+            for task in tasks:
+                task.cancel()
+
+
+async def _collect_live_news_data(query: str, count: int, region: str, time_filter: str) -> List[Dict[str, Any]]:
+    """Run a live search to completion and return every processed result."""
+    return [result async for result in _stream_live_news_data(query, count, region, time_filter)]
+
+
+async def stream_news_data(query: str, count: int = 5, region: str = "us-en",
+                           time_filter: str = "w") -> AsyncIterator[Dict[str, Any]]:
+    """
+    Search news articles and yield each processed result as soon as it is ready.
+
+    Cached results for the same (query, region, time_filter) are replayed without
+    searching, then the local corpus is tried if it holds ``count`` fresh articles
+    similar to the query, and concurrent identical searches share one in-flight search.
+
+    Args:
+        query (str): Search terms.
+        count (int): Number of articles to retrieve.
+        region (str): Geographic region code (e.g., 'us-en', 'in-en').
+        time_filter (str): Time range filter ('d'=day, 'w'=week, 'm'=month, 'y'=year).
+
+    Returns:
+        AsyncIterator[Dict[str, Any]]: Processed articles in completion order.
+    """
+    cache_key: Tuple[str, str, str] = search_cache.make_key(query, region, time_filter)
+    cached_results: Optional[List[Dict[str, Any]]] = search_cache.lookup(
+        cache_key, count, lambda refresh_count: _collect_live_news_data(query, refresh_count, region, time_filter)
+    )
+    if cached_results is not None:
+        metrics.increment("search_cache_total", result="hit")
+        application_logger.log_info(f"Search results served from cache for: {query}", level="INFO")
+        for result in cached_results:
+            yield result
+        return
+
+    # Recurring topics are answered from articles processed by earlier searches, without browser or network
+    from helper.corpus import search_local_news
+
+    local_results: Optional[List[Dict[str, Any]]] = await asyncio.get_running_loop().run_in_executor(
+        parse_executor, search_local_news, query, count, time_filter
+    )
+    if local_results is not None:
+        application_logger.log_info(f"Search results served from the local corpus for: {query}", level="INFO")
+        for result in local_results:
+            yield result
+        return
+
+    in_flight, is_owner = search_cache.claim(cache_key, count)
+    if in_flight is not None and not is_owner:
+        try:
+            # shield: timing out must not cancel the search the owner is still running
+            shared_results: List[Dict[str, Any]] = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(in_flight)), SEARCH_TIMEOUT
+            )
+            metrics.increment("search_cache_total", result="shared")
+            application_logger.log_info(f"Joined in-flight search for: {query}", level="INFO")
+            for result in shared_results[:count]:
+                yield dict(result)
+            return
+        except asyncio.TimeoutError:
+            application_logger.log_warning(f"Shared search timed out after {SEARCH_TIMEOUT:.0f}s, searching again")
+        except Exception as e:
+            application_logger.log_warning(f"Shared search failed ({e}), searching again")
+
+    metrics.increment("search_cache_total", result="miss")
+    collected_results: List[Dict[str, Any]] = []
+    try:
+        async for processed in _stream_live_news_data(query, count, region, time_filter):
+            collected_results.append(processed)
+            yield processed
+    except BaseException as e:
+        if is_owner:
+            search_cache.fail(cache_key, in_flight, e)
+        raise
+    if is_owner:
+        search_cache.complete(cache_key, count, in_flight, collected_results)
+
+
+async def fetch_news_data(query: str, count: int = 5, region: str = "us-en", time_filter: str = "w") -> Dict[str, Any]:
+    """
+    Search and analyze news articles using DuckDuckGo with parallel processing.
+
+    Args:
+        query (str): Search terms.
+        count (int): Number of articles to retrieve.
+        region (str): Geographic region code (e.g., 'us-en', 'in-en').
+        time_filter (str): Time range filter ('d'=day, 'w'=week, 'm'=month, 'y'=year).
+
+    Returns:
+        Dict[str, Any]: Processed news article data.
+    """
+    # Tags every record with a request id and logs a per-stage timing trace when the search ends
+    with trace_request(query):
+        extracted_results: List[Dict[str, Any]] = [
+            result async for result in stream_news_data(query, count=count, region=region, time_filter=time_filter)
+        ]
+
+    if extracted_results:
+        application_logger.log_info(f"News search completed successfully with {len(extracted_results)} results", level="INFO")
+        return {"status": "success", "results": extracted_results}
+    else:
+        application_logger.log_error("No valid news search results found")
+        return {"status": "error", "message": "No valid news search results found"}
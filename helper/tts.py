@@ -0,0 +1,395 @@
+import abc
+import concurrent.futures
+import contextvars
+import hashlib
+import io
+import os
+import re
+import threading
+import wave
+from typing import List, Optional
+from logger.app_logger import application_logger
+from logger.metrics import metrics, timed
+
+# ============================ TEXT TO SPEECH ============================
+
+TTS_CACHE_DIRECTORY: str = os.path.join(
+    os.getenv("INTELLISEARCH_CACHE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache")),
+    "tts",
+)
+TTS_CACHE_MAX_BYTES: int = int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TTS_WORKERS: int = int(os.getenv("TTS_WORKERS", "2"))
+# Later chunks group sentences up to this length; the first chunk is always a single sentence
+TTS_CHUNK_CHARS: int = 400
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+class SpeechEngine(abc.ABC):
+    """Base class for speech synthesis engines."""
+
+    name: str = "base"
+    mime_type: str = "audio/mpeg"
+
+    @abc.abstractmethod
+    def synthesize(self, text: str, lang: str = "en") -> bytes:
+        """
+        Convert text to audio.
+
+        Args:
+            text (str): Text to speak.
+            lang (str): Language code.
+
+        Returns:
+            bytes: Encoded audio.
+        """
+
+
+class GTTSEngine(SpeechEngine):
+    """Google Text-to-Speech; returns MP3 bytes without touching the filesystem."""
+
+    name = "gtts"
+    mime_type = "audio/mpeg"
+
+    def synthesize(self, text: str, lang: str = "en") -> bytes:
+        from gtts import gTTS
+
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class FakeSpeechEngine(SpeechEngine):
+    """
+    Deterministic offline engine for tests and development.
+
+    Produces a silent WAV file whose length grows with the number of words.
+    """
+
+    name = "fake"
+    mime_type = "audio/wav"
+
+    def __init__(self, seconds_per_word: float = 0.05, sample_rate: int = 8000) -> None:
+        """
+        Initialize the fake engine.
+
+        Args:
+            seconds_per_word (float): Audio duration generated per word.
+            sample_rate (int): WAV sample rate.
+        """
+        self.seconds_per_word: float = seconds_per_word
+        self.sample_rate: int = sample_rate
+        self.texts: List[str] = []
+
+    def synthesize(self, text: str, lang: str = "en") -> bytes:
+        self.texts.append(text)
+        frames: int = int(max(len(text.split()), 1) * self.seconds_per_word * self.sample_rate)
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(self.sample_rate)
+            wav_file.writeframes(b"\x00\x00" * frames)
+        return buffer.getvalue()
+
+
+class AudioCache:
+    """
+    Bounded on-disk cache of synthesized audio keyed by content hash.
+
+    Files are touched on every hit and the least recently used ones are deleted once
+    the directory grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory: str = TTS_CACHE_DIRECTORY, max_bytes: int = TTS_CACHE_MAX_BYTES) -> None:
+        """
+        Initialize the cache and create its directory.
+
+        Args:
+            directory (str): Directory holding the audio files.
+            max_bytes (int): Upper bound for the total size of cached audio.
+        """
+        self.directory: str = directory
+        self.max_bytes: int = max_bytes
+        self._lock: threading.Lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def cache_key(engine: SpeechEngine, text: str, lang: str) -> str:
+        """
+        Compute the cache key for a synthesis request.
+
+        Args:
+            engine (SpeechEngine): Engine producing the audio.
+            text (str): Text to speak.
+            lang (str): Language code.
+
+        Returns:
+            str: Hex SHA-256 digest of engine, language and text.
+        """
+        return hashlib.sha256(f"{engine.name}\0{lang}\0{text}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.audio")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up cached audio.
+
+        Args:
+            key (str): Key from cache_key.
+
+        Returns:
+            Optional[bytes]: The audio, or None on a miss.
+        """
+        path: str = self._path(key)
+        try:
+            with open(path, "rb") as audio_file:
+                audio: bytes = audio_file.read()
+            os.utime(path)  # Mark as recently used
+            return audio
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, audio: bytes) -> None:
+        """
+        Store audio and evict old entries if the cache is over its size limit.
+
+        Args:
+            key (str): Key from cache_key.
+            audio (bytes): Encoded audio.
+        """
+        path: str = self._path(key)
+        temporary_path: str = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as audio_file:
+            audio_file.write(audio)
+        os.replace(temporary_path, path)  # Atomic, so readers never see a partial file
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Delete least recently used files until the cache fits in ``max_bytes``.
+
+        Returns:
+            int: Number of deleted files.
+        """
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".audio"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size: int = sum(size for _, size, _ in entries)
+            evicted: int = 0
+            for _, size, path in sorted(entries):
+                if total_size <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+                evicted += 1
+        return evicted
+
+
+def split_into_chunks(text: str, max_chars: int = TTS_CHUNK_CHARS) -> List[str]:
+    """
+    Split a response into speakable chunks.
+
+    The first chunk is the first sentence so playback can start as early as possible;
+    the following sentences are grouped into chunks of up to ``max_chars``.
+
+    Args:
+        text (str): Text to split.
+        max_chars (int): Target maximum length of the later chunks.
+
+    Returns:
+        List[str]: Non-empty chunks in reading order.
+    """
+    sentences: List[str] = [sentence.strip() for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+    if not sentences:
+        return []
+    chunks: List[str] = [sentences[0]]
+    current: str = ""
+    for sentence in sentences[1:]:
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def get_speech_engine() -> SpeechEngine:
+    """Select the speech engine with the ``TTS_ENGINE`` env variable ("gtts" or "fake")."""
+    return FakeSpeechEngine() if os.getenv("TTS_ENGINE", "gtts").lower() == "fake" else GTTSEngine()
+
+
+class SpeechSynthesizer:
+    """
+    Background speech synthesis with a shared audio cache.
+
+    Chunks are synthesized on a small thread pool so the chat reply never waits on
+    speech; identical text is served from the cache without calling the engine.
+    """
+
+    def __init__(self, engine: Optional[SpeechEngine] = None, cache: Optional[AudioCache] = None,
+                 max_workers: int = TTS_WORKERS) -> None:
+        """
+        Initialize the synthesizer.
+
+        Args:
+            engine (Optional[SpeechEngine]): Engine to use; selected from TTS_ENGINE if omitted.
+            cache (Optional[AudioCache]): Audio cache; created in the default directory if omitted.
+            max_workers (int): Concurrent synthesis requests.
+        """
+        self.engine: SpeechEngine = engine or get_speech_engine()
+        self.cache: AudioCache = cache or AudioCache()
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts")
+
+    @property
+    def mime_type(self) -> str:
+        """MIME type of the audio produced by the engine."""
+        return self.engine.mime_type
+
+    def synthesize(self, text: str, lang: str = "en") -> bytes:
+        """
+        Synthesize text, using the cache when possible.
+
+        Args:
+            text (str): Text to speak.
+            lang (str): Language code.
+
+        Returns:
+            bytes: Encoded audio.
+        """
+        with timed("tts", engine=self.engine.name, chars=len(text)) as timer:
+            key: str = self.cache.cache_key(self.engine, text, lang)
+            audio: Optional[bytes] = self.cache.get(key)
+            timer.attributes["cache"] = "hit" if audio is not None else "miss"
+            metrics.increment("tts_cache_total", result=timer.attributes["cache"])
+            if audio is None:
+                audio = self.engine.synthesize(text, lang)
+                self.cache.put(key, audio)
+        return audio
+
+    def submit(self, text: str, lang: str = "en") -> concurrent.futures.Future:
+        """
+        Synthesize text in the background.
+
+        Args:
+            text (str): Text to speak.
+            lang (str): Language code.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the encoded audio.
+        """
+        # Run in the caller's context so logs and timings are attributed to its request
+        return self._executor.submit(contextvars.copy_context().run, self.synthesize, text, lang)
+
+    def submit_chunks(self, text: str, lang: str = "en") -> List[concurrent.futures.Future]:
+        """
+        Split text into chunks and synthesize them in the background.
+
+        Args:
+            text (str): Text to speak.
+            lang (str): Language code.
+
+        Returns:
+            List[concurrent.futures.Future]: One future per chunk, in reading order.
+        """
+        return [self.submit(chunk, lang) for chunk in split_into_chunks(text)]
+
+
+class SpeechStream:
+    """
+    Incremental speech for a streamed answer.
+
+    Tokens are fed as they arrive and every completed chunk is submitted for synthesis
+    immediately, so the first sentence is usually ready by the time the answer ends.
+    """
+
+    def __init__(self, synthesizer: SpeechSynthesizer, lang: str = "en", max_chars: int = TTS_CHUNK_CHARS) -> None:
+        """
+        Initialize an empty stream.
+
+        Args:
+            synthesizer (SpeechSynthesizer): Synthesizer used for every chunk.
+            lang (str): Language code.
+            max_chars (int): Target maximum length of chunks after the first.
+        """
+        self.synthesizer: SpeechSynthesizer = synthesizer
+        self.lang: str = lang
+        self.max_chars: int = max_chars
+        self.futures: List[concurrent.futures.Future] = []
+        self._pending: str = ""
+
+    def feed(self, token: str) -> None:
+        """
+        Add streamed text, submitting completed chunks.
+
+        Args:
+            token (str): Next fragment of the answer.
+        """
+        self._pending += token
+        sentences: List[str] = _SENTENCE_END.split(self._pending)
+        if len(sentences) < 2:
+            return
+        complete: str = " ".join(sentence.strip() for sentence in sentences[:-1]).strip()
+        # Submit the first sentence alone, then wait for chunks of max_chars
+        if not self.futures or len(complete) >= self.max_chars:
+            self.futures.append(self.synthesizer.submit(complete, self.lang))
+            self._pending = sentences[-1]
+
+    def close(self) -> List[concurrent.futures.Future]:
+        """
+        Submit the remaining text.
+
+        Returns:
+            List[concurrent.futures.Future]: One future per chunk, in reading order.
+        """
+        if self._pending.strip():
+            self.futures.append(self.synthesizer.submit(self._pending.strip(), self.lang))
+            self._pending = ""
+        return self.futures
+
+
+_speech_synthesizer: Optional[SpeechSynthesizer] = None
+_speech_synthesizer_lock: threading.Lock = threading.Lock()
+
+
+def get_speech_synthesizer() -> SpeechSynthesizer:
+    """
+    Return the process-wide speech synthesizer, creating it on first use.
+
+    Returns:
+        SpeechSynthesizer: The shared synthesizer.
+    """
+    global _speech_synthesizer
+    with _speech_synthesizer_lock:
+        if _speech_synthesizer is None:
+            _speech_synthesizer = SpeechSynthesizer()
+            application_logger.log_info(f"Speech engine initialized: {_speech_synthesizer.engine.name}", level="INFO")
+        return _speech_synthesizer
+
+
+def text_to_speech(input_text: str) -> Optional[bytes]:
+    """
+    Convert text to speech.
+
+    Args:
+        input_text (str): Text to speak.
+
+    Returns:
+        Optional[bytes]: Encoded audio (see ``get_speech_synthesizer().mime_type``), or None on failure.
+    """
+    try:
+        audio: bytes = get_speech_synthesizer().synthesize(input_text)
+        application_logger.log_info("Text successfully converted to audio", level="INFO")
+        return audio
+    except Exception as e:
+        application_logger.log_error(f"Audio conversion error: {e}")
+        return None
@@ -0,0 +1,7 @@
+from datetime import datetime
+
+# ============================ UTILITY FUNCTIONS ============================
+
+def get_current_year() -> int:
+    """Get the current year as an integer."""
+    return datetime.now().year
@@ -1,36 +1,386 @@
+import atexit
+import json
 import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime, timedelta
 from loguru import logger as loguru_logger
-from typing import Any, Generator
+from typing import Any, Dict, Generator, List, Optional, TextIO
 from contextlib import contextmanager
 
 # Define log configuration
 LOG_DIRECTORY = "logs"
 LOG_FILENAME = "application.log"
 LOG_PATH = f"{LOG_DIRECTORY}/{LOG_FILENAME}"
+JSON_LOG_PREFIX = "application"
+LOG_RETENTION_DAYS = 10
+
+# "1" hands records to a background writer so hot paths never wait on disk or the console
+LOG_QUEUED = os.getenv("LOG_QUEUED", "1") == "1"
+# "1" also writes JSON-lines records (with request id, query and stage) to logs/application-YYYY-MM-DD.jsonl
+LOG_JSON = os.getenv("LOG_JSON", "1") == "1"
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "256"))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "0.5"))
+LOG_CONSOLE_LEVEL = os.getenv("LOG_CONSOLE_LEVEL", "DEBUG")
+# Records waiting for the writer; beyond this, new records are dropped and counted instead of growing memory
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Warnings and errors wait this long for queue space before being dropped
+LOG_BLOCK_SECONDS = 0.1
+
+_UNSAMPLED_LEVELS = ("WARNING", "ERROR", "CRITICAL")
+
+
+def _parse_sample_rates(spec: str) -> Dict[str, float]:
+    """Parse "INFO=0.1,DEBUG=0.01" into per-level keep probabilities; warnings and errors are never sampled."""
+    rates: Dict[str, float] = {}
+    for item in spec.split(","):
+        level, _, rate = item.partition("=")
+        level = level.strip().upper()
+        if level and rate.strip() and level not in _UNSAMPLED_LEVELS:
+            rates[level] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+# Fraction of records kept per level for high-volume events, e.g. "INFO=0.1,DEBUG=0.01"
+LOG_SAMPLE_RATES = _parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))
 
 # Create logs directory if it doesn't exist
 os.makedirs(LOG_DIRECTORY, exist_ok=True)
 
-# Configure Loguru with enhanced format
-loguru_logger.add(
-    LOG_PATH,
-    rotation="1 day",
-    retention="10 days",
-    format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-           "<level>{level: <8}</level> | "
-           "<cyan>{module}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-)
+
+class QueuedLogWriter:
+    """
+    Loguru sink that writes the text log, the JSON-lines log and the console.
+
+    In queued mode the logging thread only puts the record on an in-memory queue;
+    a dedicated writer thread drains up to ``batch_size`` records at a time, formats
+    them and flushes each output once per batch (at least every ``flush_interval``
+    seconds). The queue holds at most ``queue_size`` records; when the disk cannot keep
+    up, further records are dropped and the count is logged. Both files roll over
+    daily and are deleted after ``retention_days``.
+    """
+
+    TEXT_FORMAT = "{time} | {level: <8} | {module}:{function}:{line} - {message}"
+
+    def __init__(self, directory: str = LOG_DIRECTORY, text_filename: str = LOG_FILENAME,
+                 json_prefix: Optional[str] = JSON_LOG_PREFIX, console_level: str = LOG_CONSOLE_LEVEL,
+                 queued: bool = LOG_QUEUED, batch_size: int = LOG_BATCH_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL, retention_days: int = LOG_RETENTION_DAYS,
+                 queue_size: int = LOG_QUEUE_SIZE) -> None:
+        """
+        Initialize the writer and, in queued mode, start its thread.
+
+        Args:
+            directory (str): Log directory.
+            text_filename (str): Name of the human-readable log file.
+            json_prefix (Optional[str]): JSON-lines file prefix; None disables JSON output.
+            console_level (str): Minimum level echoed to stderr.
+            queued (bool): Write from a background thread instead of the logging thread.
+            batch_size (int): Maximum records written per flush.
+            flush_interval (float): Maximum seconds a queued record waits before being flushed.
+            retention_days (int): Days after which rotated files are deleted.
+            queue_size (int): Maximum records waiting for the writer thread.
+        """
+        self.directory = directory
+        self.text_path = os.path.join(directory, text_filename)
+        self.json_prefix = json_prefix
+        self.console_level_no = loguru_logger.level(console_level).no
+        self.queued = queued
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self.queue_size = queue_size
+        self.dropped_records = 0
+        self._unreported_drops = 0
+        self._lock = threading.Lock()
+        self._drop_lock = threading.Lock()
+        self._text_file: Optional[TextIO] = None
+        self._text_date: Optional[str] = None
+        self._json_file: Optional[TextIO] = None
+        self._json_date: Optional[str] = None
+        if queued:
+            self._start_writer()
+            if hasattr(os, "register_at_fork"):
+                # Threads do not survive fork; give worker processes their own writer
+                os.register_at_fork(after_in_child=self._start_writer)
+
+    def _start_writer(self) -> None:
+        """Create a fresh queue and writer thread."""
+        # Items are records, threading.Event flush markers, or None to stop
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=self.queue_size)
+        self._stopped = threading.Event()
+        self._writer = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._writer.start()
+
+    def __call__(self, message: Any) -> None:
+        """Called by loguru in the logging thread."""
+        if not self.queued:
+            with self._lock:
+                self._write_batch([message.record])
+            return
+        record = message.record
+        try:
+            if record["level"].no >= loguru_logger.level("WARNING").no:
+                self._queue.put(record, timeout=LOG_BLOCK_SECONDS)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped_records += 1
+                self._unreported_drops += 1
+
+    # ---------------------------- formatting ----------------------------
+
+    def format_text(self, record: Dict[str, Any]) -> str:
+        """Format a record like the original loguru file sink."""
+        line = self.TEXT_FORMAT.format(
+            time=record["time"].strftime("%Y-%m-%d %H:%M:%S"), level=record["level"].name,
+            module=record["module"], function=record["function"], line=record["line"], message=record["message"],
+        )
+        if record["exception"] is not None:
+            line += "\n" + "".join(traceback.format_exception(*record["exception"])).rstrip()
+        return line
+
+    @staticmethod
+    def to_json(record: Dict[str, Any]) -> str:
+        """
+        Serialize a record as one JSON line.
+
+        Args:
+            record (Dict[str, Any]): Loguru record.
+
+        Returns:
+            str: JSON object with the record fields and every bound context field.
+        """
+        entry: Dict[str, Any] = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "module": record["module"],
+            "function": record["function"],
+            "line": record["line"],
+            "thread": record["thread"].name,
+            "message": record["message"],
+        }
+        entry.update(record["extra"])
+        if record["exception"] is not None:
+            entry["exception"] = repr(record["exception"].value)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+    # ---------------------------- files ----------------------------
+
+    def _open_text(self, date: str) -> TextIO:
+        """Return the text log, rotating it to application.<date>.log when the day changes."""
+        if self._text_file is None and os.path.exists(self.text_path):
+            self._text_date = datetime.fromtimestamp(os.path.getmtime(self.text_path)).strftime("%Y-%m-%d")
+        if self._text_date is not None and self._text_date != date:
+            if self._text_file is not None:
+                self._text_file.close()
+                self._text_file = None
+            base, extension = os.path.splitext(self.text_path)
+            if os.path.exists(self.text_path):
+                os.replace(self.text_path, f"{base}.{self._text_date}{extension}")
+            self._delete_expired()
+        if self._text_file is None:
+            self._text_file = open(self.text_path, "a", encoding="utf-8")
+        self._text_date = date
+        return self._text_file
+
+    def _open_json(self, date: str) -> TextIO:
+        """Return the JSON-lines file for a date."""
+        if self._json_date != date:
+            if self._json_file is not None:
+                self._json_file.close()
+            self._json_file = open(os.path.join(self.directory, f"{self.json_prefix}-{date}.jsonl"), "a", encoding="utf-8")
+            self._json_date = date
+        return self._json_file
+
+    def _rotated_name_pattern(self) -> "re.Pattern[str]":
+        """Names of the files this writer rotates: application.<date>.log and application-<date>.jsonl."""
+        base, extension = os.path.splitext(os.path.basename(self.text_path))
+        date = r"\d{4}-\d{2}-\d{2}"
+        names = [rf"{re.escape(base)}\.{date}{re.escape(extension)}"]
+        if self.json_prefix is not None:
+            names.append(rf"{re.escape(self.json_prefix)}-{date}\.jsonl")
+        return re.compile("|".join(names))
+
+    def _delete_expired(self) -> None:
+        """Delete this writer's rotated text and JSON-lines files older than the retention period."""
+        cutoff = time.time() - self.retention_days * 24 * 60 * 60
+        rotated_name = self._rotated_name_pattern()
+        for entry in os.scandir(self.directory):
+            if not rotated_name.fullmatch(entry.name):
+                continue
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def _write_batch(self, records: List[Dict[str, Any]]) -> None:
+        """Format and write a batch of records, flushing each output once."""
+        by_date: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_date.setdefault(record["time"].strftime("%Y-%m-%d"), []).append(record)
+
+        for date, dated_records in by_date.items():
+            text_file = self._open_text(date)
+            text_file.write("".join(self.format_text(record) + "\n" for record in dated_records))
+            text_file.flush()
+            if self.json_prefix is not None:
+                json_file = self._open_json(date)
+                json_file.write("".join(self.to_json(record) + "\n" for record in dated_records))
+                json_file.flush()
+
+        console_lines = [self.format_text(record) for record in records if record["level"].no >= self.console_level_no]
+        if console_lines:
+            sys.stderr.write("\n".join(console_lines) + "\n")
+            sys.stderr.flush()
+
+    # ---------------------------- writer thread ----------------------------
+
+    def _report_drops(self) -> None:
+        """Log how many records were dropped because the queue was full since the last report."""
+        with self._drop_lock:
+            dropped, self._unreported_drops = self._unreported_drops, 0
+        if dropped:
+            line = (f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | WARNING  | app_logger:_run - "
+                    f"Dropped {dropped} log records (queue full, {self.dropped_records} in total)")
+            text_file = self._open_text(datetime.now().strftime("%Y-%m-%d"))
+            text_file.write(line + "\n")
+            text_file.flush()
+            sys.stderr.write(line + "\n")
+
+    def _run(self) -> None:
+        """Writer loop: block for a record, gather a batch until full, the flush interval passes or a flush is requested."""
+        while True:
+            item = self._queue.get()
+            stopping = item is None
+            flush_markers: List[threading.Event] = [item] if isinstance(item, threading.Event) else []
+            batch: List[Dict[str, Any]] = [] if stopping or flush_markers else [item]
+            deadline = time.monotonic() + self.flush_interval
+            while not stopping and not flush_markers and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    flush_markers.append(item)
+                else:
+                    batch.append(item)
+            try:
+                if batch:
+                    self._write_batch(batch)
+                self._report_drops()
+            except Exception as e:
+                sys.stderr.write(f"Log writer error: {e}\n")
+            # Everything queued before a flush marker has been written now
+            for marker in flush_markers:
+                marker.set()
+            if stopping:
+                self._stopped.set()
+                return
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every record queued so far has been written; the writer keeps running.
+
+        Args:
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            bool: True if the queue was drained in time.
+        """
+        if not self.queued or not self._writer.is_alive():
+            return True
+        marker = threading.Event()
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.wait(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Write every queued record and stop the writer thread."""
+        if self.queued and self._writer.is_alive():
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._stopped.wait(timeout)
+
+
+# Configure Loguru with enhanced format; a single sink writes the text log, the
+# JSON-lines log and the console so each record is formatted off the hot path
+log_writer = QueuedLogWriter(json_prefix=JSON_LOG_PREFIX if LOG_JSON else None)
+loguru_logger.remove()
+loguru_logger.add(log_writer, format="{message}", level="DEBUG", catch=True)
+atexit.register(log_writer.stop)
 
 class ApplicationLogger:
     """
     Enhanced logging utility class using Loguru for structured logging.
     Provides both synchronous and asynchronous logging capabilities with
     consistent formatting and error handling.
+
+    Records are handed to background writers (see LOG_QUEUED), so neither the
+    synchronous nor the asynchronous methods wait on disk. Fields bound with
+    ``context`` (request id, query, stage) are attached to every record, and
+    levels listed in LOG_SAMPLE_RATES are sampled before any formatting work.
     """
 
-    def __init__(self):
-        """Initialize the ApplicationLogger instance."""
-        pass
+    def __init__(self, sample_rates: Optional[Dict[str, float]] = None):
+        """
+        Initialize the ApplicationLogger instance.
+
+        Args:
+            sample_rates (Optional[Dict[str, float]]): Fraction of records kept per level; defaults to LOG_SAMPLE_RATES.
+        """
+        self.sample_rates: Dict[str, float] = LOG_SAMPLE_RATES if sample_rates is None else sample_rates
+
+    def _log(self, log_level: str, args: Any, kwargs: Dict[str, Any]) -> None:
+        """Sample, format and emit one record on behalf of the public method's caller."""
+        sample_rate = self.sample_rates.get(log_level, 1.0)
+        target = loguru_logger
+        if sample_rate < 1.0:
+            if random.random() >= sample_rate:
+                return
+            target = loguru_logger.bind(sample_rate=sample_rate)  # Lets log analysis re-weight sampled events
+        log_message = " ".join(map(str, args))
+        target.opt(depth=2).log(log_level, log_message, **kwargs)
+
+    @staticmethod
+    def new_request_id() -> str:
+        """Generate a short id used to correlate every record of one request."""
+        return uuid.uuid4().hex[:12]
+
+    @contextmanager
+    def context(self, **fields: Any) -> Generator[None, None, None]:
+        """
+        Attach fields such as request_id, query or stage to every record logged inside the block.
+
+        The fields live in a context variable, so they follow asyncio tasks created
+        inside the block and ``asyncio.to_thread`` calls.
+
+        Args:
+            **fields: Structured fields added to each record.
+        """
+        with loguru_logger.contextualize(**fields):
+            yield
+
+    def flush(self) -> None:
+        """Wait until every queued record is written (e.g. before exiting a worker)."""
+        log_writer.flush()
 
     def log_info(self, *args: Any, **kwargs: Any) -> None:
         """
@@ -40,9 +390,7 @@ class ApplicationLogger:
             *args: Variable positional arguments for the message
             **kwargs: Additional keyword arguments including log level
         """
-        log_level = kwargs.pop("level", "INFO")
-        log_message = " ".join(map(str, args))
-        loguru_logger.opt(depth=1).log(log_level, log_message, **kwargs)
+        self._log(kwargs.pop("level", "INFO"), args, kwargs)
 
     async def log_info_async(self, *args: Any, **kwargs: Any) -> None:
         """
@@ -52,9 +400,7 @@ class ApplicationLogger:
             *args: Variable positional arguments for the message
             **kwargs: Additional keyword arguments including log level
         """
-        log_level = kwargs.pop("level", "INFO")
-        log_message = " ".join(map(str, args))
-        loguru_logger.opt(depth=1).log(log_level, log_message, **kwargs)
+        self._log(kwargs.pop("level", "INFO"), args, kwargs)
 
     def log_error(self, *args: Any, **kwargs: Any) -> None:
         """
@@ -64,8 +410,7 @@ class ApplicationLogger:
             *args: Variable positional arguments for the error message
             **kwargs: Additional keyword arguments for logging
         """
-        error_message = " ".join(map(str, args))
-        loguru_logger.opt(depth=1).error(error_message, **kwargs)
+        self._log("ERROR", args, kwargs)
 
     async def log_error_async(self, *args: Any, **kwargs: Any) -> None:
         """
@@ -75,8 +420,7 @@ class ApplicationLogger:
             *args: Variable positional arguments for the error message
             **kwargs: Additional keyword arguments for logging
         """
-        error_message = " ".join(map(str, args))
-        loguru_logger.opt(depth=1).error(error_message, **kwargs)
+        self._log("ERROR", args, kwargs)
 
     def log_debug(self, *args: Any, **kwargs: Any) -> None:
         """
@@ -86,8 +430,7 @@ class ApplicationLogger:
             *args: Variable positional arguments for the debug message
             **kwargs: Additional keyword arguments for logging
         """
-        debug_message = " ".join(map(str, args))
-        loguru_logger.opt(depth=1).debug(debug_message, **kwargs)
+        self._log("DEBUG", args, kwargs)
 
     async def log_debug_async(self, *args: Any, **kwargs: Any) -> None:
         """
@@ -97,8 +440,7 @@ class ApplicationLogger:
             *args: Variable positional arguments for the debug message
             **kwargs: Additional keyword arguments for logging
         """
-        debug_message = " ".join(map(str, args))
-        loguru_logger.opt(depth=1).debug(debug_message, **kwargs)
+        self._log("DEBUG", args, kwargs)
 
     def log_warning(self, *args: Any, **kwargs: Any) -> None:
         """
@@ -108,8 +450,7 @@ class ApplicationLogger:
             *args: Variable positional arguments for the warning message
             **kwargs: Additional keyword arguments for logging
         """
-        warning_message = " ".join(map(str, args))
-        loguru_logger.opt(depth=1).warning(warning_message, **kwargs)
+        self._log("WARNING", args, kwargs)
 
     async def log_warning_async(self, *args: Any, **kwargs: Any) -> None:
         """
@@ -119,9 +460,8 @@ class ApplicationLogger:
             *args: Variable positional arguments for the warning message
             **kwargs: Additional keyword arguments for logging
         """
-        warning_message = " ".join(map(str, args))
-        loguru_logger.opt(depth=1).warning(warning_message, **kwargs)
+        self._log("WARNING", args, kwargs)
 
 
 # Create global logger instance
-application_logger = ApplicationLogger()
\ No newline at end of file
+application_logger = ApplicationLogger()
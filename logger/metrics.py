@@ -0,0 +1,367 @@
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+from logger.app_logger import LOG_DIRECTORY, application_logger
+
+# Prometheus text exposition file rewritten after every traced request; empty disables it
+METRICS_FILE = os.getenv("METRICS_FILE", os.path.join(LOG_DIRECTORY, "metrics.prom"))
+# Port for an optional /metrics HTTP endpoint; 0 disables it
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_PREFIX = "intellisearch"
+STAGE_HISTOGRAM = "stage_seconds"
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Canonical, hashable form of a label set."""
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(label_key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set as {name="value",...}."""
+    pairs = list(label_key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in pairs) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape backslashes, quotes and newlines as the exposition format requires."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Thread-safe, in-process counters and histograms.
+
+    Rendered in the Prometheus text exposition format by ``render``.
+    """
+
+    def __init__(self, prefix: str = METRICS_PREFIX, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """
+        Initialize an empty registry.
+
+        Args:
+            prefix (str): Prefix added to every metric name.
+            buckets (Tuple[float, ...]): Histogram bucket upper bounds in seconds.
+        """
+        self.prefix = prefix
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        # name -> labels -> [bucket counts..., sum, count]
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+
+    def increment(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name (str): Counter name without prefix, e.g. "page_cache_total".
+            value (float): Amount to add.
+            **labels: Label values.
+        """
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Record a histogram observation.
+
+        Args:
+            name (str): Histogram name without prefix, e.g. "stage_seconds".
+            value (float): Observed value.
+            **labels: Label values.
+        """
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+            state[-2] += value
+            state[-1] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Counter values and histogram sums/counts keyed by metric and rendered labels."""
+        with self._lock:
+            return {
+                "counters": {name: {_format_labels(key): value for key, value in series.items()}
+                             for name, series in self._counters.items()},
+                "histograms": {name: {_format_labels(key): {"sum": state[-2], "count": state[-1]}
+                                      for key, state in series.items()}
+                               for name, series in self._histograms.items()},
+            }
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text.
+        """
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {full_name} counter")
+                lines.extend(f"{full_name}{_format_labels(key)} {value:g}" for key, value in sorted(series.items()))
+            for name, series in sorted(self._histograms.items()):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {full_name} histogram")
+                for key, state in sorted(series.items()):
+                    for bound, bucket_count in zip(self.buckets, state):
+                        lines.append(f"{full_name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {bucket_count:g}")
+                    lines.append(f"{full_name}_bucket{_format_labels(key, ('le', '+Inf'))} {state[-1]:g}")
+                    lines.append(f"{full_name}_sum{_format_labels(key)} {state[-2]:.6f}")
+                    lines.append(f"{full_name}_count{_format_labels(key)} {state[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str = METRICS_FILE) -> None:
+        """
+        Atomically write the exposition text to a file (e.g. for node_exporter's textfile collector).
+
+        Args:
+            path (str): Destination file.
+        """
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as metrics_file:
+            metrics_file.write(self.render())
+        os.replace(temporary_path, path)
+
+
+# Shared registry for the whole process
+metrics = MetricsRegistry()
+
+
+# ============================ REQUEST TRACES ============================
+
+@dataclass
+class Span:
+    """One timed stage within a request."""
+
+    stage: str
+    start: float
+    duration: float
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class RequestTrace:
+    """Every span recorded while one request was being answered."""
+
+    request_id: str
+    query: str
+    started_at: float = field(default_factory=time.perf_counter)
+    spans: List[Span] = field(default_factory=list)
+    total: Optional[float] = None
+
+    def add(self, stage: str, start: float, duration: float, attributes: Dict[str, Any]) -> None:
+        """Append a span; ``start`` is a perf_counter timestamp."""
+        self.spans.append(Span(stage, start - self.started_at, duration, attributes))
+
+    def stage_totals(self) -> Dict[str, Dict[str, float]]:
+        """
+        Aggregate spans per stage.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Stage -> count, total and max seconds.
+        """
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(span.stage, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+            entry["count"] += 1
+            entry["total_s"] += span.duration
+            entry["max_s"] = max(entry["max_s"], span.duration)
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable trace summary."""
+        return {
+            "request_id": self.request_id,
+            "total_s": round(self.total or 0.0, 4),
+            "stages": {stage: {name: round(value, 4) for name, value in entry.items()}
+                       for stage, entry in self.stage_totals().items()},
+            "spans": [{"stage": span.stage, "start_s": round(span.start, 4), "duration_s": round(span.duration, 4),
+                       **span.attributes} for span in self.spans],
+        }
+
+
+_current_trace: contextvars.ContextVar[Optional[RequestTrace]] = contextvars.ContextVar("request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    """The trace of the request being handled in this context, if any."""
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_request(query: str, request_id: Optional[str] = None) -> Generator[RequestTrace, None, None]:
+    """
+    Collect a per-request trace and tag every log record with the request id and query.
+
+    Spans from asyncio tasks and ``asyncio.to_thread`` calls started inside the block
+    are added to the same trace. On exit the trace is logged, the request is counted
+    and the metrics file is refreshed.
+
+    Args:
+        query (str): The user's query.
+        request_id (Optional[str]): Request id; a new one is generated if omitted.
+
+    Returns:
+        Generator[RequestTrace, None, None]: The trace being collected.
+    """
+    trace = RequestTrace(request_id or application_logger.new_request_id(), query)
+    token = _current_trace.set(trace)
+    status = "ok"
+    try:
+        with application_logger.context(request_id=trace.request_id, query=query):
+            yield trace
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        _current_trace.reset(token)
+        trace.total = time.perf_counter() - trace.started_at
+        metrics.observe(STAGE_HISTOGRAM, trace.total, stage="request")
+        metrics.increment("requests_total", status=status)
+        with application_logger.context(request_id=trace.request_id, query=query, trace=trace.to_dict()):
+            application_logger.log_info(f"Request finished in {trace.total:.2f}s", level="INFO")
+        if METRICS_FILE:
+            try:
+                metrics.write(METRICS_FILE)
+            except OSError as e:
+                application_logger.log_warning(f"Could not write metrics file: {e}")
+
+
+class timed:
+    """
+    Time a stage, as a context manager or a decorator for sync and async functions.
+
+    Each run is observed in the ``stage_seconds`` histogram and, inside
+    ``trace_request``, added to the current trace:
+
+        with timed("article_fetch", url=url) as timer:
+            ...
+            timer.attributes["cache"] = "hit"
+
+        @timed("llm")
+        async def generate(...): ...
+    """
+
+    def __init__(self, stage: str, **attributes: Any) -> None:
+        """
+        Initialize the timer.
+
+        Args:
+            stage (str): Stage name, used as the histogram label.
+            **attributes: Extra span attributes (not used as metric labels).
+        """
+        self.stage = stage
+        self.attributes: Dict[str, Any] = dict(attributes)
+        self._start = 0.0
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc_value: Any, exc_traceback: Any) -> None:
+        duration = time.perf_counter() - self._start
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        record_stage(self.stage, self._start, duration, self.attributes)
+
+    def __call__(self, function: Callable) -> Callable:
+        stage, attributes = self.stage, self.attributes
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with timed(stage, **attributes):
+                    return await function(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(stage, **attributes):
+                return function(*args, **kwargs)
+        return wrapper
+
+
+def record_stage(stage: str, start: float, duration: float, attributes: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Record a stage measured elsewhere (e.g. time to first token).
+
+    Args:
+        stage (str): Stage name.
+        start (float): perf_counter timestamp at which the stage started.
+        duration (float): Seconds spent in the stage.
+        attributes (Optional[Dict[str, Any]]): Extra span attributes.
+    """
+    metrics.observe(STAGE_HISTOGRAM, duration, stage=stage)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(stage, start, duration, dict(attributes or {}))
+
+
+# ============================ HTTP ENDPOINT ============================
+
+_metrics_server: Optional[Any] = None
+_metrics_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = "127.0.0.1") -> Optional[Any]:
+    """
+    Serve /metrics on a background thread; safe to call more than once.
+
+    Args:
+        port (int): Port to listen on; 0 disables the endpoint.
+        host (str): Interface to bind.
+
+    Returns:
+        Optional[ThreadingHTTPServer]: The running server, or None if disabled or the port is taken.
+    """
+    global _metrics_server
+    if not port:
+        return None
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Serves the registry at /metrics."""
+
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # Scrapes would otherwise flood stderr
+
+    with _metrics_server_lock:
+        if _metrics_server is None:
+            try:
+                _metrics_server = ThreadingHTTPServer((host, port), MetricsHandler)
+            except OSError as e:
+                application_logger.log_warning(f"Metrics endpoint not started on port {port}: {e}")
+                return None
+            threading.Thread(target=_metrics_server.serve_forever, name="metrics-http", daemon=True).start()
+            application_logger.log_info(f"Metrics endpoint listening on http://{host}:{port}/metrics", level="INFO")
+        return _metrics_server
@@ -0,0 +1,161 @@
+import os
+import socket
+import threading
+from typing import Any, Dict, List, Optional
+import numpy as np
+from model_server.protocol import decode_array, parse_address, recv_message, send_message
+
+# Set to e.g. "tcp:127.0.0.1:7878" or "unix:/tmp/intellisearch-models.sock" to use a shared model server
+MODEL_SERVER_ADDRESS = os.getenv("MODEL_SERVER_ADDRESS", "")
+MODEL_SERVER_TIMEOUT = float(os.getenv("MODEL_SERVER_TIMEOUT", "120"))
+
+
+class ModelServerError(Exception):
+    """Raised when the model server rejects a request."""
+
+
+class ModelClient:
+    """
+    Client for the shared model server.
+
+    Each thread keeps one persistent connection, so concurrent callers never interleave
+    messages on a socket; a dropped connection is re-established once per request.
+    """
+
+    def __init__(self, address: str, timeout: float = MODEL_SERVER_TIMEOUT) -> None:
+        """
+        Initialize the client; connections are opened lazily.
+
+        Args:
+            address (str): "unix:<path>" or "tcp:<host>:<port>".
+            timeout (float): Socket timeout in seconds.
+        """
+        self.address = address
+        self.timeout = timeout
+        self._family, self._socket_address = parse_address(address)
+        self._local = threading.local()
+
+    def _connect(self) -> socket.socket:
+        """Open a new connection for the current thread."""
+        sock = socket.socket(self._family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self._socket_address)
+        if self._family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._local.sock = sock
+        return sock
+
+    def _close(self) -> None:
+        """Drop the current thread's connection."""
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            finally:
+                self._local.sock = None
+
+    def request(self, operation: str, inputs: Optional[List[Any]] = None) -> Any:
+        """
+        Send one request and wait for its reply.
+
+        Args:
+            operation (str): Model name or "stats".
+            inputs (Optional[List[Any]]): Model inputs.
+
+        Returns:
+            Any: The reply outputs.
+
+        Raises:
+            ModelServerError: If the server reports an error.
+            OSError: If the server cannot be reached.
+        """
+        message = {"op": operation, "inputs": inputs or []}
+        for attempt in range(2):
+            sock = getattr(self._local, "sock", None) or self._connect()
+            try:
+                send_message(sock, message)
+                response = recv_message(sock)
+                break
+            except (ConnectionError, OSError):
+                self._close()
+                if attempt:
+                    raise
+        if not response.get("ok"):
+            raise ModelServerError(response.get("error", "Unknown model server error"))
+        return response["outputs"]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Sentence embeddings from the similarity model."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return decode_array(self.request("similarity", texts))
+
+    def classify(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Fact-check classifier outputs, one {"label", "score"} dict per text."""
+        return self.request("classifier", texts) if texts else []
+
+    def sentiment(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Sentiment classifier outputs, one {"label", "score"} dict per text."""
+        return self.request("sentiment", texts) if texts else []
+
+    def credibility(self, article_titles: List[str]) -> List[str]:
+        """Credibility ratings, one per title."""
+        return self.request("credibility", article_titles) if article_titles else []
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and batch size statistics for each loaded model."""
+        return self.request("stats")
+
+
+class RemoteSentenceEncoder:
+    """Drop-in replacement for SentenceTransformer that encodes on the model server."""
+
+    def __init__(self, client: ModelClient) -> None:
+        self.client = client
+        self._dimension: Optional[int] = None
+
+    def encode(self, texts: Any, batch_size: int = 32, convert_to_numpy: bool = True, **kwargs: Any) -> np.ndarray:
+        """Encode a text or list of texts; batching is done by the server."""
+        single = isinstance(texts, str)
+        vectors = self.client.encode([texts] if single else list(texts))
+        return vectors[0] if single else vectors
+
+    def get_sentence_embedding_dimension(self) -> int:
+        """Embedding size, probed once from the server."""
+        if self._dimension is None:
+            self._dimension = int(self.client.encode(["dimension probe"]).shape[1])
+        return self._dimension
+
+
+class RemoteTextClassifier:
+    """Drop-in replacement for a text-classification pipeline served by the model server."""
+
+    def __init__(self, client: ModelClient, operation: str) -> None:
+        self.client = client
+        self.operation = operation
+
+    def __call__(self, texts: Any, batch_size: Optional[int] = None, **kwargs: Any) -> Any:
+        """Classify a text or list of texts; returns pipeline-shaped outputs."""
+        single = isinstance(texts, str)
+        outputs = self.client.request(self.operation, [texts] if single else list(texts))
+        return outputs if not single else outputs[:1]
+
+
+_client: Optional[ModelClient] = None
+_client_lock = threading.Lock()
+
+
+def get_model_client() -> Optional[ModelClient]:
+    """
+    Shared client for the configured model server.
+
+    Returns:
+        Optional[ModelClient]: None if MODEL_SERVER_ADDRESS is not set, so callers load models in-process.
+    """
+    global _client
+    if not MODEL_SERVER_ADDRESS:
+        return None
+    with _client_lock:
+        if _client is None:
+            _client = ModelClient(MODEL_SERVER_ADDRESS)
+        return _client
@@ -0,0 +1,238 @@
+"""
+Export the credibility and classifier models to ONNX, quantize them to int8 and
+check that the exported models agree with the originals.
+
+Usage:
+    python -m model_server.export_onnx                 # export, quantize and verify all models
+    python -m model_server.export_onnx --verify-only   # re-run the agreement check
+
+Then run the app, batch runner or model server with INFERENCE_BACKEND=onnx.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from model_server.models import CLASSIFIER_MODEL_NAME, SENTIMENT_MODEL_NAME
+from model_server.onnx_runtime import (CREDIBILITY_EXPORT_NAME, FULL_PRECISION_FILENAME, METADATA_FILENAME,
+                                       QUANTIZED_FILENAME, OnnxCredibilityModel, OnnxTextClassifier,
+                                       create_session, export_directory)
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "deliverable2", "sample.csv")
+ONNX_OPSET = 17
+
+
+def quantize(model_path: str) -> str:
+    """
+    Write an int8 dynamically quantized copy of an ONNX model next to it.
+
+    Args:
+        model_path (str): Full-precision ONNX file.
+
+    Returns:
+        str: Path to the quantized file.
+    """
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantized_path = os.path.join(os.path.dirname(model_path), QUANTIZED_FILENAME)
+    quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+def load_keras_credibility_model() -> Any:
+    """Load the original Keras credibility model and tokenizer, bypassing the ONNX path."""
+    from helper import CredibilityModelRegistry
+
+    return CredibilityModelRegistry(backend="framework").get()
+
+
+def export_credibility_model() -> str:
+    """
+    Export the Keras credibility model to ONNX.
+
+    Returns:
+        str: Path to the full-precision ONNX file.
+    """
+    model, _ = load_keras_credibility_model()
+    directory = export_directory(CREDIBILITY_EXPORT_NAME)
+    os.makedirs(directory, exist_ok=True)
+    model_path = os.path.join(directory, FULL_PRECISION_FILENAME)
+
+    try:
+        model.export(model_path, format="onnx")
+    except (TypeError, ValueError, NotImplementedError, ImportError) as e:
+        # On the TensorFlow backend Keras converts through tf2onnx. It is an export-time tool only
+        # and is not pinned in requirements.txt: its releases pin protobuf 3.x, which conflicts
+        # with the protobuf the app's pinned TensorFlow and onnx use
+        raise RuntimeError(
+            "Keras could not export the credibility model to ONNX. With the TensorFlow backend "
+            "this needs tf2onnx, which requirements.txt does not install: run `pip install tf2onnx` "
+            f"in a separate export environment. Original error: {e}"
+        ) from e
+
+    # Keras and ONNX input names may differ; both keep the model's input order
+    onnx_names = [node.name for node in create_session(model_path).get_inputs()]
+    metadata = {
+        "max_length": int(model.input_shape[0][1]),
+        "input_names": {tensor.name: onnx_name for tensor, onnx_name in zip(model.inputs, onnx_names)},
+    }
+    with open(os.path.join(directory, METADATA_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    return model_path
+
+
+def export_text_classifier(model_name: str) -> str:
+    """
+    Export a Hugging Face sequence classifier to ONNX with its tokenizer and config.
+
+    Args:
+        model_name (str): Hub model id.
+
+    Returns:
+        str: Path to the full-precision ONNX file.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    directory = export_directory(model_name)
+    os.makedirs(directory, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    tokenizer.save_pretrained(directory)
+    model.config.save_pretrained(directory)
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    input_names = list(sample.keys())
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["logits"] = {0: "batch"}
+    model_path = os.path.join(directory, FULL_PRECISION_FILENAME)
+    with torch.no_grad():
+        torch.onnx.export(model, tuple(sample[name] for name in input_names), model_path,
+                          input_names=input_names, output_names=["logits"], dynamic_axes=dynamic_axes,
+                          opset_version=ONNX_OPSET)
+    return model_path
+
+
+def read_sample_texts(path: str = SAMPLE_PATH) -> List[str]:
+    """Prompts from sample.csv, used as verification inputs."""
+    with open(path, newline="", encoding="utf-8") as f:
+        return [row["user_prompt"] for row in csv.DictReader(f)]
+
+
+def _timed(function: Callable[[], Any]) -> Any:
+    """Run a function and return (result, seconds)."""
+    start_time = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start_time
+
+
+def verify_credibility(texts: List[str], quantized: bool) -> Dict[str, Any]:
+    """
+    Compare credibility ratings of the Keras model and its ONNX export.
+
+    Args:
+        texts (List[str]): Titles to rate.
+        quantized (bool): Check the int8 export instead of the full-precision one.
+
+    Returns:
+        Dict[str, Any]: Agreement rate and timings.
+    """
+    from keras.utils import pad_sequences
+
+    model, tokenizer = load_keras_credibility_model()
+    onnx_model = OnnxCredibilityModel(os.path.join(
+        export_directory(CREDIBILITY_EXPORT_NAME), QUANTIZED_FILENAME if quantized else FULL_PRECISION_FILENAME
+    ))
+    inputs = {
+        "text_input": pad_sequences(tokenizer.texts_to_sequences(texts), maxlen=onnx_model.max_length, padding="post"),
+        "func_rating_input": np.full((len(texts), 1), 5),
+    }
+    expected, framework_seconds = _timed(lambda: model.predict(inputs, batch_size=len(texts), verbose=0))
+    actual, onnx_seconds = _timed(lambda: onnx_model.predict(inputs))
+    return {
+        "agreement": float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1))),
+        "max_abs_diff": float(np.max(np.abs(expected - actual))),
+        "framework_s": round(framework_seconds, 4),
+        "onnx_s": round(onnx_seconds, 4),
+    }
+
+
+def verify_text_classifier(model_name: str, texts: List[str], quantized: bool) -> Dict[str, Any]:
+    """
+    Compare labels of a Hugging Face pipeline and its ONNX export.
+
+    Args:
+        model_name (str): Hub model id.
+        texts (List[str]): Texts to classify.
+        quantized (bool): Check the int8 export instead of the full-precision one.
+
+    Returns:
+        Dict[str, Any]: Agreement rate and timings.
+    """
+    from transformers import pipeline
+
+    classifier = pipeline("text-classification", model=model_name)
+    onnx_classifier = OnnxTextClassifier(os.path.join(
+        export_directory(model_name), QUANTIZED_FILENAME if quantized else FULL_PRECISION_FILENAME
+    ))
+    expected, framework_seconds = _timed(lambda: classifier(texts, batch_size=16, truncation=True))
+    actual, onnx_seconds = _timed(lambda: onnx_classifier(texts, batch_size=16))
+    return {
+        "agreement": float(np.mean([e["label"] == a["label"] for e, a in zip(expected, actual)])),
+        "max_abs_diff": float(max(abs(e["score"] - a["score"]) for e, a in zip(expected, actual))),
+        "framework_s": round(framework_seconds, 4),
+        "onnx_s": round(onnx_seconds, 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export models to ONNX and verify rating agreement")
+    parser.add_argument("--models", default="credibility,classifier,sentiment",
+                        help="comma-separated subset of credibility, classifier, sentiment")
+    parser.add_argument("--verify-only", action="store_true", help="skip export and only compare outputs")
+    parser.add_argument("--sample", default=SAMPLE_PATH, help="CSV with a user_prompt column used for verification")
+    args = parser.parse_args()
+
+    selected = {name.strip() for name in args.models.split(",")}
+    classifiers = {"classifier": CLASSIFIER_MODEL_NAME, "sentiment": SENTIMENT_MODEL_NAME}
+    exporters: Dict[str, Callable[[], str]] = {"credibility": export_credibility_model}
+    verifiers: Dict[str, Callable[[List[str], bool], Dict[str, Any]]] = {"credibility": verify_credibility}
+    for name, model_name in classifiers.items():
+        exporters[name] = lambda model_name=model_name: export_text_classifier(model_name)
+        verifiers[name] = lambda texts, quantized, model_name=model_name: verify_text_classifier(
+            model_name, texts, quantized)
+    names = [name for name in exporters if name in selected]
+
+    # One model failing to export or verify should not stop the others
+    failures: Dict[str, str] = {}
+    if not args.verify_only:
+        for name in names:
+            try:
+                print(f"{name} -> {quantize(exporters[name]())}")
+            except Exception as e:
+                failures[name] = f"export failed: {e}"
+                print(f"{name}: export failed: {e}", file=sys.stderr)
+
+    texts = read_sample_texts(args.sample)
+    for quantized in (False, True):
+        variant = "int8" if quantized else "fp32"
+        for name in names:
+            if name in failures:
+                continue
+            try:
+                print(f"{name} [{variant}]: {verifiers[name](texts, quantized)}")
+            except Exception as e:
+                failures[name] = f"{variant} verification failed: {e}"
+                print(f"{name} [{variant}]: verification failed: {e}", file=sys.stderr)
+
+    if failures:
+        print(f"Failed models: {', '.join(failures)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
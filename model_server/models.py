@@ -0,0 +1,36 @@
+from typing import Any
+from logger.app_logger import application_logger
+from model_server.onnx_runtime import OnnxTextClassifier, find_exported_model, use_onnx
+
+# Models used for URL validation and article credibility
+SIMILARITY_MODEL_NAME = "sentence-transformers/paraphrase-MiniLM-L6-v2"
+CLASSIFIER_MODEL_NAME = "distilbert/distilbert-base-uncased-finetuned-sst-2-english"
+SENTIMENT_MODEL_NAME = "nlptown/bert-base-multilingual-uncased-sentiment"
+
+
+def load_similarity_model() -> Any:
+    """Load the SentenceTransformer used for query/content similarity."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(SIMILARITY_MODEL_NAME)
+
+
+def load_text_classifier(model_name: str) -> Any:
+    """
+    Load a Hugging Face text-classification pipeline, or its ONNX export when INFERENCE_BACKEND=onnx.
+
+    Args:
+        model_name (str): Hub model id.
+
+    Returns:
+        Any: The pipeline or an OnnxTextClassifier with the same call interface.
+    """
+    if use_onnx():
+        onnx_path = find_exported_model(model_name)
+        if onnx_path is not None:
+            return OnnxTextClassifier(onnx_path)
+        application_logger.log_warning(f"INFERENCE_BACKEND=onnx but {model_name} has not been exported; using PyTorch")
+
+    from transformers import pipeline
+
+    return pipeline("text-classification", model=model_name)
@@ -0,0 +1,190 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+# "framework" runs the original Keras / PyTorch models; "onnx" runs exported models with ONNX Runtime
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "framework").lower()
+ONNX_MODEL_DIRECTORY = os.getenv(
+    "ONNX_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "onnx"),
+)
+# Prefer the int8 dynamically quantized export when it exists
+ONNX_QUANTIZED = os.getenv("ONNX_QUANTIZED", "1") == "1"
+# 0 lets ONNX Runtime pick one thread per physical core
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+
+CREDIBILITY_EXPORT_NAME = "credibility"
+FULL_PRECISION_FILENAME = "model.onnx"
+QUANTIZED_FILENAME = "model.int8.onnx"
+METADATA_FILENAME = "meta.json"
+
+_ONNX_TO_NUMPY = {
+    "tensor(float)": np.float32,
+    "tensor(double)": np.float64,
+    "tensor(int32)": np.int32,
+    "tensor(int64)": np.int64,
+    "tensor(bool)": np.bool_,
+}
+
+
+def use_onnx() -> bool:
+    """Check whether the ONNX inference path is enabled."""
+    return INFERENCE_BACKEND == "onnx"
+
+
+def export_directory(model_name: str) -> str:
+    """
+    Directory holding the ONNX export of a model.
+
+    Args:
+        model_name (str): Hub model id or CREDIBILITY_EXPORT_NAME.
+
+    Returns:
+        str: Export directory path.
+    """
+    return os.path.join(ONNX_MODEL_DIRECTORY, model_name.replace("/", "__"))
+
+
+def find_exported_model(model_name: str, quantized: bool = ONNX_QUANTIZED) -> Optional[str]:
+    """
+    Locate an exported ONNX file for a model.
+
+    Args:
+        model_name (str): Hub model id or CREDIBILITY_EXPORT_NAME.
+        quantized (bool): Prefer the int8 file if present.
+
+    Returns:
+        Optional[str]: Path to the ONNX file, or None if the model has not been exported.
+    """
+    directory = export_directory(model_name)
+    candidates = [QUANTIZED_FILENAME, FULL_PRECISION_FILENAME] if quantized else [FULL_PRECISION_FILENAME]
+    for filename in candidates:
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def create_session(model_path: str, intra_op_threads: int = ONNX_INTRA_OP_THREADS) -> Any:
+    """
+    Create a CPU ONNX Runtime session.
+
+    Args:
+        model_path (str): Path to the ONNX file.
+        intra_op_threads (int): Threads used inside one operator; 0 for the runtime default.
+
+    Returns:
+        Any: An ``onnxruntime.InferenceSession``.
+    """
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads
+    options.inter_op_num_threads = 1
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return onnxruntime.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    """Row-wise softmax."""
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+class OnnxCredibilityModel:
+    """
+    ONNX Runtime replacement for the Keras credibility model.
+
+    Exposes the subset of the Keras API used by the credibility registry:
+    ``predict(inputs, batch_size, verbose)`` and ``input_shape``.
+    """
+
+    def __init__(self, model_path: str) -> None:
+        """
+        Load the exported model and its metadata.
+
+        Args:
+            model_path (str): Path to model.onnx or model.int8.onnx.
+        """
+        self.model_path = model_path
+        self.session = create_session(model_path)
+        with open(os.path.join(os.path.dirname(model_path), METADATA_FILENAME), "r", encoding="utf-8") as f:
+            metadata: Dict[str, Any] = json.load(f)
+        self.max_length: int = metadata["max_length"]
+        # Maps Keras input names to ONNX graph input names
+        self.input_names: Dict[str, str] = metadata["input_names"]
+        self._input_types = {node.name: _ONNX_TO_NUMPY.get(node.type, np.float32) for node in self.session.get_inputs()}
+
+    @property
+    def input_shape(self) -> List[Tuple[Optional[int], int]]:
+        """Keras-style input shapes: text input first, rating input second."""
+        return [(None, self.max_length), (None, 1)]
+
+    def predict(self, inputs: Dict[str, np.ndarray], batch_size: Optional[int] = None, verbose: int = 0) -> np.ndarray:
+        """
+        Run the model.
+
+        Args:
+            inputs (Dict[str, np.ndarray]): Keras input name to array, as passed to ``keras.Model.predict``.
+            batch_size (Optional[int]): Ignored; the whole input is one batch.
+            verbose (int): Ignored.
+
+        Returns:
+            np.ndarray: Class probabilities, one row per input.
+        """
+        feed = {}
+        for keras_name, array in inputs.items():
+            onnx_name = self.input_names.get(keras_name, keras_name)
+            feed[onnx_name] = np.asarray(array, dtype=self._input_types[onnx_name])
+        return self.session.run(None, feed)[0]
+
+
+class OnnxTextClassifier:
+    """
+    ONNX Runtime replacement for a Hugging Face text-classification pipeline.
+
+    Called like the pipeline, returning one ``{"label", "score"}`` dict per text.
+    """
+
+    def __init__(self, model_path: str, max_length: int = 512) -> None:
+        """
+        Load the exported model with the tokenizer and label map saved next to it.
+
+        Args:
+            model_path (str): Path to model.onnx or model.int8.onnx.
+            max_length (int): Token limit applied when tokenizing.
+        """
+        from transformers import AutoConfig, AutoTokenizer
+
+        directory = os.path.dirname(model_path)
+        self.model_path = model_path
+        self.max_length = max_length
+        self.session = create_session(model_path)
+        self.tokenizer = AutoTokenizer.from_pretrained(directory)
+        self.id2label: Dict[int, str] = AutoConfig.from_pretrained(directory).id2label
+        self._input_names = {node.name for node in self.session.get_inputs()}
+
+    def __call__(self, texts: Any, batch_size: Optional[int] = None, **kwargs: Any) -> List[Dict[str, Any]]:
+        """
+        Classify a text or list of texts.
+
+        Args:
+            texts (Any): A string or list of strings.
+            batch_size (Optional[int]): Texts per session run; all at once if None.
+
+        Returns:
+            List[Dict[str, Any]]: Top label and its probability for each text.
+        """
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        batch_size = batch_size or max(len(texts), 1)
+        outputs: List[Dict[str, Any]] = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                                     max_length=self.max_length, return_tensors="np")
+            feed = {name: np.asarray(value, dtype=np.int64) for name, value in encoded.items() if name in self._input_names}
+            probabilities = _softmax(self.session.run(None, feed)[0])
+            for row in probabilities:
+                label_id = int(np.argmax(row))
+                outputs.append({"label": self.id2label[label_id], "score": float(row[label_id])})
+        return outputs
@@ -0,0 +1,79 @@
+import base64
+import json
+import socket
+import struct
+from typing import Any, Dict, Tuple, Union
+import numpy as np
+
+# Default address of the shared model server; "unix:<path>" or "tcp:<host>:<port>"
+DEFAULT_ADDRESS = "tcp:127.0.0.1:7878"
+
+_HEADER = struct.Struct("!I")
+
+
+def parse_address(address: str) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    """
+    Parse a model server address.
+
+    Args:
+        address (str): "unix:/path/to.sock" or "tcp:host:port".
+
+    Returns:
+        Tuple[int, Union[str, Tuple[str, int]]]: Socket family and socket address.
+    """
+    scheme, _, location = address.partition(":")
+    if scheme == "unix":
+        return socket.AF_UNIX, location
+    if scheme == "tcp":
+        host, _, port = location.rpartition(":")
+        return socket.AF_INET, (host or "127.0.0.1", int(port))
+    raise ValueError(f"Unsupported model server address: {address}")
+
+
+def send_message(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """
+    Send a length-prefixed JSON message.
+
+    Args:
+        sock (socket.socket): Connected socket.
+        message (Dict[str, Any]): JSON-serializable message.
+    """
+    payload = json.dumps(message).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """Read exactly ``size`` bytes or raise ConnectionError if the peer closes."""
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Dict[str, Any]:
+    """
+    Receive a length-prefixed JSON message.
+
+    Args:
+        sock (socket.socket): Connected socket.
+
+    Returns:
+        Dict[str, Any]: The decoded message.
+    """
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    return json.loads(_recv_exactly(sock, size).decode("utf-8"))
+
+
+def encode_array(array: np.ndarray) -> Dict[str, Any]:
+    """Serialize a float32 array compactly for transport."""
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    return {"shape": list(array.shape), "data": base64.b64encode(array.tobytes()).decode("ascii")}
+
+
+def decode_array(payload: Dict[str, Any]) -> np.ndarray:
+    """Deserialize an array produced by encode_array."""
+    return np.frombuffer(base64.b64decode(payload["data"]), dtype=np.float32).reshape(payload["shape"])
@@ -0,0 +1,263 @@
+"""
+Shared model host.
+
+Run one instance per machine and point every app worker at it with MODEL_SERVER_ADDRESS:
+
+    python -m model_server.server --address tcp:127.0.0.1:7878
+
+Requests from all connected workers are queued per model and executed as shared batches,
+so memory scales with the number of models instead of the number of sessions.
+"""
+import argparse
+import concurrent.futures
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from logger.app_logger import application_logger
+from model_server.models import CLASSIFIER_MODEL_NAME, SENTIMENT_MODEL_NAME, load_similarity_model, load_text_classifier
+from model_server.protocol import DEFAULT_ADDRESS, encode_array, parse_address, recv_message, send_message
+
+AVAILABLE_MODELS = ("similarity", "classifier", "sentiment", "credibility")
+
+
+class BatchingWorker:
+    """
+    Queue in front of one model that merges requests from all connections into shared batches.
+
+    Tracks queue depth and batch size statistics for the ``stats`` operation.
+    """
+
+    def __init__(self, name: str, run_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0) -> None:
+        """
+        Initialize the worker and start its thread.
+
+        Args:
+            name (str): Model name used in logs and stats.
+            run_batch (Callable[[List[Any]], List[Any]]): Runs the model on a list of inputs, one output per input.
+            max_batch_size (int): Maximum inputs per model call.
+            max_wait_ms (float): Maximum time to wait for a batch to fill up.
+        """
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue: "queue.Queue[Tuple[Any, concurrent.futures.Future]]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._max_batch = 0
+        self._busy_seconds = 0.0
+        threading.Thread(target=self._run, name=f"model-{name}", daemon=True).start()
+
+    def submit(self, inputs: List[Any]) -> List[concurrent.futures.Future]:
+        """
+        Queue inputs for the model.
+
+        Args:
+            inputs (List[Any]): Model inputs.
+
+        Returns:
+            List[concurrent.futures.Future]: One future per input.
+        """
+        futures = []
+        for item in inputs:
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            self._queue.put((item, future))
+            futures.append(future)
+        return futures
+
+    def _collect_batch(self) -> List[Tuple[Any, concurrent.futures.Future]]:
+        """Block for the first request, then gather more until the batch is full or the wait expires."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Worker loop: collect a batch, run the model once, resolve every waiting future."""
+        while True:
+            batch = self._collect_batch()
+            start_time = time.perf_counter()
+            try:
+                outputs = self.run_batch([item for item, _ in batch])
+                if len(outputs) != len(batch):
+                    raise ValueError(f"Model {self.name} returned {len(outputs)} outputs for {len(batch)} inputs")
+                for (_, future), output in zip(batch, outputs):
+                    future.set_result(output)
+            except Exception as e:
+                application_logger.log_error(f"Model {self.name} failed on a batch of {len(batch)}: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            with self._stats_lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._max_batch = max(self._max_batch, len(batch))
+                self._busy_seconds += time.perf_counter() - start_time
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and batch size statistics."""
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "batches": self._batches,
+                "items": self._items,
+                "mean_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "max_batch_size": self._max_batch,
+                "busy_seconds": round(self._busy_seconds, 3),
+            }
+
+
+def _labels(outputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert pipeline outputs to plain JSON-serializable dicts."""
+    return [{"label": output["label"], "score": float(output["score"])} for output in outputs]
+
+
+def build_workers(model_names: List[str]) -> Dict[str, BatchingWorker]:
+    """
+    Load the requested models and wrap each in a BatchingWorker.
+
+    Args:
+        model_names (List[str]): Subset of AVAILABLE_MODELS.
+
+    Returns:
+        Dict[str, BatchingWorker]: Workers keyed by model name.
+    """
+    workers: Dict[str, BatchingWorker] = {}
+    if "similarity" in model_names:
+        similarity_model = load_similarity_model()
+        workers["similarity"] = BatchingWorker(
+            "similarity", lambda texts: list(similarity_model.encode(texts, batch_size=32, convert_to_numpy=True))
+        )
+    if "classifier" in model_names:
+        classifier = load_text_classifier(CLASSIFIER_MODEL_NAME)
+        workers["classifier"] = BatchingWorker("classifier", lambda texts: _labels(classifier(texts, batch_size=16)), max_batch_size=32)
+    if "sentiment" in model_names:
+        sentiment_analyzer = load_text_classifier(SENTIMENT_MODEL_NAME)
+        workers["sentiment"] = BatchingWorker("sentiment", lambda texts: _labels(sentiment_analyzer(texts, batch_size=16)), max_batch_size=32)
+    if "credibility" in model_names:
+        from helper import predict_credibility
+
+        workers["credibility"] = BatchingWorker("credibility", predict_credibility)
+    application_logger.log_info(f"Model server loaded: {', '.join(workers)}", level="INFO")
+    return workers
+
+
+class ModelRequestHandler(socketserver.BaseRequestHandler):
+    """Serves length-prefixed JSON requests on one persistent client connection."""
+
+    def handle(self) -> None:
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+            try:
+                response = {"ok": True, "outputs": self.server.dispatch(request)}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            try:
+                send_message(self.request, response)
+            except OSError:
+                return
+
+
+class ModelServerMixin:
+    """Request dispatch shared by the TCP and Unix socket servers."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+    workers: Dict[str, BatchingWorker] = {}
+
+    def dispatch(self, request: Dict[str, Any]) -> Any:
+        """
+        Execute one request.
+
+        Args:
+            request (Dict[str, Any]): {"op": <model name or "stats">, "inputs": [...]}.
+
+        Returns:
+            Any: JSON-serializable outputs in input order.
+        """
+        operation = request.get("op")
+        if operation == "stats":
+            return {name: worker.stats() for name, worker in self.workers.items()}
+        if operation not in self.workers:
+            raise ValueError(f"Model not loaded: {operation}")
+
+        futures = self.workers[operation].submit(request.get("inputs", []))
+        outputs = [future.result() for future in futures]
+        if operation == "similarity":
+            return encode_array(outputs if outputs else np.zeros((0, 0), dtype=np.float32))
+        return outputs
+
+
+class TCPModelServer(ModelServerMixin, socketserver.ThreadingTCPServer):
+    """Model server listening on localhost TCP."""
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class UnixModelServer(ModelServerMixin, socketserver.ThreadingUnixStreamServer):
+        """Model server listening on a Unix domain socket."""
+else:
+    UnixModelServer = None
+
+
+def create_server(address: str, workers: Dict[str, BatchingWorker]) -> socketserver.BaseServer:
+    """
+    Bind a model server to an address.
+
+    Args:
+        address (str): "unix:<path>" or "tcp:<host>:<port>".
+        workers (Dict[str, BatchingWorker]): Loaded model workers.
+
+    Returns:
+        socketserver.BaseServer: The bound (not yet serving) server.
+    """
+    family, socket_address = parse_address(address)
+    if family == getattr(socket, "AF_UNIX", None):
+        if UnixModelServer is None:
+            raise ValueError("Unix sockets are not supported on this platform")
+        if os.path.exists(socket_address):
+            os.remove(socket_address)
+        server = UnixModelServer(socket_address, ModelRequestHandler)
+    else:
+        server = TCPModelServer(socket_address, ModelRequestHandler)
+    server.workers = workers
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Shared model host for IntelliSearch workers")
+    parser.add_argument("--address", default=os.getenv("MODEL_SERVER_ADDRESS", DEFAULT_ADDRESS),
+                        help="unix:<path> or tcp:<host>:<port>")
+    parser.add_argument("--models", default=",".join(AVAILABLE_MODELS),
+                        help=f"comma-separated subset of {', '.join(AVAILABLE_MODELS)}")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.address, build_workers([name.strip() for name in args.models.split(",")]))
+    application_logger.log_info(f"Model server listening on {args.address}", level="INFO")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
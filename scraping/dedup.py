@@ -0,0 +1,140 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from logger.app_logger import application_logger
+from logger.metrics import metrics
+from scraping.url_utils import canonical_url
+
+# Collapse duplicate search results before fetching and rating them
+DEDUP_RESULTS = os.getenv("DEDUP_RESULTS", "1") == "1"
+# Search results parsed per requested result, so duplicates can be replaced by unique ones
+DEDUP_OVERFETCH_FACTOR = float(os.getenv("DEDUP_OVERFETCH_FACTOR", "2"))
+# SimHash bits that may differ between two texts that are still the same story
+SNIPPET_MAX_DISTANCE = 3
+BODY_MAX_DISTANCE = 6
+# Shorter texts are too generic to fingerprint ("No summary available.")
+MIN_SNIPPET_WORDS = 8
+MIN_BODY_WORDS = 50
+SHINGLE_WORDS = 3
+# Bodies returned by extract_article_content when no article text was fetched
+FAILED_BODY_PREFIXES = ("Failed", "Error", "Access forbidden", "Unsupported")
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def simhash(text: str, min_words: int = 1) -> Optional[int]:
+    """
+    Compute a 64-bit SimHash over word shingles; similar texts get hashes a few bits apart.
+
+    Args:
+        text (str): Text to fingerprint.
+        min_words (int): Texts with fewer words get no fingerprint.
+
+    Returns:
+        Optional[int]: The fingerprint, or None if the text is too short.
+    """
+    words: List[str] = _WORD.findall(text.lower())
+    if len(words) < max(min_words, 1):
+        return None
+    size: int = SHINGLE_WORDS if len(words) >= SHINGLE_WORDS else 1
+    weights: List[int] = [0] * 64
+    for start in range(len(words) - size + 1):
+        shingle: str = " ".join(words[start:start + size])
+        feature: int = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for bit in range(64):
+            weights[bit] += 1 if feature >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(first: int, second: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(first ^ second).count("1")
+
+
+class DuplicateDetector:
+    """
+    Spot repeated stories among the results of one search.
+
+    Results are compared by canonical URL and by a SimHash of title and snippet
+    before anything is fetched, then by a SimHash of the extracted body before the
+    article is rated. The first copy seen is kept; later copies are reported as
+    duplicates of it.
+    """
+
+    def __init__(self, snippet_max_distance: int = SNIPPET_MAX_DISTANCE, body_max_distance: int = BODY_MAX_DISTANCE) -> None:
+        """
+        Initialize an empty detector.
+
+        Args:
+            snippet_max_distance (int): Largest SimHash distance between near-duplicate titles and snippets.
+            body_max_distance (int): Largest SimHash distance between near-duplicate article bodies.
+        """
+        self.snippet_max_distance = snippet_max_distance
+        self.body_max_distance = body_max_distance
+        self._lock = threading.Lock()
+        self._urls: Dict[str, str] = {}
+        self._snippets: List[Tuple[int, str]] = []
+        self._bodies: List[Tuple[int, str]] = []
+
+    @staticmethod
+    def _nearest(fingerprint: int, seen: List[Tuple[int, str]], max_distance: int) -> Optional[str]:
+        """Link of the first seen fingerprint within ``max_distance`` bits. Caller holds the lock."""
+        for other, link in seen:
+            if hamming_distance(fingerprint, other) <= max_distance:
+                return link
+        return None
+
+    def check_result(self, result: Dict[str, Any]) -> Optional[str]:
+        """
+        Check a parsed search result against earlier ones and remember it if it is new.
+
+        Args:
+            result (Dict[str, Any]): Result with "link", "title" and "summary".
+
+        Returns:
+            Optional[str]: Link of the earlier copy, or None if the result is unique.
+        """
+        link: str = str(result.get("link", ""))
+        url_key: str = canonical_url(link)
+        fingerprint: Optional[int] = simhash(f"{result.get('title', '')} {result.get('summary', '')}", MIN_SNIPPET_WORDS)
+        with self._lock:
+            duplicate_of: Optional[str] = self._urls.get(url_key)
+            stage: str = "url"
+            if duplicate_of is None and fingerprint is not None:
+                duplicate_of = self._nearest(fingerprint, self._snippets, self.snippet_max_distance)
+                stage = "snippet"
+            if duplicate_of is None:
+                self._urls[url_key] = link
+                if fingerprint is not None:
+                    self._snippets.append((fingerprint, link))
+                return None
+        metrics.increment("duplicate_results_total", stage=stage)
+        application_logger.log_debug(f"Duplicate search result ({stage}): {link} repeats {duplicate_of}")
+        return duplicate_of
+
+    def check_body(self, link: str, body: str) -> Optional[str]:
+        """
+        Check an extracted article body against earlier ones and remember it if it is new.
+
+        Args:
+            link (str): Article URL.
+            body (str): Text from extract_article_content; failure messages are never duplicates.
+
+        Returns:
+            Optional[str]: Link of the earlier copy, or None if the article is unique.
+        """
+        if body.startswith(FAILED_BODY_PREFIXES):
+            return None
+        fingerprint: Optional[int] = simhash(body, MIN_BODY_WORDS)
+        if fingerprint is None:
+            return None
+        with self._lock:
+            duplicate_of: Optional[str] = self._nearest(fingerprint, self._bodies, self.body_max_distance)
+            if duplicate_of is None:
+                self._bodies.append((fingerprint, link))
+                return None
+        metrics.increment("duplicate_results_total", stage="body")
+        application_logger.log_info(f"Skipping syndicated copy {link} of {duplicate_of}", level="INFO")
+        return duplicate_of
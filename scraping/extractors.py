@@ -0,0 +1,253 @@
+import abc
+import os
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup
+from logger.app_logger import application_logger
+
+# Backend used when none is requested explicitly ("lxml" or "bs4")
+DEFAULT_EXTRACTOR = os.getenv("HTML_EXTRACTOR", "lxml")
+
+
+class ParagraphCollector:
+    """
+    Incremental paragraph extraction interface.
+
+    HTML is fed in chunks with ``feed`` and the paragraphs found so far are exposed
+    through ``paragraphs``. This base implementation buffers the document and parses
+    it with BeautifulSoup on ``close``; streaming backends override it.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty collector."""
+        self.paragraphs: List[str] = []
+        self._chunks: List[str] = []
+
+    @property
+    def text_length(self) -> int:
+        """Number of paragraph characters collected so far."""
+        return sum(len(paragraph) for paragraph in self.paragraphs)
+
+    def feed(self, chunk: str) -> None:
+        """
+        Feed the next chunk of HTML.
+
+        Args:
+            chunk (str): Decoded HTML fragment.
+        """
+        self._chunks.append(chunk)
+
+    def close(self) -> List[str]:
+        """
+        Finish parsing.
+
+        Returns:
+            List[str]: Every non-empty paragraph, stripped, in document order.
+        """
+        soup = BeautifulSoup("".join(self._chunks), "html.parser")
+        self.paragraphs = [p.text.strip() for p in soup.find_all("p") if p.text.strip()]
+        self._chunks = []
+        return self.paragraphs
+
+
+class LxmlParagraphCollector(ParagraphCollector):
+    """
+    Streaming paragraph extraction on top of lxml's pull parser.
+
+    Paragraphs become available as soon as their closing tag has been fed, and
+    finished subtrees are cleared so memory stays flat on very large pages.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the pull parser."""
+        super().__init__()
+        from lxml import etree
+
+        self._parser = etree.HTMLPullParser(events=("start", "end"))
+        self._open_paragraphs = 0
+
+    def feed(self, chunk: str) -> None:
+        self._parser.feed(chunk)
+        self._drain_events()
+
+    def close(self) -> List[str]:
+        self._parser.close()
+        self._drain_events()
+        return self.paragraphs
+
+    def _drain_events(self) -> None:
+        """Consume pending parser events, collecting finished paragraphs."""
+        for event, element in self._parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            if element.tag == "p":
+                if event == "start":
+                    self._open_paragraphs += 1
+                    continue
+                self._open_paragraphs -= 1
+                text = "".join(element.itertext()).strip()
+                if text:
+                    self.paragraphs.append(text)
+            # Children of an open paragraph are still needed for its text
+            if event == "end" and self._open_paragraphs == 0:
+                element.clear(keep_tail=True)
+
+
+class HTMLExtractor(abc.ABC):
+    """
+    Base class for HTML extraction backends.
+
+    Backends extract article paragraphs and DuckDuckGo result blocks
+    (``div.result__body``) from raw HTML.
+    """
+
+    name = "base"
+
+    def paragraph_collector(self) -> ParagraphCollector:
+        """
+        Create an incremental paragraph collector for streamed input.
+
+        Returns:
+            ParagraphCollector: A fresh collector.
+        """
+        return ParagraphCollector()
+
+    def extract_paragraphs(self, page_html: str) -> List[str]:
+        """
+        Extract paragraph text from a page.
+
+        Args:
+            page_html (str): Raw HTML.
+
+        Returns:
+            List[str]: Non-empty, stripped paragraphs in document order.
+        """
+        collector = self.paragraph_collector()
+        collector.feed(page_html)
+        return collector.close()
+
+    @abc.abstractmethod
+    def extract_search_results(self, page_html: str) -> List[Dict[str, Optional[str]]]:
+        """
+        Extract DuckDuckGo result blocks.
+
+        Args:
+            page_html (str): HTML of the results page.
+
+        Returns:
+            List[Dict[str, Optional[str]]]: One entry per result block with "title", "href" and "snippet"
+            ("title" is None when the block has no title link).
+        """
+
+
+class BeautifulSoupExtractor(HTMLExtractor):
+    """Pure-Python backend using BeautifulSoup's html.parser; always available."""
+
+    name = "bs4"
+
+    def extract_search_results(self, page_html: str) -> List[Dict[str, Optional[str]]]:
+        soup = BeautifulSoup(page_html, "html.parser")
+        results: List[Dict[str, Optional[str]]] = []
+        for result in soup.find_all("div", class_="result__body"):
+            title_tag = result.find("a", class_="result__a")
+            snippet_tag = result.find("a", class_="result__snippet")
+            results.append({
+                "title": title_tag.text.strip() if title_tag else None,
+                "href": title_tag.get("href", "") if title_tag else "",
+                "snippet": snippet_tag.text.strip() if snippet_tag else None,
+            })
+        return results
+
+
+class LxmlExtractor(HTMLExtractor):
+    """
+    Fast backend built on lxml's pull parser.
+
+    Walks parser events instead of building a full BeautifulSoup tree and clears
+    finished subtrees as it goes. Falls back to BeautifulSoup if lxml fails on a document.
+    """
+
+    name = "lxml"
+
+    def __init__(self) -> None:
+        """Initialize the backend with a BeautifulSoup fallback."""
+        self._fallback = BeautifulSoupExtractor()
+
+    def paragraph_collector(self) -> ParagraphCollector:
+        return LxmlParagraphCollector()
+
+    def extract_paragraphs(self, page_html: str) -> List[str]:
+        try:
+            return super().extract_paragraphs(page_html)
+        except Exception as e:
+            application_logger.log_warning(f"lxml paragraph extraction failed, using BeautifulSoup: {e}")
+            return self._fallback.extract_paragraphs(page_html)
+
+    def extract_search_results(self, page_html: str) -> List[Dict[str, Optional[str]]]:
+        try:
+            return self._extract_search_results(page_html)
+        except Exception as e:
+            application_logger.log_warning(f"lxml search result extraction failed, using BeautifulSoup: {e}")
+            return self._fallback.extract_search_results(page_html)
+
+    @staticmethod
+    def _has_class(element, class_name: str) -> bool:
+        """Check whether an element carries a CSS class."""
+        return class_name in (element.get("class") or "").split()
+
+    def _extract_search_results(self, page_html: str) -> List[Dict[str, Optional[str]]]:
+        from lxml import etree
+
+        parser = etree.HTMLPullParser(events=("start", "end"))
+        parser.feed(page_html)
+        parser.close()
+
+        results: List[Dict[str, Optional[str]]] = []
+        open_results = 0
+        for event, element in parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            is_result = element.tag == "div" and self._has_class(element, "result__body")
+            if is_result and event == "start":
+                open_results += 1
+                continue
+            if event != "end":
+                continue
+            if is_result:
+                open_results -= 1
+                title_tag = next((a for a in element.iter("a") if self._has_class(a, "result__a")), None)
+                snippet_tag = next((a for a in element.iter("a") if self._has_class(a, "result__snippet")), None)
+                results.append({
+                    "title": "".join(title_tag.itertext()).strip() if title_tag is not None else None,
+                    "href": title_tag.get("href", "") if title_tag is not None else "",
+                    "snippet": "".join(snippet_tag.itertext()).strip() if snippet_tag is not None else None,
+                })
+            if open_results == 0:
+                element.clear(keep_tail=True)
+        return results
+
+
+EXTRACTORS = {"bs4": BeautifulSoupExtractor, "lxml": LxmlExtractor}
+
+
+def get_extractor(name: Optional[str] = None) -> HTMLExtractor:
+    """
+    Create an extraction backend, falling back to BeautifulSoup if lxml is not installed.
+
+    Args:
+        name (Optional[str]): Backend name ("lxml" or "bs4"); defaults to the HTML_EXTRACTOR env variable.
+
+    Returns:
+        HTMLExtractor: The requested backend.
+    """
+    name = name or DEFAULT_EXTRACTOR
+    if name == "lxml":
+        try:
+            import lxml.etree  # noqa: F401
+        except ImportError:
+            application_logger.log_warning("lxml is not installed, using BeautifulSoup extractor")
+            name = "bs4"
+    return EXTRACTORS.get(name, BeautifulSoupExtractor)()
+
+
+# Shared extractor used on the hot path
+html_extractor = get_extractor()
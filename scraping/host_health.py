@@ -0,0 +1,298 @@
+import os
+import random
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from logger.app_logger import application_logger
+from logger.metrics import metrics
+from scraping.url_utils import normalize_url
+
+# Per-host request rate and burst; a host is never hit faster than this by one process
+HOST_RATE_PER_SECOND = float(os.getenv("HOST_RATE_PER_SECOND", "2"))
+HOST_BURST = float(os.getenv("HOST_BURST", "4"))
+# Consecutive failures (403, 429, 5xx, timeouts, connection errors) that open a host's circuit
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+# First open period; doubled (with jitter) every time a half-open probe fails
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("BREAKER_COOLDOWN_SECONDS", "60"))
+BREAKER_MAX_COOLDOWN_SECONDS = float(os.getenv("BREAKER_MAX_COOLDOWN_SECONDS", str(30 * 60)))
+# How long a failed URL is remembered, by kind of failure
+NEGATIVE_TTL_SECONDS: Dict[str, float] = {
+    "not_found": float(os.getenv("NEGATIVE_TTL_NOT_FOUND", str(60 * 60))),  # 404, 410
+    "forbidden": float(os.getenv("NEGATIVE_TTL_FORBIDDEN", str(15 * 60))),  # 401, 403, 451
+    "transient": float(os.getenv("NEGATIVE_TTL_TRANSIENT", "120")),  # 429, 5xx, timeouts
+}
+# A half-open probe that never reports back is forgotten after this long
+PROBE_TIMEOUT_SECONDS = 30.0
+MAX_TRACKED_HOSTS = 4096
+MAX_NEGATIVE_ENTRIES = 16384
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+
+
+def host_of(url: str) -> str:
+    """
+    Extract the lowercase host a URL points to.
+
+    Args:
+        url (str): Page URL.
+
+    Returns:
+        str: Host name, or an empty string for malformed URLs.
+    """
+    return (urllib.parse.urlsplit(url).hostname or "").lower()
+
+
+def failure_kind(status_code: Optional[int]) -> str:
+    """
+    Classify a failed fetch for the negative cache.
+
+    Args:
+        status_code (Optional[int]): HTTP status, or None for timeouts and connection errors.
+
+    Returns:
+        str: "not_found", "forbidden" or "transient".
+    """
+    if status_code in (404, 410):
+        return "not_found"
+    if status_code in (401, 403, 451):
+        return "forbidden"
+    return "transient"
+
+
+def counts_against_host(status_code: Optional[int]) -> bool:
+    """Whether a failure says something about the host (blocking, overload, unreachable) rather than one page."""
+    return status_code is None or status_code in (401, 403, 429) or status_code >= 500
+
+
+def parse_retry_after(header_value: Optional[str]) -> Optional[float]:
+    """
+    Parse a numeric Retry-After header.
+
+    Args:
+        header_value (Optional[str]): Header value.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if absent or not numeric.
+    """
+    try:
+        return max(0.0, float(header_value)) if header_value else None
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE_SECONDS, cap: float = BACKOFF_MAX_SECONDS) -> float:
+    """
+    Full-jitter exponential backoff.
+
+    Args:
+        attempt (int): Zero-based retry number.
+        base (float): Delay scale in seconds.
+        cap (float): Upper bound in seconds.
+
+    Returns:
+        float: Seconds to wait, uniformly drawn from [0, min(cap, base * 2**attempt)].
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket that hands out reservations instead of blocking."""
+
+    rate: float
+    burst: float
+    tokens: float = -1.0
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        if self.tokens < 0:
+            self.tokens = self.burst
+
+    def reserve(self, now: float) -> float:
+        """
+        Take one token, going into debt if none is available.
+
+        Args:
+            now (float): Current monotonic time.
+
+        Returns:
+            float: Seconds the caller must wait before using its token (0 if available now).
+        """
+        if self.rate <= 0:
+            return 0.0
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+@dataclass
+class HostState:
+    """Rate limit and circuit breaker state of one host."""
+
+    bucket: TokenBucket
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+    cooldown: float = BREAKER_COOLDOWN_SECONDS
+    probing: bool = False
+    probe_deadline: float = 0.0
+
+    def circuit(self, now: float) -> str:
+        """Circuit state: "closed", "open" or "half_open" (cooldown over, one probe allowed)."""
+        if self.open_until == 0.0:
+            return "closed"
+        return "open" if now < self.open_until else "half_open"
+
+
+class HostHealth:
+    """
+    Shared view of which hosts and URLs are worth fetching.
+
+    Combines a negative cache of recently failed URLs, a per-host token bucket and a
+    per-host circuit breaker that opens after repeated 403s, 429s, 5xx responses or
+    timeouts. Every method only touches in-memory state under a lock, so it is safe
+    to call from the event loop and from worker threads alike; waiting is left to the
+    caller (``asyncio.sleep`` or ``time.sleep``).
+    """
+
+    def __init__(self, rate_per_second: float = HOST_RATE_PER_SECOND, burst: float = HOST_BURST,
+                 failure_threshold: int = BREAKER_FAILURE_THRESHOLD, cooldown: float = BREAKER_COOLDOWN_SECONDS,
+                 max_cooldown: float = BREAKER_MAX_COOLDOWN_SECONDS) -> None:
+        """
+        Initialize empty state.
+
+        Args:
+            rate_per_second (float): Sustained requests per second per host; 0 disables rate limiting.
+            burst (float): Requests a quiet host may receive at once.
+            failure_threshold (int): Consecutive host failures that open the circuit.
+            cooldown (float): First open period in seconds.
+            max_cooldown (float): Longest open period in seconds.
+        """
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._hosts: "OrderedDict[str, HostState]" = OrderedDict()
+        self._negative: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def _host_state(self, host: str) -> HostState:
+        """Get or create a host's state; the least recently used hosts are forgotten. Caller holds the lock."""
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostState(TokenBucket(self.rate_per_second, self.burst), cooldown=self.cooldown)
+            if len(self._hosts) > MAX_TRACKED_HOSTS:
+                self._hosts.popitem(last=False)
+        else:
+            self._hosts.move_to_end(host)
+        return state
+
+    def check(self, url: str) -> Optional[str]:
+        """
+        Decide whether a URL should be fetched at all.
+
+        Args:
+            url (str): Page URL.
+
+        Returns:
+            Optional[str]: Why the fetch should be skipped, or None if it may proceed.
+        """
+        now = time.monotonic()
+        key = normalize_url(url)
+        with self._lock:
+            negative = self._negative.get(key)
+            if negative is not None:
+                if now < negative[0]:
+                    metrics.increment("host_health_skips_total", reason="negative_cache")
+                    return f"recently failed ({negative[1]})"
+                del self._negative[key]
+
+            state = self._host_state(host_of(url))
+            circuit = state.circuit(now)
+            if circuit == "open" or (circuit == "half_open" and state.probing and now < state.probe_deadline):
+                metrics.increment("host_health_skips_total", reason="circuit_open")
+                return f"circuit open for {host_of(url)} ({max(state.open_until - now, 0):.0f}s left)"
+            if circuit == "half_open":
+                # Let exactly one request through to test the host
+                state.probing = True
+                state.probe_deadline = now + PROBE_TIMEOUT_SECONDS
+        return None
+
+    def reserve(self, url: str) -> float:
+        """
+        Take a rate-limit token for the URL's host.
+
+        Args:
+            url (str): Page URL.
+
+        Returns:
+            float: Seconds to wait before sending the request.
+        """
+        with self._lock:
+            delay = self._host_state(host_of(url)).bucket.reserve(time.monotonic())
+        if delay:
+            metrics.increment("host_health_throttled_total")
+        return delay
+
+    def record_success(self, url: str) -> None:
+        """
+        Close the host's circuit after a successful (200/304) response.
+
+        Args:
+            url (str): Page URL.
+        """
+        host = host_of(url)
+        with self._lock:
+            state = self._host_state(host)
+            reopened = state.open_until != 0.0
+            state.consecutive_failures = 0
+            state.open_until = 0.0
+            state.cooldown = self.cooldown
+            state.probing = False
+        if reopened:
+            application_logger.log_info(f"Circuit closed for {host}", level="INFO")
+
+    def record_failure(self, url: str, status_code: Optional[int] = None, retry_after: Optional[float] = None,
+                       final: bool = True) -> None:
+        """
+        Remember a failed fetch and open the host's circuit if it keeps failing.
+
+        Args:
+            url (str): Page URL.
+            status_code (Optional[int]): HTTP status, or None for timeouts and connection errors.
+            retry_after (Optional[float]): Seconds from a Retry-After header, if any.
+            final (bool): False while the caller will still retry; only final failures enter the negative cache.
+        """
+        now = time.monotonic()
+        host = host_of(url)
+        kind = failure_kind(status_code)
+        reason = f"HTTP {status_code}" if status_code is not None else "timeout or connection error"
+        opened_for: Optional[float] = None
+        with self._lock:
+            if final:
+                self._negative[normalize_url(url)] = (now + NEGATIVE_TTL_SECONDS[kind], reason)
+                if len(self._negative) > MAX_NEGATIVE_ENTRIES:
+                    self._negative.popitem(last=False)
+
+            if counts_against_host(status_code):
+                state = self._host_state(host)
+                was_probing = state.probing
+                state.probing = False
+                state.consecutive_failures += 1
+                if was_probing or state.consecutive_failures >= self.failure_threshold or retry_after:
+                    if was_probing:  # The probe failed: stay away longer
+                        state.cooldown = min(self.max_cooldown, state.cooldown * 2)
+                    opened_for = max(state.cooldown * random.uniform(0.8, 1.2), retry_after or 0.0)
+                    state.open_until = now + opened_for
+        metrics.increment("host_health_failures_total", kind=kind)
+        if opened_for is not None:
+            metrics.increment("host_health_circuit_opened_total")
+            application_logger.log_warning(f"Circuit opened for {host} for {opened_for:.0f}s after {reason}")
+
+
+# Shared by every fetcher in the process
+host_health = HostHealth()
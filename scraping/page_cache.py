@@ -0,0 +1,246 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Optional
+from logger.app_logger import application_logger
+from scraping.url_utils import normalize_url
+
+# Define cache configuration
+CACHE_DIRECTORY = os.getenv(
+    "INTELLISEARCH_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache"),
+)
+PAGE_CACHE_FILENAME = "pages.sqlite3"
+PAGE_CACHE_TTL_SECONDS = float(os.getenv("PAGE_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+@dataclass
+class CachedPage:
+    """A cached page: compressed raw HTML, extracted text and validators for revalidation."""
+
+    url: str
+    html: str
+    text: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+    complete: bool = True
+
+    def is_fresh(self, ttl: float = PAGE_CACHE_TTL_SECONDS) -> bool:
+        """
+        Check whether the page can be served without contacting the origin.
+
+        Args:
+            ttl (float): Freshness lifetime in seconds.
+
+        Returns:
+            bool: True if the page was fetched or revalidated within ``ttl``.
+        """
+        return time.time() - self.fetched_at < ttl
+
+    def covers(self, max_chars: int) -> bool:
+        """
+        Check whether the cached text satisfies a consumer that needs ``max_chars`` characters.
+
+        Args:
+            max_chars (int): Characters of paragraph text needed.
+
+        Returns:
+            bool: True if the page was read completely or enough text was cached.
+        """
+        return self.complete or len(self.text) >= max_chars
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for revalidating this page."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class PageCache:
+    """
+    Persistent, content-addressed cache of fetched article pages shared by every process.
+
+    Entries are keyed by the SHA-256 of the normalized URL and hold the raw HTML
+    (zlib-compressed) together with the extracted paragraph text. Stale entries keep
+    their ETag / Last-Modified validators so callers can revalidate with a conditional
+    request, and the database is kept under ``max_bytes`` by evicting the least
+    recently used pages.
+    """
+
+    EVICTION_CHECK_INTERVAL = 50
+
+    def __init__(self, path: Optional[str] = None, ttl: float = PAGE_CACHE_TTL_SECONDS,
+                 max_bytes: int = PAGE_CACHE_MAX_BYTES) -> None:
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path (Optional[str]): SQLite file path; defaults to ``.cache/pages.sqlite3``.
+            ttl (float): Freshness lifetime of an entry in seconds.
+            max_bytes (int): Upper bound for the stored compressed HTML and text.
+        """
+        self.path = path or os.path.join(CACHE_DIRECTORY, PAGE_CACHE_FILENAME)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._puts_since_eviction = 0
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                html BLOB NOT NULL,
+                text TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                complete INTEGER NOT NULL DEFAULT 1
+            )
+            """
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(pages)")}
+        if "complete" not in columns:
+            self._connection.execute("ALTER TABLE pages ADD COLUMN complete INTEGER NOT NULL DEFAULT 1")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)")
+        self._connection.commit()
+
+    @staticmethod
+    def cache_key(url: str) -> str:
+        """
+        Compute the cache key for a URL.
+
+        Args:
+            url (str): Page URL.
+
+        Returns:
+            str: Hex SHA-256 digest of the normalized URL.
+        """
+        return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """
+        Look up a page, fresh or stale.
+
+        Args:
+            url (str): Page URL.
+
+        Returns:
+            Optional[CachedPage]: The cached page, or None on a miss.
+        """
+        key = self.cache_key(url)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, html, text, etag, last_modified, fetched_at, complete FROM pages WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE pages SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._connection.commit()
+
+        cached_url, compressed_html, text, etag, last_modified, fetched_at, complete = row
+        return CachedPage(cached_url, zlib.decompress(compressed_html).decode("utf-8", errors="replace"),
+                          text, etag, last_modified, fetched_at, bool(complete))
+
+    def get_fresh(self, url: str, max_chars: int = 0) -> Optional[CachedPage]:
+        """
+        Look up a page that can be served without revalidation.
+
+        Args:
+            url (str): Page URL.
+            max_chars (int): Characters of paragraph text the caller needs.
+
+        Returns:
+            Optional[CachedPage]: The cached page if it is within its TTL and covers ``max_chars``, otherwise None.
+        """
+        page = self.get(url)
+        return page if page is not None and page.is_fresh(self.ttl) and page.covers(max_chars) else None
+
+    def put(self, url: str, html: str, text: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, complete: bool = True) -> None:
+        """
+        Store a freshly fetched page.
+
+        Args:
+            url (str): Page URL.
+            html (str): Raw HTML.
+            text (str): Extracted paragraph text.
+            etag (Optional[str]): ETag response header, if any.
+            last_modified (Optional[str]): Last-Modified response header, if any.
+            complete (bool): False if only the beginning of the page was read.
+        """
+        compressed_html = zlib.compress(html.encode("utf-8"), 6)
+        size = len(compressed_html) + len(text.encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(key, url, html, text, etag, last_modified, fetched_at, accessed_at, size, complete) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.cache_key(url), normalize_url(url), compressed_html, text, etag, last_modified,
+                 now, now, size, int(complete)),
+            )
+            self._connection.commit()
+            self._puts_since_eviction += 1
+            should_evict = self._puts_since_eviction >= self.EVICTION_CHECK_INTERVAL
+
+        if should_evict:
+            self.evict()
+
+    def mark_revalidated(self, url: str) -> None:
+        """
+        Reset the freshness lifetime of a page after a 304 Not Modified response.
+
+        Args:
+            url (str): Page URL.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "UPDATE pages SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, self.cache_key(url))
+            )
+            self._connection.commit()
+
+    def evict(self) -> int:
+        """
+        Delete least recently used pages until the cache fits in ``max_bytes``.
+
+        Returns:
+            int: Number of evicted pages.
+        """
+        evicted = 0
+        with self._lock:
+            self._puts_since_eviction = 0
+            total_size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+            if total_size <= self.max_bytes:
+                return 0
+
+            for key, size in self._connection.execute("SELECT key, size FROM pages ORDER BY accessed_at").fetchall():
+                if total_size <= self.max_bytes:
+                    break
+                self._connection.execute("DELETE FROM pages WHERE key = ?", (key,))
+                total_size -= size
+                evicted += 1
+            self._connection.commit()
+
+        application_logger.log_info(f"Page cache evicted {evicted} pages", level="INFO")
+        return evicted
+
+
+# Shared page cache used by article extraction and URL validation
+page_cache = PageCache()
@@ -0,0 +1,233 @@
+import asyncio
+import codecs
+import concurrent.futures
+import os
+import urllib.parse
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional
+import httpx
+import requests
+from scraping.extractors import HTMLExtractor, html_extractor
+
+# Default caps for a single page
+DEFAULT_MAX_CHARS = 20000
+DEFAULT_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+CHUNK_SIZE = 16 * 1024
+# Bytes handed to the parser per executor call; fewer hops, at the cost of reading a little past the limit
+PARSE_BATCH_BYTES = 64 * 1024
+
+# Pages that never contain article paragraphs
+SKIPPED_EXTENSIONS = (".pdf", ".mp4", ".mp3", ".m4a", ".mov", ".avi", ".webm", ".zip", ".gz",
+                      ".jpg", ".jpeg", ".png", ".gif", ".svg", ".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx")
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+BINARY_SIGNATURES = (b"%PDF", b"PK\x03\x04", b"\x1f\x8b", b"\xff\xd8\xff", b"\x89PNG", b"GIF8", b"ID3")
+
+
+class UnsupportedContentError(Exception):
+    """Raised when a URL points to something other than an HTML page."""
+
+
+@dataclass
+class StreamedPage:
+    """Result of a capped streaming fetch."""
+
+    status_code: int
+    headers: Mapping[str, str]
+    html: str
+    text: str
+    complete: bool
+
+
+def is_skippable_url(url: str) -> bool:
+    """
+    Check whether a URL obviously points to a non-HTML document.
+
+    Args:
+        url (str): URL to check.
+
+    Returns:
+        bool: True for PDFs, media files, archives and office documents.
+    """
+    return urllib.parse.urlsplit(url).path.lower().endswith(SKIPPED_EXTENSIONS)
+
+
+def check_content(content_type: Optional[str], first_chunk: bytes) -> None:
+    """
+    Reject responses that are not HTML, based on headers and the first bytes of the body.
+
+    Args:
+        content_type (Optional[str]): Content-Type response header.
+        first_chunk (bytes): Beginning of the response body.
+
+    Raises:
+        UnsupportedContentError: If the response is not an HTML page.
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type and media_type not in HTML_CONTENT_TYPES:
+        raise UnsupportedContentError(f"Unsupported content type: {media_type}")
+    if first_chunk.startswith(BINARY_SIGNATURES) or b"\x00" in first_chunk[:512]:
+        raise UnsupportedContentError("Binary content detected")
+
+
+class CappedPageReader:
+    """
+    Feeds raw body chunks into an incremental paragraph collector.
+
+    Reading stops once ``max_chars`` of paragraph text has been collected or
+    ``max_bytes`` of body has been read, whichever comes first.
+    """
+
+    def __init__(self, encoding: Optional[str], max_chars: int, max_bytes: int,
+                 extractor: HTMLExtractor = html_extractor) -> None:
+        """
+        Initialize the reader.
+
+        Args:
+            encoding (Optional[str]): Charset from the response headers; UTF-8 if unknown.
+            max_chars (int): Paragraph characters after which reading stops.
+            max_bytes (int): Body bytes after which reading stops.
+            extractor (HTMLExtractor): Backend providing the paragraph collector.
+        """
+        self.max_chars = max_chars
+        self.max_bytes = max_bytes
+        self.bytes_read = 0
+        self.complete = True
+        self._collector = extractor.paragraph_collector()
+        try:
+            self._decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._html_parts = []
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Feed the next body chunk.
+
+        Args:
+            chunk (bytes): Raw bytes from the response.
+
+        Returns:
+            bool: True once enough text or bytes have been read and the caller should stop.
+        """
+        if self.bytes_read == 0:
+            check_content(None, chunk)
+        self.bytes_read += len(chunk)
+        decoded = self._decoder.decode(chunk)
+        self._html_parts.append(decoded)
+        self._collector.feed(decoded)
+
+        if self._collector.text_length >= self.max_chars or self.bytes_read >= self.max_bytes:
+            self.complete = False
+            return True
+        return False
+
+    def close(self, status_code: int, headers: Mapping[str, str]) -> StreamedPage:
+        """
+        Finish parsing and build the page.
+
+        Args:
+            status_code (int): HTTP status of the response.
+            headers (Mapping[str, str]): Response headers.
+
+        Returns:
+            StreamedPage: HTML read so far and the extracted paragraph text.
+        """
+        tail = self._decoder.decode(b"", final=True)
+        if tail:
+            self._html_parts.append(tail)
+            self._collector.feed(tail)
+        paragraphs = self._collector.close()
+        return StreamedPage(status_code, headers, "".join(self._html_parts), "\n".join(paragraphs), self.complete)
+
+
+def _charset(content_type: Optional[str]) -> Optional[str]:
+    """Extract the charset parameter from a Content-Type header."""
+    for parameter in (content_type or "").split(";")[1:]:
+        name, _, value = parameter.partition("=")
+        if name.strip().lower() == "charset":
+            return value.strip().strip('"') or None
+    return None
+
+
+async def fetch_page_streaming(client: httpx.AsyncClient, url: str, max_chars: int = DEFAULT_MAX_CHARS,
+                               max_bytes: int = DEFAULT_MAX_BYTES, headers: Optional[Dict[str, str]] = None,
+                               executor: Optional[concurrent.futures.Executor] = None) -> StreamedPage:
+    """
+    Fetch a page incrementally, stopping as soon as enough paragraph text has been read.
+
+    Non-200 responses are returned without reading their body. Chunks are parsed in
+    ``executor`` (the loop's default executor if omitted), never on the event loop.
+
+    Args:
+        client (httpx.AsyncClient): Shared HTTP client.
+        url (str): Page URL.
+        max_chars (int): Paragraph characters needed by the caller.
+        max_bytes (int): Hard cap on body bytes read.
+        headers (Optional[Dict[str, str]]): Extra request headers (e.g. conditional headers).
+        executor (Optional[concurrent.futures.Executor]): Pool that runs the HTML parser.
+
+    Returns:
+        StreamedPage: The (possibly partial) page.
+
+    Raises:
+        UnsupportedContentError: If the URL or response is not an HTML page.
+    """
+    if is_skippable_url(url):
+        raise UnsupportedContentError(f"Skipping non-HTML URL: {url}")
+
+    async with client.stream("GET", url, headers=headers) as response:
+        if response.status_code != 200:
+            return StreamedPage(response.status_code, response.headers, "", "", True)
+        check_content(response.headers.get("Content-Type"), b"")
+
+        loop = asyncio.get_running_loop()
+        reader = CappedPageReader(_charset(response.headers.get("Content-Type")), max_chars, max_bytes)
+        pending: List[bytes] = []
+        pending_bytes = 0
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            pending.append(chunk)
+            pending_bytes += len(chunk)
+            if pending_bytes < PARSE_BATCH_BYTES:
+                continue
+            # Batches are fed one at a time, so the reader is never used by two threads at once
+            batch, pending, pending_bytes = b"".join(pending), [], 0
+            if await loop.run_in_executor(executor, reader.feed, batch):
+                break
+        else:
+            if pending_bytes:
+                await loop.run_in_executor(executor, reader.feed, b"".join(pending))
+        return await loop.run_in_executor(executor, reader.close, response.status_code, response.headers)
+
+
+def fetch_page_streaming_sync(url: str, max_chars: int = DEFAULT_MAX_CHARS, max_bytes: int = DEFAULT_MAX_BYTES,
+                              headers: Optional[Dict[str, str]] = None, timeout: float = 10) -> StreamedPage:
+    """
+    Blocking counterpart of fetch_page_streaming built on requests.
+
+    Args:
+        url (str): Page URL.
+        max_chars (int): Paragraph characters needed by the caller.
+        max_bytes (int): Hard cap on body bytes read.
+        headers (Optional[Dict[str, str]]): Extra request headers (e.g. conditional headers).
+        timeout (float): Connect/read timeout in seconds.
+
+    Returns:
+        StreamedPage: The (possibly partial) page.
+
+    Raises:
+        UnsupportedContentError: If the URL or response is not an HTML page.
+        requests.RequestException: On network errors.
+    """
+    if is_skippable_url(url):
+        raise UnsupportedContentError(f"Skipping non-HTML URL: {url}")
+
+    with requests.get(url, headers=headers, timeout=timeout, stream=True) as response:
+        if response.status_code != 200:
+            return StreamedPage(response.status_code, response.headers, "", "", True)
+        check_content(response.headers.get("Content-Type"), b"")
+
+        reader = CappedPageReader(_charset(response.headers.get("Content-Type")), max_chars, max_bytes)
+        for chunk in response.iter_content(CHUNK_SIZE):
+            if chunk and reader.feed(chunk):
+                break
+        return reader.close(response.status_code, response.headers)
@@ -0,0 +1,76 @@
+import urllib.parse
+from typing import List, Tuple
+
+# Query parameters that only track the click and never change the page content
+TRACKING_PARAMETERS = {"rut", "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src"}
+TRACKING_PREFIXES = ("utm_",)
+
+
+def is_tracking_parameter(name: str) -> bool:
+    """
+    Check whether a query parameter is a tracking parameter.
+
+    Args:
+        name (str): Query parameter name.
+
+    Returns:
+        bool: True if the parameter should be dropped from cache keys.
+    """
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMETERS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so that equivalent links map to the same cache key.
+
+    Lowercases the scheme and host, drops default ports, fragments and tracking
+    parameters (including DuckDuckGo's ``rut=``), and sorts the remaining query
+    parameters.
+
+    Args:
+        url (str): URL to normalize.
+
+    Returns:
+        str: The normalized URL.
+    """
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+
+    query_pairs: List[Tuple[str, str]] = [
+        (name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if not is_tracking_parameter(name)
+    ]
+    query = urllib.parse.urlencode(sorted(query_pairs))
+    path = parts.path or "/"
+
+    return urllib.parse.urlunsplit((scheme, host, path, query, ""))
+
+
+def canonical_url(url: str) -> str:
+    """
+    Reduce a URL to the page it shows, for spotting the same article behind different links.
+
+    Goes further than normalize_url: the scheme, ``www.``/``m.``/``amp.`` host prefixes,
+    a trailing ``/amp`` and trailing slashes are ignored. Not suitable as a fetch URL.
+
+    Args:
+        url (str): URL to canonicalize.
+
+    Returns:
+        str: Canonical form of the URL.
+    """
+    parts = urllib.parse.urlsplit(normalize_url(url))
+    host = parts.netloc
+    for prefix in ("www.", "m.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    path = parts.path.rstrip("/")
+    if path.endswith("/amp"):
+        path = path[:-len("/amp")]
+    return urllib.parse.urlunsplit(("", host, path.rstrip("/") or "/", parts.query, ""))